@@ -1,11 +1,19 @@
 from flask import Flask, render_template, jsonify, send_from_directory, request
-import sqlite3
 from datetime import datetime
 import os
 import sys
+import logging
 import bcrypt
 import jwt
 from scrapers.scraper_manager import ScraperManager
+from event_queries import month_window, fetch_events_in_window, fetch_changes_since
+from month_cache import month_cache, month_stamp, invalidate_event_month
+from migrations import DEFAULT_DB_PATH, LEGACY_DB_PATH, legacy_import_pending, migrate
+from retention import DEFAULT_RETENTION_DAYS, EventRetention
+import db
+from db import get_db
+import jobs
+import scheduler
 
 
 # Add the current directory to Python path
@@ -17,10 +25,17 @@ def create_app(test_config=None):
     if test_config is None:
         app.config.from_mapping(
             SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
-            DATABASE=os.path.join(app.instance_path, 'database.db'),
+            DATABASE=os.environ.get('DATABASE_PATH', DEFAULT_DB_PATH),
         )
     else:
         app.config.update(test_config)
+        app.config.setdefault('DATABASE', DEFAULT_DB_PATH)
+
+    app.config.setdefault('SCRAPER_MAX_CONCURRENCY', int(os.environ.get('SCRAPER_MAX_CONCURRENCY', 4)))
+    app.config.setdefault('SCRAPER_SOURCE_TIMEOUT', float(os.environ.get('SCRAPER_SOURCE_TIMEOUT', 120)))
+    app.config.setdefault('JOB_WORKERS', int(os.environ.get('JOB_WORKERS', 2)))
+    app.config.setdefault('EVENT_RETENTION_DAYS', int(os.environ.get('EVENT_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)))
+    app.config.setdefault('SCRAPE_SCHEDULER', os.environ.get('SCRAPE_SCHEDULER', '').lower() in ('1', 'true'))
 
     # Ensure instance folder exists
     try:
@@ -29,18 +44,66 @@ def create_app(test_config=None):
         pass
 
     # Initialize database
-    with app.app_context():
-        init_db()
+    init_db(app.config['DATABASE'])
+    db.init_app(app)
     
     # Register blueprints
-    from scraper_routes import scraper_bp
+    from scraper_routes import scraper_bp, scrape_url_job
     from user_routes import user_bp
     from tag_routes import tag_bp
     from preference_routes import preference_bp
+    from job_routes import job_bp, job_accepted
     app.register_blueprint(user_bp)
     app.register_blueprint(scraper_bp)
     app.register_blueprint(tag_bp)
     app.register_blueprint(preference_bp)
+    app.register_blueprint(job_bp)
+
+    def scrape_sources_job(params, is_cancelled):
+        """Job handler for /api/scrape and the scheduler: run all scrapers, or just params['sources']."""
+        scraper_classes = None
+        if params.get('sources'):
+            by_source = ScraperManager.scrapers_by_source()
+            scraper_classes = [by_source[source] for source in params['sources']]
+        scraper_manager = ScraperManager(
+            app.config['DATABASE'],
+            on_dates_changed=month_cache.invalidate_dates,
+            scraper_classes=scraper_classes,
+            max_concurrency=app.config['SCRAPER_MAX_CONCURRENCY'],
+            source_timeout=app.config['SCRAPER_SOURCE_TIMEOUT']
+        )
+        summary = scraper_manager.run_scrapers(should_cancel=is_cancelled)
+        event_count = sum(result['events'] for result in summary.values())
+        unchanged = [source for source, result in summary.items() if result['status'] == 'unchanged']
+        result = {
+            'message': f'Successfully scraped {event_count} events',
+            'event_count': event_count,
+            'unchanged_sources': unchanged,
+            'sources': summary
+        }
+        if any(source['status'] == 'cancelled' for source in summary.values()):
+            raise jobs.JobCancelled(result)
+        return result
+
+    def archive_old_events_job(params, is_cancelled):
+        """Job handler for the scheduler's daily retention run."""
+        retention = EventRetention(
+            app.config['DATABASE'],
+            default_days=app.config['EVENT_RETENTION_DAYS'],
+            on_dates_changed=month_cache.invalidate_dates
+        )
+        result = retention.run(is_cancelled)
+        if result['cancelled']:
+            raise jobs.JobCancelled(result)
+        return result
+
+    # Scrapes run in the background; the endpoints return a job to poll
+    jobs.init_app(app, {
+        'scrape_sources': scrape_sources_job,
+        'scrape_url': lambda params, is_cancelled: scrape_url_job(params, is_cancelled, app.config['DATABASE']),
+        'archive_old_events': archive_old_events_job,
+    })
+    scheduler.init_app(app)
 
     @app.route('/')
     def index():
@@ -54,57 +117,39 @@ def create_app(test_config=None):
 
     @app.route('/api/events/<int:year>/<int:month>')
     def get_events(year, month):
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        
         is_admin = request.args.get('admin', 'false').lower() == 'true'
         
-        if is_admin:
-            cursor.execute(
-                "SELECT * FROM events WHERE date >= ? AND date < ?",
-                (start_date, end_date)
-            )
+        conn = get_db()
+        # Read before the events, so a write in between leaves the entry stale, never wrong
+        stamp = month_stamp(conn, year, month)
+        cached = month_cache.get(year, month, is_admin, stamp)
+        if cached:
+            etag, body = cached
+            response = app.response_class(body, mimetype='application/json')
         else:
-            cursor.execute(
-                "SELECT * FROM events WHERE date >= ? AND date < ? AND needs_review = 0",
-                (start_date, end_date)
-            )
-        
-        events = []
-        for row in cursor.fetchall():
-            # Get tags for this event
-            cursor.execute('''
-                SELECT t.*
-                FROM tags t
-                JOIN event_tags et ON t.id = et.tag_id
-                WHERE et.event_id = ?
-                ORDER BY t.name
-            ''', (row['id'],))
+            version = month_cache.version(year, month)
+            start_date, end_date = month_window(year, month)
             
-            tags = [dict(tag) for tag in cursor.fetchall()]
+            events = fetch_events_in_window(conn, start_date, end_date, include_pending=is_admin)
             
-            events.append({
-                'id': row['id'],
-                'title': row['title'],
-                'date': row['date'],
-                'time': row['time'],
-                'location': row['location'],
-                'description': row['description'],
-                'url': row['url'],
-                'needs_review': bool(row['needs_review']),
-                'source': row['source'],
-                'source_id': row['source_id'],
-                'tags': tags
-            })
+            response = jsonify(events)
+            etag = month_cache.put(year, month, is_admin, response.get_data(), version, stamp)
+        conn.close()
         
+        # Let clients revalidate with If-None-Match and get a bodiless 304
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    @app.route('/api/events/changes')
+    def get_event_changes():
+        """Scraped event changes after the run id in ?since= (0 for all), oldest first."""
+        since = request.args.get('since', 0, type=int)
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        conn = get_db()
+        changes = fetch_changes_since(conn, since, limit)
         conn.close()
-        return jsonify(events)
+        return jsonify(changes)
 
     @app.route('/api/events', methods=['POST'])
     def add_event():
@@ -134,6 +179,7 @@ def create_app(test_config=None):
             ))
             
             conn.commit()
+            month_cache.invalidate_dates([data['date']])
             new_event_id = cursor.lastrowid
             
             # Fetch the newly created event
@@ -174,10 +220,21 @@ def create_app(test_config=None):
                 conn.close()
                 return jsonify({'error': 'Event not found'}), 404
             
-            # Delete the event
+            # Foreign keys aren't enforced, so clear what refers to the event ourselves.
+            # Its duplicates stay linked, to the oldest of them as the new canonical event
+            members = cursor.execute('SELECT id, date FROM events WHERE canonical_event_id = ? ORDER BY id',
+                                     (event_id,)).fetchall()
+            if members:
+                cursor.execute('''
+                    UPDATE events SET canonical_event_id = CASE WHEN id = ? THEN NULL ELSE ? END
+                    WHERE canonical_event_id = ?
+                ''', (members[0]['id'], members[0]['id'], event_id))
+            cursor.execute('DELETE FROM event_tags WHERE event_id = ?', (event_id,))
+            cursor.execute('DELETE FROM event_dedup_bands WHERE event_id = ?', (event_id,))
             cursor.execute('DELETE FROM events WHERE id = ?', (event_id,))
             conn.commit()
             conn.close()
+            month_cache.invalidate_dates([event['date']] + [member['date'] for member in members])
             
             return '', 204
             
@@ -219,6 +276,7 @@ def create_app(test_config=None):
             ))
             
             conn.commit()
+            month_cache.invalidate_dates([event['date'], data['date']])
             
             cursor.execute('SELECT * FROM events WHERE id = ?', (event_id,))
             updated_event = cursor.fetchone()
@@ -250,6 +308,7 @@ def create_app(test_config=None):
         try:
             cursor.execute('UPDATE events SET needs_review = 0 WHERE id = ?', (event_id,))
             conn.commit()
+            invalidate_event_month(cursor, event_id)
             conn.close()
             return '', 204
         except Exception as e:
@@ -264,6 +323,7 @@ def create_app(test_config=None):
         try:
             cursor.execute('UPDATE events SET needs_review = 1 WHERE id = ?', (event_id,))
             conn.commit()
+            invalidate_event_month(cursor, event_id)
             conn.close()
             return '', 204
         except Exception as e:
@@ -272,17 +332,16 @@ def create_app(test_config=None):
 
     @app.route('/api/scrape', methods=['POST'])
     def trigger_scrape():
-        """Manually trigger scraping of Trident events."""
+        """Queue a scrape of all event sources and return the job to poll.
+
+        Sources already being scraped by another job, such as a scheduled run,
+        are left to that job.
+        """
         try:
-            db_path = os.path.join(os.path.dirname(__file__), 'database', 'database.db')
-            scraper_manager = ScraperManager(db_path)
-            event_count = scraper_manager.run_scrapers()
-            return jsonify({
-                'message': f'Successfully scraped {event_count} events',
-                'event_count': event_count
-            })
+            job, created = scheduler.submit_scrape(jobs.get_job_queue())
+            return job_accepted(job, created)
         except Exception as e:
-            app.logger.error(f'Error during scraping: {str(e)}')
+            app.logger.error(f'Error queueing scrape: {str(e)}')
             return jsonify({
                 'error': 'Failed to scrape events',
                 'details': str(e)
@@ -290,47 +349,22 @@ def create_app(test_config=None):
 
     return app
 
-def init_db():
+def init_db(db_path=DEFAULT_DB_PATH):
     try:
-        db_path = os.path.join(os.path.dirname(__file__), 'database', 'database.db')
-        schema_path = os.path.join(os.path.dirname(__file__), 'database', 'schema.sql')
-        
-        print(f"Database path: {db_path}")
-        print(f"Schema path: {schema_path}")
-        
-        # Ensure database directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        
-        # Read schema from file
-        print("Reading schema file...")
-        with open(schema_path, 'r') as f:
-            schema = f.read()
-        print("Schema file read successfully")
-        
-        # Initialize database with schema
-        print("Initializing database...")
-        conn = sqlite3.connect(db_path)
-        conn.executescript(schema)
-        conn.commit()
-        conn.close()
-        print("Database initialized successfully")
+        # Only pending migrations run; existing data is never dropped
+        version = migrate(db_path)
+        print(f"Database {db_path} is at schema version {version}")
+        # The old file sat next to the default database; test and scratch databases aren't warned about
+        if os.path.abspath(db_path) == DEFAULT_DB_PATH and legacy_import_pending(db_path):
+            print(f"Warning: {LEGACY_DB_PATH} has users, tags and preferences this database does not read; "
+                  f"import them with: python init_db.py --import-legacy")
         
         return db_path
     except Exception as e:
         print(f"Error initializing database: {str(e)}")
         raise
 
-def get_db():
-    db_path = os.path.join(os.path.dirname(__file__), 'database', 'database.db')
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-
-
-
-
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     app = create_app()
     app.run(host='0.0.0.0', port=8000, debug=True)
@@ -0,0 +1,119 @@
+"""Benchmark browser scrapes of the Dairy listing: full DOM after networkidle vs. in-page extraction.
+
+Serves the Dairy fixture from a local aiohttp server, with images, a web
+font and a slow script added the way a real listing carries them. Each
+mode loads the page N times. The old path waits for networkidle, ships the
+whole DOM back and parses it with BeautifulSoup. The new path blocks heavy
+resources, waits for the event cards to settle and runs the extractor in
+the page. Reports time per page, bytes the server sent, and bytes handed
+back to Python.
+
+Needs Chromium for Playwright (`playwright install chromium`).
+
+Usage: python benchmarks/bench_browser_extraction.py [--pages 10] [--images 40]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.base_scraper import close_shared_clients
+from scrapers.browser_pool import browser_pool
+from scrapers.dairy_scraper import DairyScraper
+from scrapers.fetch_policy import fetch_policy
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'dairy_events.html')
+
+
+def build_page(images):
+    html = open(FIXTURE, encoding='utf-8').read()
+    extras = (
+        "<link rel='stylesheet' href='/static/fonts.css'>"
+        "<script src='/static/widget.js'></script>"
+        + "".join(f"<img src='/static/poster{i}.jpg'>" for i in range(images))
+    )
+    return html.replace('</body>', extras + '</body>')
+
+
+async def start_server(page):
+    served = {'bytes': 0}
+
+    def respond(body, content_type, delay=0.0):
+        async def handler(request):
+            if delay:
+                await asyncio.sleep(delay)
+            served['bytes'] += len(body)
+            return web.Response(body=body, content_type=content_type)
+        return handler
+
+    app = web.Application()
+    app.router.add_get('/events/', respond(page.encode('utf-8'), 'text/html'))
+    app.router.add_get('/static/fonts.css', respond(
+        b"@font-face { font-family: Brand; src: url('/static/brand.woff2'); } body { font-family: Brand; }",
+        'text/css'))
+    app.router.add_get('/static/brand.woff2', respond(b'\0' * 80_000, 'font/woff2', delay=0.1))
+    app.router.add_get('/static/widget.js', respond(b'// analytics widget\n' * 2_000, 'application/javascript', delay=0.3))
+    app.router.add_get('/static/{name}.jpg', respond(b'\0' * 150_000, 'image/jpeg', delay=0.05))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/events/", served
+
+
+async def full_dom(url):
+    """The previous browser fetch: every resource, networkidle, the whole DOM parsed in Python."""
+    async with browser_pool.page() as page:
+        await page.goto(url, wait_until='networkidle')
+        html = await page.content()
+    return len(html.encode('utf-8')), DairyScraper.parse_events(html)
+
+
+async def in_page_extraction(url):
+    scraper = DairyScraper()
+    cards = await scraper.extract_in_browser(url)
+    return len(json.dumps(cards).encode('utf-8')), DairyScraper.events_from_cards(cards)
+
+
+async def measure(name, scrape, url, served, pages):
+    served['bytes'] = 0
+    returned = 0
+    started = time.perf_counter()
+    for _ in range(pages):
+        size, events = await scrape(url)
+        returned += size
+    elapsed = time.perf_counter() - started
+    print(f"{name:>20} {elapsed / pages * 1000:>10.0f} {served['bytes'] / pages / 1024:>12.0f} "
+          f"{returned / pages / 1024:>14.1f} {len(events):>7}")
+
+
+async def main(pages, images):
+    fetch_policy.rate = 0
+    runner, url, served = await start_server(build_page(images))
+    try:
+        # Launch the shared browser before timing anything
+        await in_page_extraction(url)
+        print(f"{pages} pages, {images} images each")
+        print(f"{'mode':>20} {'ms/page':>10} {'served KiB':>12} {'returned KiB':>14} {'events':>7}")
+        await measure('full DOM', full_dom, url, served, pages)
+        await measure('in-page extraction', in_page_extraction, url, served, pages)
+    finally:
+        await close_shared_clients()
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--images', type=int, default=40)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(main(args.pages, args.images))
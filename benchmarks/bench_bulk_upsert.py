@@ -0,0 +1,111 @@
+"""Benchmark scraper event storage: row-by-row probe/insert vs. the staged bulk upsert.
+
+Each size is measured for a first load, an identical re-scrape and a re-scrape
+where 10% of the events changed.
+
+Usage: python benchmarks/bench_bulk_upsert.py [--sizes 1000,10000,50000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate
+from scrapers.event import Event
+from scrapers.scraper_manager import ScraperManager
+
+
+def make_events(count, changed_every=0):
+    events = []
+    for i in range(count):
+        changed = changed_every and i % changed_every == 0
+        events.append(Event.create(
+            title=f'Bench Event {i}',
+            date=f'2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+            time='20:00' if changed else '19:00',
+            location='Somewhere',
+            description='A benchmark event',
+            url=f'https://example.com/event/{i}',
+            source='bench',
+            source_id=str(i),
+        ))
+    return events
+
+
+def legacy_store(db_path, events):
+    """The original _store_events: a duplicate probe plus an UPDATE or INSERT per event."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    cursor = conn.cursor()
+    for event in events:
+        cursor.execute("""
+            SELECT id FROM events
+            WHERE (title = ? AND date = ? AND source = ?)
+            OR (source = ? AND source_id = ? AND source_id IS NOT NULL)
+        """, (event.title, event.date, event.source, event.source, event.source_id))
+        existing = cursor.fetchone()
+        params = tuple(event)
+        if existing:
+            cursor.execute("""
+                UPDATE events
+                SET title = ?, date = ?, time = ?, location = ?, description = ?,
+                    url = ?, needs_review = ?, source = ?, source_id = ?
+                WHERE id = ?
+            """, params + (existing[0],))
+        else:
+            cursor.execute("""
+                INSERT INTO events (title, date, time, location, description, url, needs_review, source, source_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, params)
+    conn.commit()
+    conn.close()
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,50000')
+    args = parser.parse_args()
+
+    print(f"{'events':>8} {'phase':>10} {'legacy ms':>10} {'bulk ms':>9} {'speedup':>8}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        phases = [
+            ('initial', make_events(size)),
+            ('unchanged', make_events(size)),
+            ('10% diff', make_events(size, changed_every=10)),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_db = os.path.join(tmp, 'legacy.db')
+            bulk_db = os.path.join(tmp, 'bulk.db')
+            migrate(legacy_db)
+            migrate(bulk_db)
+            # The index the legacy duplicate probe was written for, dropped by migration 0014
+            legacy_conn = sqlite3.connect(legacy_db)
+            legacy_conn.execute('CREATE INDEX idx_events_source_title_date ON events(source, title, date)')
+            legacy_conn.close()
+            manager = ScraperManager(bulk_db, use_fetch_cache=False, dedup=False)
+
+            for phase, events in phases:
+                legacy_s = timed(lambda: legacy_store(legacy_db, events))
+                bulk_s = timed(lambda: manager._store_events(events))
+                print(f"{size:>8} {phase:>10} {legacy_s * 1000:>10.1f} {bulk_s * 1000:>9.1f} "
+                      f"{legacy_s / bulk_s:>7.1f}x")
+
+            query = 'SELECT title, date, time, source_id FROM events ORDER BY source_id'
+            legacy_conn, bulk_conn = sqlite3.connect(legacy_db), sqlite3.connect(bulk_db)
+            if legacy_conn.execute(query).fetchall() != bulk_conn.execute(query).fetchall():
+                raise SystemExit(f'Result mismatch at size {size}')
+            legacy_conn.close()
+            bulk_conn.close()
+
+
+if __name__ == '__main__':
+    main()
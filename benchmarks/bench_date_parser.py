@@ -0,0 +1,122 @@
+"""Benchmark the old strptime-chain parse_date against the compiled, cached date parser.
+
+Runs both over a corpus of date strings as venues publish them, repeated
+the way a scrape run sees them (the same few dates on many events), and
+reports the per-call cost of the old parser, the compiled parser with a
+cold cache and with a warm cache. Strings the old parser handled must
+parse to the same date.
+
+Usage: python benchmarks/bench_date_parser.py [--repeat 200]
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers import date_parser
+
+logger = logging.getLogger('bench_date_parser')
+
+# As they appear in event listings: <time> values, card headers, ticketing blurbs
+CORPUS = [
+    '2030-03-14', '2030-03-15', '2030-03-21', '2030-04-02', '2030-11-30',
+    'March 14, 2030', 'March 15, 2030', 'April 2, 2030', 'September 9, 2030',
+    'Mar 14, 2030', 'Apr 2, 2030', 'Sept 19, 2030', 'Dec 31, 2030',
+    'Friday, March 14, 2030', 'Saturday, March 15, 2030', 'Sunday, Apr 6, 2030',
+    'Sat, Mar 15th, 2030 at 7:30 PM', 'Thu, April 3rd, 2030 - Doors 6pm',
+    'Fri., Oct 3, 2030 8:00 PM', 'Tuesday, Nov 11th, 2030 - 7:00 PM MT',
+    '3/14/2030', '03/15/2030', '4/2/2030', '25/12/2030',
+    '2030/03/14', '2030.04.02',
+    'TBA', 'Every Thursday', 'Doors at 7pm', '',
+]
+
+
+def legacy_parse_date(date_str):
+    """BaseScraper.parse_date before the compiled parser, verbatim."""
+    if not date_str:
+        return None
+
+    logger.info(f"Parsing date string: {date_str}")
+    try:
+        formats = [
+            "%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%Y/%m/%d", "%m/%d/%Y",
+            "%d/%m/%Y", "%Y.%m.%d", "%A, %B %d, %Y", "%A, %b %d, %Y",
+        ]
+        date_str = date_str.strip()
+        for fmt in formats:
+            try:
+                date_obj = datetime.strptime(date_str, fmt)
+                result = date_obj.strftime("%Y-%m-%d")
+                logger.info(f"Successfully parsed date: {result}")
+                return result
+            except ValueError:
+                continue
+
+        pattern = r'(?:.*,\s*)?(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?,\s*(\d{4})'
+        match = re.search(pattern, date_str)
+        if match:
+            month, day, year = match.groups()
+            try:
+                month_num = datetime.strptime(month, '%B').month
+            except ValueError:
+                try:
+                    month_num = datetime.strptime(month[:3], '%b').month
+                except ValueError:
+                    return None
+            return f"{year}-{str(month_num).zfill(2)}-{str(int(day)).zfill(2)}"
+        return None
+    except Exception as e:
+        logger.error(f"Failed to parse date '{date_str}': {str(e)}")
+        return None
+
+
+def time_per_call(parse, strings, before_each=None):
+    started = time.perf_counter()
+    for text in strings:
+        if before_each:
+            before_each()
+        parse(text)
+    return (time.perf_counter() - started) / len(strings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    # Old parser logs at INFO; measure it as it ran in production with INFO off
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for text in CORPUS:
+        old, new = legacy_parse_date(text), date_parser.parse_date(text)
+        if old is not None and old != new:
+            raise SystemExit(f'{text!r}: old parser gave {old}, compiled parser gave {new}')
+
+    strings = CORPUS * args.repeat
+    uncached = date_parser.parse_date.__wrapped__
+    results = [
+        ('old strptime chain', time_per_call(legacy_parse_date, strings)),
+        ('compiled, no cache', time_per_call(uncached, strings)),
+        ('compiled, warm cache', time_per_call(date_parser.parse_date, strings)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{len(CORPUS)} distinct strings x {args.repeat}")
+    print(f"{'parser':>22} {'us/call':>8} {'speedup':>8}")
+    for name, seconds in results:
+        print(f"{name:>22} {seconds * 1e6:>8.2f} {baseline / seconds:>7.1f}x")
+
+    ranges = ['March 15–17', 'March 15-17, 2030', 'Dec 30 - Jan 2', 'Dec 30 - Jan 2, 2031',
+              '3/15/2030 - 3/17/2030', 'March 5 - 8:00 PM']
+    print()
+    for text in ranges:
+        print(f"{text!r:>26} -> {', '.join(date_parser.extract_dates(text, 2030))}")
+
+
+if __name__ == '__main__':
+    main()
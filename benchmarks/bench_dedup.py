@@ -0,0 +1,131 @@
+"""Benchmark the cross-source duplicate index: indexing cost as the table grows, and match quality.
+
+Generates events for a venue source and a city-calendar source. A share of
+the calendar's events relist venue events, each at most once, with the
+usual differences: case, punctuation, typos, extra words, another time
+format and a shortened venue name. Dates span more years as the table grows (about 70 events a
+day, as a table accumulates history), and --years pins the span instead.
+Indexes every event in id order and reports the time per event and
+precision/recall of the canonical links against the known relistings.
+
+Usage: python benchmarks/bench_dedup.py [--sizes 10000,50000,200000] [--dup-rate 0.2] [--years N]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate
+from scrapers.dedup import DedupIndex
+
+WORDS = ('jazz quartet trio night open mic poetry reading author signing film screening chamber '
+         'orchestra blues folk songwriter showcase comedy improv workshop dance party vinyl '
+         'listening session acoustic brunch gala benefit lecture series spring winter summer '
+         'autumn festival tribute band orchestra choir recital piano guitar cello string swing '
+         'salsa tango ballet opera premiere encore matinee cabaret burlesque karaoke trivia').split()
+VENUES = [
+    ('Trident Café, 940 Pearl St, Boulder, CO 80302', 'Trident Cafe'),
+    ('Dairy Arts Center, 2590 Walnut Street, Boulder, CO 80302', 'The Dairy, 2590 Walnut St'),
+    ('Boulder Theater, 2032 14th St, Boulder, CO 80302', 'Boulder Theater'),
+    ('Chautauqua Auditorium, 900 Baseline Rd, Boulder, CO 80302', 'Chautauqua Auditorium'),
+    ('eTown Hall, 1535 Spruce St, Boulder, CO 80302', 'eTown'),
+]
+
+
+def relist(title, rng):
+    """How another calendar might write the same title."""
+    words = title.split()
+    change = rng.randrange(4)
+    if change == 0:
+        return title.upper()
+    if change == 1 and len(words) > 2:
+        i = rng.randrange(len(words))
+        word = words[i]
+        if len(word) > 4:
+            j = rng.randrange(1, len(word) - 1)
+            words[i] = word[:j] + word[j + 1:]
+        return ' '.join(words)
+    if change == 2:
+        return f'Live: {title}!'
+    return f'{title} (all ages)'
+
+
+def random_day(rng, years):
+    return f'{2030 + rng.randrange(years)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+
+
+def generate(count, dup_rate, rng, years):
+    """Rows for both sources, and each row's origin: the venue event it lists (source_id)."""
+    rows, origin = [], {}
+    venue_events = []
+    for i in range(count // 2):
+        title = ' '.join(rng.sample(WORDS, rng.randint(3, 5))).title()
+        day = random_day(rng, years)
+        hour = rng.randint(17, 21)
+        venue = rng.choice(VENUES)
+        rows.append((title, day, f'{hour - 12}:00 PM', venue[0], 'venue', f'v{i}'))
+        origin[f'v{i}'] = f'v{i}'
+        venue_events.append((f'v{i}', title, day, hour, venue))
+    for i in range(count - count // 2):
+        if rng.random() < dup_rate and venue_events:
+            # A calendar lists each venue event once
+            source_id, title, day, hour, venue = venue_events.pop(rng.randrange(len(venue_events)))
+            rows.append((relist(title, rng), day, f'{hour}:00', venue[1], 'calendar', f'c{i}'))
+            origin[f'c{i}'] = source_id
+        else:
+            title = ' '.join(rng.sample(WORDS, rng.randint(3, 5))).title()
+            day = random_day(rng, years)
+            rows.append((title, day, f'{rng.randint(5, 9)}:30 PM', rng.choice(VENUES)[1], 'calendar', f'c{i}'))
+            origin[f'c{i}'] = f'c{i}'
+    rng.shuffle(rows)
+    return rows, origin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,50000,200000')
+    parser.add_argument('--dup-rate', type=float, default=0.2)
+    parser.add_argument('--years', type=int)
+    args = parser.parse_args()
+
+    print(f"{'events':>8} {'index s':>8} {'us/event':>9} {'linked':>7} {'precision':>10} {'recall':>7}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        years = args.years or max(1, round(size / (70 * 336)))
+        rows, origin = generate(size, args.dup_rate, random.Random(size), years)
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'dedup.db')
+            migrate(db_path)
+            conn = sqlite3.connect(db_path)
+            conn.executemany("""
+                INSERT INTO events (title, date, time, location, source, source_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+
+            started = time.perf_counter()
+            linked = DedupIndex(conn).rebuild()
+            elapsed = time.perf_counter() - started
+
+            # source_id -> source_id of its canonical event (itself when canonical)
+            root = dict(conn.execute("""
+                SELECT e.source_id, COALESCE(c.source_id, e.source_id)
+                FROM events e LEFT JOIN events c ON c.id = e.canonical_event_id
+            """).fetchall())
+            conn.close()
+
+        links = [(source_id, canonical) for source_id, canonical in root.items() if source_id != canonical]
+        correct = sum(1 for source_id, canonical in links if origin[source_id] == origin[canonical])
+        relisted = [source_id for source_id, venue_id in origin.items() if source_id != venue_id]
+        found = sum(1 for source_id in relisted if root[source_id] == root[origin[source_id]])
+        precision = correct / len(links) if links else 1.0
+        recall = found / len(relisted) if relisted else 1.0
+        print(f"{size:>8} {elapsed:>8.2f} {elapsed / size * 1e6:>9.0f} {linked:>7} {precision:>10.3f} {recall:>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
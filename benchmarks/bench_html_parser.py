@@ -0,0 +1,81 @@
+"""Benchmark scraper parsing backends on the fixture pages: full-document vs. container-only parsing.
+
+For each fixture and backend, runs the scraper's parse_events and reports
+the best parse time and the peak Python heap (tracemalloc) during one parse.
+selectolax's own C allocations are not visible to tracemalloc, only the
+BeautifulSoup tree built from the containers it finds.
+
+Usage: python benchmarks/bench_html_parser.py [--repeat 10]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from scrapers import dairy_scraper, html_parser, trident_scraper
+from scrapers.dairy_scraper import DairyScraper
+from scrapers.trident_scraper import TridentScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+FIXTURES = [
+    ('trident_events.html', TridentScraper, trident_scraper),
+    ('dairy_events.html', DairyScraper, dairy_scraper),
+]
+
+
+def backends():
+    # name -> parse function with parse_containers' signature
+    options = {'full html.parser (old)': lambda html, selector: BeautifulSoup(html, 'html.parser')}
+    options['strained html.parser'] = lambda html, selector: html_parser.parse_containers(html, selector, 'html.parser')
+    if html_parser.lxml is not None:
+        options['full lxml'] = lambda html, selector: BeautifulSoup(html, 'lxml')
+        options['strained lxml'] = lambda html, selector: html_parser.parse_containers(html, selector, 'lxml')
+    if html_parser.LexborHTMLParser is not None:
+        options['selectolax'] = lambda html, selector: html_parser.parse_containers(html, selector, 'selectolax')
+    return options
+
+
+def measure(scraper_class, html, repeat):
+    tracemalloc.start()
+    events = scraper_class.parse_events(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        scraper_class.parse_events(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings), peak, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"{'fixture':>20} {'backend':>24} {'parse ms':>9} {'peak KiB':>9} {'events':>7}")
+    for filename, scraper_class, module in FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, filename), 'r', encoding='utf-8') as f:
+            html = f.read()
+        baseline = None
+        for name, parse in backends().items():
+            module.parse_containers = parse
+            seconds, peak, events = measure(scraper_class, html, args.repeat)
+            if baseline is None:
+                baseline = events
+            elif events != baseline:
+                raise SystemExit(f'{name} extracted different events from {filename}')
+            print(f"{filename:>20} {name:>24} {seconds * 1000:>9.1f} {peak / 1024:>9.0f} {len(events):>7}")
+        module.parse_containers = html_parser.parse_containers
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark scraper page fetches: a new aiohttp session per URL vs. the shared client.
+
+Serves a gzip-compressed events page from a local aiohttp server and fetches
+it repeatedly with both strategies, reporting wall time and how many TCP
+connections the server had to accept.
+
+Usage: python benchmarks/bench_http_client.py [--fetches 200] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.http_client import HttpClient
+
+PAGE = ("<html><body>" + "".join(
+    f"<article class='eventlist-event'><h1 class='eventlist-title'>Event {i}</h1>"
+    f"<time class='event-date'>Monday, March {i % 28 + 1}, 2030</time>"
+    f"<div class='eventlist-description'>Live music at 7pm. {'Lorem ipsum ' * 20}</div></article>"
+    for i in range(200)
+) + "</body></html>")
+
+
+async def start_server():
+    connections = set()
+
+    async def events_page(request):
+        connections.add(request.transport.get_extra_info('peername'))
+        response = web.Response(text=PAGE, content_type='text/html')
+        response.enable_compression()
+        return response
+
+    app = web.Application()
+    app.router.add_get('/events/{n}', events_page)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", connections
+
+
+async def fetch_with_new_sessions(urls, concurrency):
+    """The original get_page_content: one ClientSession per URL."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    return await response.text()
+
+    return await asyncio.gather(*[fetch(url) for url in urls])
+
+
+async def fetch_with_shared_client(urls, concurrency):
+    client = HttpClient(limit_per_host=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            session = await client.session()
+            async with session.get(url) as response:
+                return await response.text()
+
+    try:
+        return await asyncio.gather(*[fetch(url) for url in urls])
+    finally:
+        await client.close()
+
+
+async def main(fetches, concurrency):
+    runner, base_url, connections = await start_server()
+    urls = [f"{base_url}/events/{n}" for n in range(fetches)]
+    try:
+        print(f"{'strategy':<16} {'fetches':>8} {'seconds':>9} {'fetch/s':>9} {'connections':>12}")
+        for name, strategy in (('session per URL', fetch_with_new_sessions),
+                               ('shared client', fetch_with_shared_client)):
+            connections.clear()
+            started = time.perf_counter()
+            pages = await strategy(urls, concurrency)
+            elapsed = time.perf_counter() - started
+            assert all(page == PAGE for page in pages)
+            print(f"{name:<16} {fetches:>8} {elapsed:>9.3f} {fetches / elapsed:>9.0f} {len(connections):>12}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fetches', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.fetches, args.concurrency))
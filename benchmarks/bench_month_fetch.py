@@ -0,0 +1,125 @@
+"""Benchmark the month event fetch: per-event tag lookups vs. the batched read path.
+
+Usage: python benchmarks/bench_month_fetch.py [--sizes 10,100,500,2000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_queries import month_window, fetch_events_in_window
+from migrations import seed
+
+
+def build_db(path, events_in_month):
+    seed(path)
+    conn = sqlite3.connect(path)
+    tag_ids = [row[0] for row in conn.execute('SELECT id FROM tags')]
+    rng = random.Random(42)
+    rows = []
+    for i in range(events_in_month):
+        rows.append((
+            f'Bench Event {i}', f'2030-03-{rng.randint(1, 31):02d}', '19:00', 'Somewhere',
+            'A benchmark event', None, rng.random() < 0.1, 'bench', str(i)
+        ))
+    conn.executemany('''
+        INSERT INTO events (title, date, time, location, description, url, needs_review, source, source_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    event_ids = [row[0] for row in conn.execute("SELECT id FROM events WHERE source = 'bench'")]
+    conn.executemany(
+        'INSERT INTO event_tags (event_id, tag_id) VALUES (?, ?)',
+        [(event_id, tag_id) for event_id in event_ids for tag_id in rng.sample(tag_ids, 3)]
+    )
+    # Some withdrawn listings, which both paths must skip, and some linked duplicates
+    conn.executemany("UPDATE events SET withdrawn_at = CURRENT_TIMESTAMP WHERE id = ?",
+                     [(event_id,) for event_id in event_ids if rng.random() < 0.05])
+    conn.executemany("UPDATE events SET canonical_event_id = ? WHERE id = ?",
+                     [(event_ids[0], event_id) for event_id in event_ids[1:] if rng.random() < 0.05])
+    conn.commit()
+    conn.close()
+
+
+def legacy_fetch(conn, start_date, end_date, include_pending):
+    """The original get_events loop: one tag query per event row, with today's columns and filters."""
+    cursor = conn.cursor()
+    sql = "SELECT * FROM events WHERE date >= ? AND date < ? AND withdrawn_at IS NULL"
+    if not include_pending:
+        sql += " AND needs_review = 0"
+    cursor.execute(sql, (start_date, end_date))
+    events = []
+    for row in cursor.fetchall():
+        cursor.execute('''
+            SELECT t.*
+            FROM tags t
+            JOIN event_tags et ON t.id = et.tag_id
+            WHERE et.event_id = ?
+            ORDER BY t.name
+        ''', (row['id'],))
+        tags = [dict(tag) for tag in cursor.fetchall()]
+        events.append({
+            'id': row['id'],
+            'title': row['title'],
+            'date': row['date'],
+            'time': row['time'],
+            'location': row['location'],
+            'description': row['description'],
+            'url': row['url'],
+            'needs_review': bool(row['needs_review']),
+            'source': row['source'],
+            'source_id': row['source_id'],
+            'canonical_event_id': row['canonical_event_id'],
+            'tags': tags
+        })
+    return events
+
+
+def measure(conn, fetch, repeat):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    fetch()
+    conn.set_trace_callback(None)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fetch()
+        timings.append(time.perf_counter() - started)
+    return len(statements), min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,500,2000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    start_date, end_date = month_window(2030, 3)
+    print(f"{'events':>8} {'legacy q':>9} {'legacy ms':>10} {'batched q':>10} {'batched ms':>11} {'speedup':>8}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.db')
+            build_db(path, size)
+            conn = sqlite3.connect(path)
+            conn.row_factory = sqlite3.Row
+
+            legacy_q, legacy_s, legacy = measure(
+                conn, lambda: legacy_fetch(conn, start_date, end_date, True), args.repeat)
+            batched_q, batched_s, batched = measure(
+                conn, lambda: fetch_events_in_window(conn, start_date, end_date, include_pending=True), args.repeat)
+            conn.close()
+
+            if sorted(legacy, key=lambda e: e['id']) != batched:
+                raise SystemExit(f'Result mismatch at size {size}')
+
+            print(f"{size:>8} {legacy_q:>9} {legacy_s * 1000:>10.2f} {batched_q:>10} "
+                  f"{batched_s * 1000:>11.2f} {legacy_s / batched_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
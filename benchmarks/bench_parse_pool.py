@@ -0,0 +1,95 @@
+"""Benchmark scraping several sources at once with parsing on the event loop vs. in the parse pool.
+
+Each simulated source waits on a fake network fetch and then parses a large
+synthetic Trident events page. Reports total wall time and the worst event
+loop stall (how late a 10 ms heartbeat fired) for each worker count.
+
+Usage: python benchmarks/bench_parse_pool.py [--sources 8] [--events 400] [--workers 1,2,4]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers import trident_scraper
+from scrapers.parse_pool import ParsePool
+from scrapers.trident_scraper import TridentScraper
+
+
+def make_page(events):
+    articles = []
+    for i in range(events):
+        articles.append(f'''
+            <article class="eventlist-event">
+                <h1 class="eventlist-title"><a class="eventlist-title-link" href="/events/bench-{i}">Bench Event {i}</a></h1>
+                <time class="event-date">2030-03-{i % 28 + 1:02d}</time>
+                <div class="eventlist-description"><p>Live music at 7:30 PM. {"Lorem ipsum dolor sit amet. " * 20}</p></div>
+            </article>''')
+    return f'<html><body><nav>{"<a href=#>x</a>" * 50}</nav><main>{"".join(articles)}</main></body></html>'
+
+
+class InlineParsePool:
+    """The old behaviour: parse right on the event loop."""
+
+    async def run(self, parse_job, *args):
+        return parse_job(*args)
+
+
+class BenchTrident(TridentScraper):
+    page = ''
+    latency = 0.05
+
+    async def fetch_html(self, url, use_browser=False):
+        await asyncio.sleep(self.latency)
+        return self.page
+
+
+async def heartbeat(stop, interval=0.01):
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def scrape_all(sources):
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(BenchTrident().scrape() for _ in range(sources)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await monitor, sum(len(events) for events in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sources', type=int, default=8)
+    parser.add_argument('--events', type=int, default=400)
+    parser.add_argument('--workers', default=','.join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})))
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    BenchTrident.page = make_page(args.events)
+    print(f"{args.sources} sources x {args.events} events, {os.cpu_count()} CPUs")
+    print(f"{'mode':>12} {'wall s':>8} {'max stall ms':>13} {'events':>7}")
+
+    pools = [('on loop', InlineParsePool())]
+    pools += [(f'{n} workers', ParsePool(n)) for n in [int(w) for w in args.workers.split(',')]]
+    for name, pool in pools:
+        trident_scraper.parse_pool = pool
+        # Start the workers before timing
+        asyncio.run(scrape_all(1))
+        elapsed, stall, count = asyncio.run(scrape_all(args.sources))
+        print(f"{name:>12} {elapsed:>8.2f} {stall * 1000:>13.1f} {count:>7}")
+        if isinstance(pool, ParsePool):
+            pool.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    main()
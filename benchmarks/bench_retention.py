@@ -0,0 +1,111 @@
+"""Benchmark removing expired events: one unbounded DELETE vs. batched archiving, as seen by a concurrent writer.
+
+Fills a database with N past events (three tags each, plus dedup bands)
+and upcoming ones, then expires the past events while another thread keeps
+writing single events the way a scrape or an admin edit would. Reports the
+time to expire everything and the writer's worst and 99th percentile wait
+for the write lock.
+
+Usage: python benchmarks/bench_retention.py [--events 200000]
+"""
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import connect
+from migrations import migrate
+from retention import EventRetention
+
+
+def fill(db_path, count):
+    rng = random.Random(count)
+    conn = connect(db_path)
+    conn.executemany("INSERT INTO tags (id, name) VALUES (?, ?)", [(i, f'tag{i}') for i in range(1, 51)])
+    events = []
+    for i in range(count):
+        # About 90% expired; the rest are upcoming
+        year = 2020 if i % 10 else 2099
+        events.append((i + 1, f'Event {i}', f'{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                       'Bench' if i % 3 else None, str(i) if i % 3 else None))
+    conn.executemany("INSERT INTO events (id, title, date, source, source_id) VALUES (?, ?, ?, ?, ?)", events)
+    conn.executemany("INSERT OR IGNORE INTO event_tags (event_id, tag_id) VALUES (?, ?)",
+                     [(i + 1, rng.randint(1, 50)) for i in range(count) for _ in range(3)])
+    conn.executemany("INSERT INTO event_dedup_bands (band, date, event_id) VALUES (?, ?, ?)",
+                     [(rng.getrandbits(62), date, event_id) for event_id, _, date, _, _ in events for _ in range(2)])
+    conn.commit()
+    conn.close()
+
+
+def unbounded_delete(db_path):
+    """The old ScraperManager.cleanup, with the tag and band rows it left behind."""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM event_tags WHERE event_id IN (SELECT id FROM events WHERE date < date('now', '-30 days'))")
+        conn.execute("DELETE FROM event_dedup_bands WHERE event_id IN (SELECT id FROM events WHERE date < date('now', '-30 days'))")
+        conn.execute("DELETE FROM events WHERE date < date('now', '-30 days')")
+    conn.close()
+
+
+def batched_archive(db_path):
+    EventRetention(db_path, policies={}).run()
+
+
+def measure(name, expire, count):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        migrate(db_path)
+        fill(db_path, count)
+
+        waits, done = [], threading.Event()
+
+        def writer():
+            conn = connect(db_path)
+            conn.execute("PRAGMA busy_timeout = 60000")
+            i = 0
+            while not done.is_set():
+                started = time.perf_counter()
+                with conn:
+                    conn.execute("INSERT INTO events (title, date, source) VALUES (?, '2099-01-01', 'writer')",
+                                 (f'Write {i}',))
+                waits.append(time.perf_counter() - started)
+                i += 1
+                time.sleep(0.005)
+            conn.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        time.sleep(0.2)
+        started = time.perf_counter()
+        expire(db_path)
+        elapsed = time.perf_counter() - started
+        done.set()
+        thread.join()
+
+        worst = max(waits) * 1000
+        p99 = statistics.quantiles(waits, n=100, method="inclusive")[98] * 1000
+        print(f"{name:>18} {elapsed:>8.2f} {len(waits):>8} {p99:>12.1f} {worst:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=200000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"{args.events} events, about 90% expired")
+    print(f"{'mode':>18} {'expire s':>8} {'writes':>8} {'p99 wait ms':>12} {'max wait ms':>12}")
+    measure('unbounded delete', unbounded_delete, args.events)
+    measure('batched archive', batched_archive, args.events)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark storing a large source all at once vs. streaming its events through batched writes.
+
+A synthetic source yields N events, building each one as it goes like a
+paginated scraper would. The old path collects them into a list and stores
+them in one transaction at the end; the streaming path feeds them through
+ScraperManager's bounded queue and batched writer. Reports wall time, time
+until the first event reaches the database and the peak Python heap
+(tracemalloc).
+
+Usage: python benchmarks/bench_streaming_store.py [--events 20000] [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate
+from scrapers.base_scraper import BaseScraper
+from scrapers.scraper_manager import ScraperManager
+
+
+class SyntheticScraper(BaseScraper):
+    events = 20000
+
+    def __init__(self):
+        super().__init__("Synthetic")
+
+    async def scrape(self):
+        return [event async for event in self.iter_events()]
+
+    async def iter_events(self):
+        for i in range(self.events):
+            if i % 100 == 0:
+                # A page boundary: the fetch of the next page
+                await asyncio.sleep(0)
+            yield self.format_event({
+                'title': f'Synthetic Event {i}',
+                'date': f'2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+                'time': '7:30 PM',
+                'location': 'Bench Hall, 1 Main St',
+                'description': f'Event {i}. ' + 'Lorem ipsum dolor sit amet. ' * 20,
+                'url': f'https://example.com/events/{i}',
+                'source_id': str(i),
+            })
+
+
+def first_write_probe(manager):
+    """Wrap _store_events to record when the first batch lands."""
+    first = {}
+    store = manager._store_events
+
+    def timed_store(events):
+        stats = store(events)
+        first.setdefault('at', time.perf_counter())
+        return stats
+
+    manager._store_events = timed_store
+    return first
+
+
+async def store_all_at_end(manager):
+    scraper = SyntheticScraper()
+    events = [event async for event in scraper.iter_events()]
+    await asyncio.to_thread(manager._store_events, events)
+
+
+async def stream(manager):
+    await manager._stream_events(SyntheticScraper(), {'events': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+                                                     'duplicates': 0})
+
+
+def measure(name, run, batch_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        migrate(db_path)
+        manager = ScraperManager(db_path, use_fetch_cache=False, batch_size=batch_size, dedup=False)
+        first = first_write_probe(manager)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        asyncio.run(run(manager))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stored = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        print(f"{name:>16} {elapsed:>8.2f} {first['at'] - started:>14.2f} {peak / 1024 / 1024:>9.1f} {stored:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    SyntheticScraper.events = args.events
+    print(f"{args.events} events, batches of {args.batch_size}")
+    print(f"{'mode':>16} {'wall s':>8} {'first write s':>14} {'peak MiB':>9} {'stored':>8}")
+    measure('store at end', store_all_at_end, args.batch_size)
+    measure('streaming', stream, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Fail if any registered hot query falls back to a full table scan.
+
+Runs EXPLAIN QUERY PLAN for every entry in HOT_QUERIES against a freshly
+migrated database (or an existing one with --db) and exits non-zero when a
+plan contains a SCAN of a real table. Plans name tables by their alias, so
+aliases are mapped back to tables from each query's FROM and JOIN clauses.
+
+Usage: python check_query_plans.py [--db PATH]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from event_queries import CHANGES_SINCE_SQL, events_in_window_sql, tags_in_window_sql
+from migrations import migrate
+from month_cache import MONTH_STAMP_SQL
+from preference_routes import EVENTS_BY_TAG_SQL, RECOMMENDED_EVENTS_SQL
+from retention import EXPIRED_RUNS_SQL, expired_events_sql
+from scrapers.dedup import BANDS, CANDIDATES_SQL, CLUSTER_HAS_SOURCE_SQL
+from scrapers.scraper_manager import ScraperManager
+
+# name -> (sql, sample parameters)
+HOT_QUERIES = {
+    'month events (admin)': (events_in_window_sql(True), ('2025-02-01', '2025-03-01')),
+    'month events (public)': (events_in_window_sql(False), ('2025-02-01', '2025-03-01')),
+    'month tags (admin)': (tags_in_window_sql(True), ('2025-02-01', '2025-03-01')),
+    'month tags (public)': (tags_in_window_sql(False), ('2025-02-01', '2025-03-01')),
+    'month stamp': (MONTH_STAMP_SQL, ('2025-02',)),
+    'event tags': ('''
+        SELECT t.*
+        FROM tags t
+        JOIN event_tags et ON t.id = et.tag_id
+        WHERE et.event_id = ?
+        ORDER BY t.name
+    ''', (1,)),
+    'scraper staged changes': (ScraperManager.STAGED_CHANGES_SQL, ()),
+    'scraper bulk upsert': (ScraperManager.UPSERT_STAGED_SQL, (1,)),
+    'scraper missing events': (ScraperManager.MISSING_EVENTS_SQL, ('Trident', '2025-02-01')),
+    'scraper live event count': (ScraperManager.LIVE_EVENT_COUNT_SQL, ('Trident', '2025-02-01')),
+    'event changes since run': (CHANGES_SINCE_SQL, (1, 1, 50)),
+    'dedup candidates': (CANDIDATES_SQL, (*range(BANDS), '2025-02-01', '2025-02-03', 1, 'Trident')),
+    'dedup cluster sources': (CLUSTER_HAS_SOURCE_SQL, (1, 'Trident', 2) * 2),
+    'events by tag': (EVENTS_BY_TAG_SQL, (1, 3)),
+    'recommended events': (RECOMMENDED_EVENTS_SQL, (1,)),
+    'retention expired events': (expired_events_sql('source = ? AND date < ?'), ('Trident', '2025-01-01', 500)),
+    'retention expired events (manual)': (expired_events_sql('source IS NULL AND date < ?'), ('2025-01-01', 500)),
+    'retention expired runs': (EXPIRED_RUNS_SQL, ('-30 days', 500)),
+}
+
+# Per-run temp tables that are read in full by design
+ALLOWED_SCANS = {'staged_events'}
+
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+(?:\w+\.)?(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+
+
+def table_aliases(sql):
+    """Map every table name and alias in sql's FROM and JOIN clauses to the tables it names."""
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        aliases.setdefault(table, set()).add(table)
+        if alias:
+            aliases.setdefault(alias, set()).add(table)
+    return aliases
+
+
+def find_scans(conn):
+    """Return {query name: [plan lines]} for queries whose plan scans a table."""
+    tables = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "UNION SELECT name FROM sqlite_temp_master WHERE type = 'table'"
+    )}
+    failures = {}
+    for name, (sql, params) in HOT_QUERIES.items():
+        aliases = table_aliases(sql)
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        scans = [
+            detail for detail in plan
+            if detail.startswith('SCAN ')
+            and aliases.get(detail.split()[1], {detail.split()[1]}) & (tables - ALLOWED_SCANS)
+        ]
+        if scans:
+            failures[name] = plan
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check hot query plans for table scans.')
+    parser.add_argument('--db', help='Check an existing database instead of a fresh one')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, 'plans.db')
+        migrate(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute(ScraperManager.STAGING_TABLE_SQL)
+        conn.execute(ScraperManager.SEEN_TABLE_SQL)
+        failures = find_scans(conn)
+        conn.close()
+
+    for name, plan in failures.items():
+        print(f"FAIL {name}:")
+        for detail in plan:
+            print(f"    {detail}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {len(HOT_QUERIES)} hot queries use indexes")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
-import sqlite3
 import bcrypt
+from db import connect
 
 def create_test_user():
     # Test user credentials
@@ -11,7 +11,7 @@ def create_test_user():
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     
-    conn = sqlite3.connect('database/events.db')
+    conn = connect()
     cursor = conn.cursor()
     
     try:
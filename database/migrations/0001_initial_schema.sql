@@ -0,0 +1,83 @@
+-- Initial schema. Uses IF NOT EXISTS so databases created by the old
+-- schema.sql script are adopted without touching their data.
+
+-- Create the events table
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT,
+    location TEXT,
+    description TEXT,
+    url TEXT,
+    needs_review BOOLEAN DEFAULT 0,
+    source TEXT,
+    source_id TEXT
+);
+
+-- Create the users table
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT UNIQUE NOT NULL,
+    username TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create the tags table
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    color TEXT DEFAULT '#808080',  -- Default gray color for tags
+    category_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (category_id) REFERENCES tag_categories(id)
+);
+
+-- Create the tag categories table
+CREATE TABLE IF NOT EXISTS tag_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create the event_tags junction table
+CREATE TABLE IF NOT EXISTS event_tags (
+    event_id INTEGER,
+    tag_id INTEGER,
+    PRIMARY KEY (event_id, tag_id),
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE,
+    FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+);
+
+-- Create user_tag_preferences table
+CREATE TABLE IF NOT EXISTS user_tag_preferences (
+    user_id INTEGER,
+    tag_id INTEGER,
+    preference INTEGER NOT NULL DEFAULT 0, -- -1 for dislike, 0 for neutral, 1 for like
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, tag_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+);
+
+-- Create tag relationships table for related tags
+CREATE TABLE IF NOT EXISTS tag_relationships (
+    tag1_id INTEGER,
+    tag2_id INTEGER,
+    relationship_type TEXT NOT NULL, -- 'parent_child', 'related', 'mutually_exclusive'
+    PRIMARY KEY (tag1_id, tag2_id),
+    FOREIGN KEY (tag1_id) REFERENCES tags(id) ON DELETE CASCADE,
+    FOREIGN KEY (tag2_id) REFERENCES tags(id) ON DELETE CASCADE
+);
+
+-- Create constraints table for tag validation
+CREATE TABLE IF NOT EXISTS tag_constraints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_id INTEGER,
+    min_tags INTEGER DEFAULT 0,
+    max_tags INTEGER DEFAULT NULL,
+    required BOOLEAN DEFAULT 0,
+    FOREIGN KEY (category_id) REFERENCES tag_categories(id)
+);
@@ -0,0 +1,38 @@
+-- Indexes for the hot event queries.
+
+-- Month views: range scans on date. The partial index serves the public view,
+-- which only ever reads approved events.
+CREATE INDEX IF NOT EXISTS idx_events_date ON events(date);
+CREATE INDEX IF NOT EXISTS idx_events_approved_date ON events(date) WHERE needs_review = 0;
+
+-- Scraper duplicate probe on (title, date, source), also used for per-source lookups
+CREATE INDEX IF NOT EXISTS idx_events_source_title_date ON events(source, title, date);
+
+-- Scraped events are identified by (source, source_id). Empty ids are not ids,
+-- and for existing duplicates only the first row is kept before the key is enforced.
+UPDATE events SET source_id = NULL WHERE source_id = '';
+
+DELETE FROM event_tags
+WHERE event_id IN (
+    SELECT id FROM events
+    WHERE source_id IS NOT NULL
+    AND id NOT IN (
+        SELECT MIN(id) FROM events
+        WHERE source_id IS NOT NULL
+        GROUP BY source, source_id
+    )
+);
+
+DELETE FROM events
+WHERE source_id IS NOT NULL
+AND id NOT IN (
+    SELECT MIN(id) FROM events
+    WHERE source_id IS NOT NULL
+    GROUP BY source, source_id
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_events_source_source_id ON events(source, source_id);
+
+-- Tag -> events lookups (preferences, recommendations). Covering, so the
+-- lookup never leaves the index.
+CREATE INDEX IF NOT EXISTS idx_event_tags_tag_id ON event_tags(tag_id, event_id);
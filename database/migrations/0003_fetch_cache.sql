@@ -0,0 +1,8 @@
+-- Validators for conditional scraper fetches, one row per URL.
+CREATE TABLE IF NOT EXISTS fetch_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT NOT NULL,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
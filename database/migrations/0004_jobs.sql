@@ -0,0 +1,22 @@
+-- Background jobs (scrapes) run by the in-process worker pool.
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',  -- queued, running, succeeded, failed, cancelled
+    result TEXT,
+    error TEXT,
+    cancel_requested BOOLEAN NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- At most one queued or running job per identical request
+CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_active_dedup_key
+    ON jobs(dedup_key) WHERE status IN ('queued', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs(finished_at);
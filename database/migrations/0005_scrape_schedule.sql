@@ -0,0 +1,12 @@
+-- Per-source state for the periodic scrape scheduler.
+CREATE TABLE IF NOT EXISTS scrape_schedule (
+    source TEXT PRIMARY KEY,
+    interval_seconds REAL NOT NULL,
+    next_run_at TIMESTAMP,
+    last_run_at TIMESTAMP,
+    last_duration REAL,
+    last_status TEXT,
+    last_changed_at TIMESTAMP,
+    run_count INTEGER NOT NULL DEFAULT 0,
+    change_count INTEGER NOT NULL DEFAULT 0
+);
@@ -0,0 +1,4 @@
+-- Digest of a scraped event's content (see scrapers/event.py), so a re-scrape
+-- compares one column instead of every field. Existing rows start out NULL
+-- and get a hash the next time their source is scraped.
+ALTER TABLE events ADD COLUMN content_hash TEXT;
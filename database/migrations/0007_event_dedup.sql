@@ -0,0 +1,16 @@
+-- Cross-source duplicate detection (see scrapers/dedup.py).
+
+-- A duplicate points at the event it duplicates; NULL for canonical events.
+ALTER TABLE events ADD COLUMN canonical_event_id INTEGER REFERENCES events(id) ON DELETE SET NULL;
+CREATE INDEX IF NOT EXISTS idx_events_canonical ON events(canonical_event_id)
+    WHERE canonical_event_id IS NOT NULL;
+
+-- MinHash LSH bands of each scraped event's title, keyed for lookups of
+-- "same band, within a few days".
+CREATE TABLE IF NOT EXISTS event_dedup_bands (
+    band INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    event_id INTEGER NOT NULL REFERENCES events(id) ON DELETE CASCADE,
+    PRIMARY KEY (band, date, event_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_event_dedup_bands_event ON event_dedup_bands(event_id);
@@ -0,0 +1,28 @@
+-- Per-source scrape runs and reconciliation (see ScraperManager._reconcile).
+
+-- One row per source per scrape. A complete run is one whose listing was
+-- scraped to the end; only those withdraw events. changes is the run's
+-- change set as JSON: {"inserted": [ids], "updated": [ids], "withdrawn": [ids], "dates": [...]}.
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP,
+    status TEXT NOT NULL DEFAULT 'running',
+    complete BOOLEAN NOT NULL DEFAULT 0,
+    inserted INTEGER NOT NULL DEFAULT 0,
+    updated INTEGER NOT NULL DEFAULT 0,
+    unchanged INTEGER NOT NULL DEFAULT 0,
+    withdrawn INTEGER NOT NULL DEFAULT 0,
+    changes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_runs_source ON scrape_runs(source, id);
+
+-- The run that last inserted, changed, withdrew or restored the row. Runs that
+-- find a row unchanged leave it alone, so an unchanged listing writes nothing.
+ALTER TABLE events ADD COLUMN last_changed_run_id INTEGER REFERENCES scrape_runs(id) ON DELETE SET NULL;
+
+-- Set when a complete scrape of the row's source no longer lists it (the
+-- venue cancelled or removed the event); cleared if it is listed again.
+-- Withdrawn events are kept but no longer served.
+ALTER TABLE events ADD COLUMN withdrawn_at TIMESTAMP;
@@ -0,0 +1,29 @@
+-- Archive for events past their source's retention period (see retention.py).
+-- Rows keep their original ids; archived_at records when they were moved.
+CREATE TABLE IF NOT EXISTS events_archive (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT,
+    location TEXT,
+    description TEXT,
+    url TEXT,
+    needs_review BOOLEAN,
+    source TEXT,
+    source_id TEXT,
+    content_hash TEXT,
+    canonical_event_id INTEGER,
+    last_changed_run_id INTEGER,
+    withdrawn_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_events_archive_date ON events_archive(date);
+
+CREATE TABLE IF NOT EXISTS event_tags_archive (
+    event_id INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY (event_id, tag_id)
+) WITHOUT ROWID;
+
+-- Per-source date ranges: retention batches and scrape reconciliation
+CREATE INDEX IF NOT EXISTS idx_events_source_date ON events(source, date);
@@ -0,0 +1,10 @@
+-- Per-source circuit breaker state (see scrapers/fetch_policy.py).
+CREATE TABLE IF NOT EXISTS source_circuits (
+    source TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'closed',  -- 'closed', 'open' or 'half_open'
+    failures INTEGER NOT NULL DEFAULT 0,   -- consecutive failed runs
+    cool_down REAL,                        -- seconds the circuit last opened for
+    open_until TIMESTAMP,
+    last_error TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
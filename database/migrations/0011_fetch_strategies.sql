@@ -0,0 +1,13 @@
+-- Learned fetch path per host (see scrapers/fetch_strategy.py): whether a
+-- plain HTTP request returns the event listing or it needs the headless browser.
+CREATE TABLE IF NOT EXISTS fetch_strategies (
+    host TEXT PRIMARY KEY,
+    preferred TEXT NOT NULL,                           -- 'http' or 'browser'
+    http_ok INTEGER NOT NULL DEFAULT 0,                -- fetches that produced event nodes
+    http_failed INTEGER NOT NULL DEFAULT 0,            -- errors and pages without event nodes
+    browser_ok INTEGER NOT NULL DEFAULT 0,
+    browser_failed INTEGER NOT NULL DEFAULT 0,
+    fetches_since_probe INTEGER NOT NULL DEFAULT 0,
+    last_probe_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
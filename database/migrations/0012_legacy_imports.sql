@@ -0,0 +1,7 @@
+-- Databases merged in by `python init_db.py --import-legacy` (see migrations.import_legacy),
+-- so the app stops warning about database/events.db once it has been imported.
+CREATE TABLE IF NOT EXISTS legacy_imports (
+    path TEXT PRIMARY KEY,
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    counts TEXT  -- JSON rows imported per table
+);
@@ -0,0 +1,48 @@
+-- Per-month change counters for the month-response cache (see month_cache.py).
+
+-- Bumped by the triggers below whenever an event, its tags or a tag changes,
+-- whichever process or connection made the write. The cache keys its entries
+-- on these, so it never serves a month that changed underneath it. month is
+-- 'YYYY-MM', or '*' for changes that touch every month (tag edits).
+CREATE TABLE IF NOT EXISTS month_versions (
+    month TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS events_month_version_insert AFTER INSERT ON events BEGIN
+    INSERT INTO month_versions (month, version) VALUES (substr(NEW.date, 1, 7), 1)
+    ON CONFLICT(month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_month_version_update AFTER UPDATE ON events BEGIN
+    INSERT INTO month_versions (month, version)
+    SELECT substr(OLD.date, 1, 7), 1 UNION SELECT substr(NEW.date, 1, 7), 1 WHERE true
+    ON CONFLICT(month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_month_version_delete AFTER DELETE ON events BEGIN
+    INSERT INTO month_versions (month, version) VALUES (substr(OLD.date, 1, 7), 1)
+    ON CONFLICT(month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_tags_month_version_insert AFTER INSERT ON event_tags BEGIN
+    INSERT INTO month_versions (month, version)
+    SELECT substr(date, 1, 7), 1 FROM events WHERE id = NEW.event_id
+    ON CONFLICT(month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS event_tags_month_version_delete AFTER DELETE ON event_tags BEGIN
+    INSERT INTO month_versions (month, version)
+    SELECT substr(date, 1, 7), 1 FROM events WHERE id = OLD.event_id
+    ON CONFLICT(month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_month_version_update AFTER UPDATE ON tags BEGIN
+    INSERT INTO month_versions (month, version) VALUES ('*', 1)
+    ON CONFLICT(month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_month_version_delete AFTER DELETE ON tags BEGIN
+    INSERT INTO month_versions (month, version) VALUES ('*', 1)
+    ON CONFLICT(month) DO UPDATE SET version = version + 1;
+END;
@@ -0,0 +1,4 @@
+-- Scraped events are matched on (source, source_id) by the staging-table
+-- upsert, so nothing probes (source, title, date) any more, and per-source
+-- lookups use ux_events_source_source_id. The index only slowed writes.
+DROP INDEX IF EXISTS idx_events_source_title_date;
@@ -0,0 +1,120 @@
+"""Shared SQLite access for the app and its blueprints.
+
+Every request checks one connection out of a small pool for the configured
+DATABASE path and hands it back when the app context ends. Connections are
+opened once with WAL and tuned pragmas and keep their prepared statement
+cache between requests.
+"""
+import os
+import queue
+import sqlite3
+import threading
+
+from flask import current_app, g
+
+from migrations import DEFAULT_DB_PATH
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA mmap_size = 268435456",   # 256 MiB
+    "PRAGMA cache_size = -20000",     # ~20 MiB of page cache per connection
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Size of each connection's prepared statement cache
+CACHED_STATEMENTS = 256
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connection whose close() only ends the current unit of work.
+
+    Route handlers call conn.close() when they are done; for a pooled
+    connection that just rolls back anything left uncommitted. The pool
+    closes the underlying handle with dispose().
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def dispose(self):
+        super().close()
+
+
+def connect(db_path: str = DEFAULT_DB_PATH, factory=sqlite3.Connection) -> sqlite3.Connection:
+    """Open a connection with the standard pragmas and Row results."""
+    conn = sqlite3.connect(
+        db_path,
+        timeout=5.0,
+        cached_statements=CACHED_STATEMENTS,
+        check_same_thread=False,
+        factory=factory,
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of idle connections to one database file.
+
+    A connection is only ever used by the thread whose app context checked
+    it out, so sharing them across threads between requests is safe.
+    """
+
+    def __init__(self, db_path: str, max_idle: int = 8):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def acquire(self) -> PooledConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return connect(self.db_path, factory=PooledConnection)
+
+    def release(self, conn: PooledConnection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            conn.dispose()
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().dispose()
+            except queue.Empty:
+                return
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    db_path = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
+
+
+def get_db() -> PooledConnection:
+    """Return the current app context's connection, checking one out if needed."""
+    if 'db' not in g:
+        g.db = get_pool(current_app.config['DATABASE']).acquire()
+    return g.db
+
+
+def close_db(exc=None) -> None:
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool(current_app.config['DATABASE']).release(conn)
+
+
+def init_app(app) -> None:
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,113 @@
+import json
+from typing import Dict, List
+
+
+def month_window(year: int, month: int):
+    """Return the [start, end) date strings covering a calendar month."""
+    start_date = f"{year}-{month:02d}-01"
+    if month == 12:
+        end_date = f"{year + 1}-01-01"
+    else:
+        end_date = f"{year}-{month + 1:02d}-01"
+    return start_date, end_date
+
+
+def events_in_window_sql(include_pending: bool) -> str:
+    sql = "SELECT * FROM events WHERE date >= ? AND date < ? AND withdrawn_at IS NULL"
+    if not include_pending:
+        sql += " AND needs_review = 0"
+    return sql + " ORDER BY id"
+
+
+def tags_in_window_sql(include_pending: bool) -> str:
+    event_filter = "date >= ? AND date < ? AND withdrawn_at IS NULL"
+    if not include_pending:
+        event_filter += " AND needs_review = 0"
+    return f'''
+        SELECT et.event_id, t.*
+        FROM event_tags et
+        JOIN tags t ON t.id = et.tag_id
+        WHERE et.event_id IN (SELECT id FROM events WHERE {event_filter})
+        ORDER BY et.event_id, t.name
+    '''
+
+
+def fetch_events_in_window(conn, start_date: str, end_date: str, include_pending: bool = False) -> List[Dict]:
+    """Load every event in [start_date, end_date) together with its tags.
+
+    Uses a fixed two queries regardless of how many events fall in the window:
+    one for the events and one for all of their tags, which are grouped onto
+    the events in a single pass.
+    """
+    params = (start_date, end_date)
+
+    cursor = conn.cursor()
+    cursor.execute(events_in_window_sql(include_pending), params)
+
+    events = []
+    events_by_id = {}
+    for row in cursor.fetchall():
+        event = {
+            'id': row['id'],
+            'title': row['title'],
+            'date': row['date'],
+            'time': row['time'],
+            'location': row['location'],
+            'description': row['description'],
+            'url': row['url'],
+            'needs_review': bool(row['needs_review']),
+            'source': row['source'],
+            'source_id': row['source_id'],
+            # Set when this is another source's listing of an event already on the calendar
+            'canonical_event_id': row['canonical_event_id'],
+            'tags': []
+        }
+        events.append(event)
+        events_by_id[row['id']] = event
+
+    if not events:
+        return events
+
+    # Fetch the tags for the whole window at once instead of once per event
+    cursor.execute(tags_in_window_sql(include_pending), params)
+
+    tag_columns = [column[0] for column in cursor.description[1:]]
+    for row in cursor.fetchall():
+        event = events_by_id.get(row[0])
+        if event is not None:
+            event['tags'].append(dict(zip(tag_columns, row[1:])))
+
+    return events
+
+
+# Finished runs after a given one, stopping before any run still in progress
+# so a client that resumes from the last id it saw never skips a run
+# (runs older than an hour that never finished are ignored)
+CHANGES_SINCE_SQL = '''
+    SELECT id, source, finished_at, changes
+    FROM scrape_runs
+    WHERE id > ? AND finished_at IS NOT NULL AND changes IS NOT NULL
+    AND id < COALESCE((
+        SELECT MIN(id) FROM scrape_runs
+        WHERE id > ? AND finished_at IS NULL AND started_at > datetime('now', '-1 hour')
+    ), 9223372036854775807)
+    ORDER BY id
+    LIMIT ?
+'''
+
+
+def fetch_changes_since(conn, since_run_id: int, limit: int = 50) -> Dict:
+    """Change sets of the scrape runs after since_run_id, for clients and caches to sync from.
+
+    Returns {'changes': [{'run_id', 'source', 'finished_at', 'inserted',
+    'updated', 'withdrawn', 'dates'}, ...], 'last_run_id'}; pass last_run_id
+    back as since_run_id on the next call.
+    """
+    changes = []
+    last_run_id = since_run_id
+    for row in conn.execute(CHANGES_SINCE_SQL, (since_run_id, since_run_id, limit)).fetchall():
+        last_run_id = row[0]
+        change_set = json.loads(row[3])
+        if change_set['inserted'] or change_set['updated'] or change_set['withdrawn']:
+            changes.append({'run_id': row[0], 'source': row[1], 'finished_at': row[2], **change_set})
+    return {'changes': changes, 'last_run_id': last_run_id}
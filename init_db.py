@@ -1,12 +1,25 @@
-import sqlite3
+import argparse
+from migrations import DEFAULT_DB_PATH, LEGACY_DB_PATH, import_legacy, migrate, seed
 
-def init_db():
-    with open('database/schema.sql', 'r') as f:
-        schema = f.read()
+def init_db(db_path=DEFAULT_DB_PATH, with_seed=False, legacy_path=None):
+    version = migrate(db_path)
+    print(f"Database {db_path} is at schema version {version}")
     
-    conn = sqlite3.connect('database/events.db')
-    conn.executescript(schema)
-    conn.close()
+    if legacy_path:
+        counts = import_legacy(db_path, legacy_path)
+        print(f"Imported {legacy_path}: " + ", ".join(f"{n} {table}" for table, n in counts.items()))
+    
+    if with_seed:
+        if seed(db_path):
+            print("Sample data loaded")
+        else:
+            print("Database already has events; sample data not loaded")
 
 if __name__ == '__main__':
-    init_db()
+    parser = argparse.ArgumentParser(description='Create or upgrade the database schema.')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Path to the SQLite database')
+    parser.add_argument('--seed', action='store_true', help='Load sample events, tags and the test user into an empty database')
+    parser.add_argument('--import-legacy', nargs='?', const=LEGACY_DB_PATH, metavar='PATH',
+                        help=f'Copy users, tags, preferences and events from an old database (default {LEGACY_DB_PATH})')
+    args = parser.parse_args()
+    init_db(args.db, with_seed=args.seed, legacy_path=args.import_legacy)
@@ -0,0 +1,34 @@
+from flask import Blueprint, jsonify, url_for
+from jobs import get_job_queue
+
+job_bp = Blueprint('jobs', __name__)
+
+
+def job_accepted(job, created):
+    """202 response for a submitted job, pointing the client at its status URL."""
+    status_url = url_for('jobs.get_job', job_id=job['id'])
+    response = jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'deduplicated': not created,
+        'status_url': status_url
+    })
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
+
+@job_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get a job's status, and its result once it has finished."""
+    job = get_job_queue().get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@job_bp.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued job, or ask a running one to stop."""
+    job = get_job_queue().cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
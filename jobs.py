@@ -0,0 +1,287 @@
+"""Background jobs for work too slow to run inside a request, such as scrapes.
+
+Jobs are recorded in the jobs table and executed by a small thread pool.
+Because their state lives in SQLite, any worker process can answer a status
+poll. Submitting a job identical to one that is still queued or running
+returns the existing job instead of starting another.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import current_app
+
+from db import connect
+
+logger = logging.getLogger(__name__)
+
+# handler(params, is_cancelled) -> JSON-serializable result
+JobHandler = Callable[[Dict[str, Any], Callable[[], bool]], Any]
+
+
+class JobCancelled(Exception):
+    """Raised by a handler that stopped early because its job was cancelled."""
+
+    def __init__(self, result: Any = None):
+        super().__init__('Job cancelled')
+        self.result = result
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid or os.name != 'posix':
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Persistent job records plus an in-process worker pool.
+
+    Handlers are registered per job kind and receive the job's params and an
+    is_cancelled() callable they should check between units of work.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 2, retention_days: int = 7):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.retention_days = retention_days
+        self._handlers: Dict[str, JobHandler] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Dict, bool]:
+        """Queue a job and return (job, created).
+
+        If an identical job is already queued or running, that job is
+        returned with created=False and nothing new is queued.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        params_json = json.dumps(params or {}, sort_keys=True)
+        dedup_key = f"{kind}:{hashlib.sha1(params_json.encode('utf-8')).hexdigest()}"
+
+        conn = connect(self.db_path)
+        try:
+            # Retry if the duplicate we collided with finishes before we can read it
+            for _ in range(3):
+                job_id = uuid.uuid4().hex
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT INTO jobs (id, kind, params, dedup_key) VALUES (?, ?, ?, ?)",
+                            (job_id, kind, params_json, dedup_key)
+                        )
+                except sqlite3.IntegrityError:
+                    existing = conn.execute(
+                        "SELECT * FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running')",
+                        (dedup_key,)
+                    ).fetchone()
+                    if existing is not None:
+                        return self._to_dict(existing), False
+                    continue
+                self._dispatch(job_id)
+                return self.get(job_id), True
+            raise RuntimeError(f"Could not queue {kind} job")
+        finally:
+            conn.close()
+
+    def active(self, kind: str) -> List[Dict]:
+        """Queued and running jobs of one kind, oldest first."""
+        conn = connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND status IN ('queued', 'running') ORDER BY created_at",
+                (kind,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [self._to_dict(row) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        conn = connect(self.db_path)
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._to_dict(row) if row else None
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job outright, or ask a running one to stop."""
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = CURRENT_TIMESTAMP
+                    WHERE id = ? AND status = 'queued'
+                """, (job_id,))
+                conn.execute(
+                    "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,)
+                )
+        finally:
+            conn.close()
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+        if event is not None:
+            event.set()
+        return self.get(job_id)
+
+    def recover(self) -> None:
+        """Fail jobs orphaned by a dead process, requeue waiting ones and prune old records."""
+        conn = connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT id, status, worker_pid FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            orphaned = [row['id'] for row in rows if row['status'] == 'running' and not _pid_alive(row['worker_pid'])]
+            with conn:
+                conn.executemany("""
+                    UPDATE jobs SET status = 'failed', error = 'Interrupted before finishing',
+                        finished_at = CURRENT_TIMESTAMP
+                    WHERE id = ? AND status = 'running'
+                """, [(job_id,) for job_id in orphaned])
+                if self.retention_days:
+                    conn.execute("""
+                        DELETE FROM jobs
+                        WHERE status IN ('succeeded', 'failed', 'cancelled')
+                        AND finished_at < datetime('now', ?)
+                    """, (f'-{self.retention_days} days',))
+        finally:
+            conn.close()
+
+        if orphaned:
+            logger.warning(f"Marked {len(orphaned)} interrupted jobs as failed")
+        for row in rows:
+            if row['status'] == 'queued':
+                self._dispatch(row['id'])
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Ask running jobs to stop and drop anything not yet started."""
+        with self._lock:
+            for event in self._cancel_events.values():
+                event.set()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _dispatch(self, job_id: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+            self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        cancel_event = threading.Event()
+        with self._lock:
+            self._cancel_events[job_id] = cancel_event
+        try:
+            conn = connect(self.db_path)
+            try:
+                # Claim the job; it may have been cancelled or picked up by another process
+                with conn:
+                    claimed = conn.execute("""
+                        UPDATE jobs SET status = 'running', started_at = CURRENT_TIMESTAMP, worker_pid = ?
+                        WHERE id = ? AND status = 'queued'
+                    """, (os.getpid(), job_id)).rowcount
+                job = conn.execute("SELECT kind, params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            finally:
+                conn.close()
+            if not claimed:
+                return
+
+            status, result, error = 'succeeded', None, None
+            try:
+                handler = self._handlers.get(job['kind'])
+                if handler is None:
+                    raise ValueError(f"Unknown job kind: {job['kind']}")
+                result = handler(json.loads(job['params']), self._cancel_checker(job_id, cancel_event))
+            except JobCancelled as e:
+                status, result = 'cancelled', e.result
+            except Exception as e:
+                status, error = 'failed', str(e)
+                logger.error(f"Job {job_id} ({job['kind']}) failed: {str(e)}")
+
+            self._finish(job_id, status, result, error)
+            logger.info(f"Job {job_id} ({job['kind']}) {status}")
+        except Exception:
+            logger.exception(f"Error running job {job_id}")
+        finally:
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+
+    def _cancel_checker(self, job_id: str, event: threading.Event, interval: float = 1.0) -> Callable[[], bool]:
+        """is_cancelled() for a running job; also picks up cancels made by other processes."""
+        last_checked = time.monotonic()
+
+        def is_cancelled() -> bool:
+            nonlocal last_checked
+            if event.is_set():
+                return True
+            now = time.monotonic()
+            if now - last_checked >= interval:
+                last_checked = now
+                conn = connect(self.db_path)
+                try:
+                    row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                finally:
+                    conn.close()
+                if row and row[0]:
+                    event.set()
+            return event.is_set()
+
+        return is_cancelled
+
+    def _finish(self, job_id: str, status: str, result: Any, error: Optional[str]) -> None:
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (status, json.dumps(result) if result is not None else None, error, job_id))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row) -> Dict:
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'params': json.loads(row['params']),
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'cancel_requested': bool(row['cancel_requested']),
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at']
+        }
+
+
+def init_app(app, handlers: Dict[str, JobHandler]) -> JobQueue:
+    """Create the app's job queue, register handlers and pick up leftover jobs."""
+    queue = JobQueue(app.config['DATABASE'], max_workers=app.config['JOB_WORKERS'])
+    for kind, handler in handlers.items():
+        queue.register(kind, handler)
+    app.extensions['job_queue'] = queue
+    queue.recover()
+    return queue
+
+
+def get_job_queue() -> JobQueue:
+    return current_app.extensions['job_queue']
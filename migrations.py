@@ -0,0 +1,232 @@
+"""Versioned schema migrations keyed on SQLite's PRAGMA user_version.
+
+Migrations live in database/migrations as NNNN_description.sql and are applied
+in order, each in its own transaction together with the user_version bump.
+
+Usage: python migrations.py [--db PATH] [--seed] [--import-legacy]
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+from typing import Dict, List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, 'database', 'database.db')
+MIGRATIONS_DIR = os.path.join(BASE_DIR, 'database', 'migrations')
+SEED_PATH = os.path.join(BASE_DIR, 'database', 'seed.sql')
+# Where the tag, user and preference routes kept their data before every
+# blueprint moved to DEFAULT_DB_PATH; import it with import_legacy
+LEGACY_DB_PATH = os.path.join(BASE_DIR, 'database', 'events.db')
+
+_MIGRATION_FILE = re.compile(r'^(\d+)_\w+\.sql$')
+
+
+def list_migrations() -> List[Tuple[int, str]]:
+    """Return (version, path) for every migration file, sorted by version."""
+    migrations = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), os.path.join(MIGRATIONS_DIR, filename)))
+    migrations.sort()
+    return migrations
+
+
+MIGRATIONS = list_migrations()
+LATEST_VERSION = MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def get_version(conn) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(db_path: str = DEFAULT_DB_PATH) -> int:
+    """Apply any pending migrations to the database and return its version.
+
+    When the database is already current this is a single PRAGMA read.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        version = get_version(conn)
+        if version >= LATEST_VERSION:
+            return version
+
+        for migration_version, path in MIGRATIONS:
+            if migration_version <= version:
+                continue
+            with open(path, 'r') as f:
+                sql = f.read()
+            try:
+                conn.executescript(
+                    f"BEGIN;\n{sql}\nPRAGMA user_version = {migration_version};\nCOMMIT;"
+                )
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+            version = migration_version
+            print(f"Applied migration {os.path.basename(path)}")
+
+        return version
+    finally:
+        conn.close()
+
+
+def seed(db_path: str = DEFAULT_DB_PATH) -> bool:
+    """Load the sample data into an empty, fully migrated database.
+
+    Returns False without touching anything if the database already has events.
+    """
+    migrate(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        if conn.execute('SELECT EXISTS (SELECT 1 FROM events)').fetchone()[0]:
+            return False
+        with open(SEED_PATH, 'r') as f:
+            conn.executescript(f"BEGIN;\n{f.read()}\nCOMMIT;")
+        return True
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def legacy_import_pending(db_path: str = DEFAULT_DB_PATH, legacy_path: str = LEGACY_DB_PATH) -> bool:
+    """Whether legacy_path exists and has not been imported into the migrated database yet."""
+    legacy_path = os.path.abspath(legacy_path)
+    if not os.path.exists(legacy_path) or legacy_path == os.path.abspath(db_path):
+        return False
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('SELECT 1 FROM legacy_imports WHERE path = ?', (legacy_path,)).fetchone() is None
+    finally:
+        conn.close()
+
+
+def import_legacy(db_path: str = DEFAULT_DB_PATH, legacy_path: str = LEGACY_DB_PATH) -> Dict[str, int]:
+    """Copy the rows of a database in the old schema.sql layout into db_path, in one transaction.
+
+    Tag categories and tags are matched by name and users by email. Events are matched
+    by (source, source_id) when they have one, else by title, date, time,
+    location and source. Rows that already exist are kept as they are, so
+    running it again adds nothing. Returns the number of rows added per table.
+    """
+    legacy_path = os.path.abspath(legacy_path)
+    if not os.path.exists(legacy_path):
+        raise FileNotFoundError(legacy_path)
+    migrate(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('ATTACH DATABASE ? AS legacy', (legacy_path,))
+        counts = {}
+        with conn:
+            counts['tag_categories'] = conn.execute('''
+                INSERT OR IGNORE INTO main.tag_categories (name, description, created_at)
+                SELECT name, description, created_at FROM legacy.tag_categories
+            ''').rowcount
+            counts['tags'] = conn.execute('''
+                INSERT OR IGNORE INTO main.tags (name, color, category_id, created_at)
+                SELECT t.name, t.color, c.id, t.created_at
+                FROM legacy.tags t
+                LEFT JOIN legacy.tag_categories lc ON lc.id = t.category_id
+                LEFT JOIN main.tag_categories c ON c.name = lc.name
+            ''').rowcount
+            counts['users'] = conn.execute('''
+                INSERT OR IGNORE INTO main.users (email, username, password_hash, created_at)
+                SELECT email, username, password_hash, created_at FROM legacy.users
+            ''').rowcount
+
+            # Old event id -> id in db_path, for the event_tags rows
+            conn.execute('CREATE TEMP TABLE legacy_event_ids (legacy_id INTEGER PRIMARY KEY, id INTEGER NOT NULL)')
+            counts['events'] = 0
+            for row in conn.execute('''
+                SELECT id, title, date, time, location, description, url, needs_review, source, source_id
+                FROM legacy.events
+            ''').fetchall():
+                legacy_id, title, date, time, location, description, url, needs_review, source, source_id = row
+                if source_id is not None:
+                    match = conn.execute('SELECT id FROM main.events WHERE source = ? AND source_id = ?',
+                                         (source, source_id)).fetchone()
+                else:
+                    match = conn.execute('''
+                        SELECT id FROM main.events
+                        WHERE title = ? AND date = ? AND time IS ? AND location IS ? AND source IS ?
+                    ''', (title, date, time, location, source)).fetchone()
+                if match:
+                    event_id = match[0]
+                else:
+                    event_id = conn.execute('''
+                        INSERT INTO main.events
+                            (title, date, time, location, description, url, needs_review, source, source_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', row[1:]).lastrowid
+                    counts['events'] += 1
+                conn.execute('INSERT INTO temp.legacy_event_ids VALUES (?, ?)', (legacy_id, event_id))
+
+            counts['event_tags'] = conn.execute('''
+                INSERT OR IGNORE INTO main.event_tags (event_id, tag_id)
+                SELECT m.id, t.id
+                FROM legacy.event_tags et
+                JOIN temp.legacy_event_ids m ON m.legacy_id = et.event_id
+                JOIN legacy.tags lt ON lt.id = et.tag_id
+                JOIN main.tags t ON t.name = lt.name
+            ''').rowcount
+            counts['user_tag_preferences'] = conn.execute('''
+                INSERT OR IGNORE INTO main.user_tag_preferences (user_id, tag_id, preference, created_at)
+                SELECT u.id, t.id, p.preference, p.created_at
+                FROM legacy.user_tag_preferences p
+                JOIN legacy.users lu ON lu.id = p.user_id
+                JOIN main.users u ON u.email = lu.email
+                JOIN legacy.tags lt ON lt.id = p.tag_id
+                JOIN main.tags t ON t.name = lt.name
+            ''').rowcount
+            counts['tag_relationships'] = conn.execute('''
+                INSERT OR IGNORE INTO main.tag_relationships (tag1_id, tag2_id, relationship_type)
+                SELECT t1.id, t2.id, r.relationship_type
+                FROM legacy.tag_relationships r
+                JOIN legacy.tags lt1 ON lt1.id = r.tag1_id
+                JOIN main.tags t1 ON t1.name = lt1.name
+                JOIN legacy.tags lt2 ON lt2.id = r.tag2_id
+                JOIN main.tags t2 ON t2.name = lt2.name
+            ''').rowcount
+            counts['tag_constraints'] = conn.execute('''
+                INSERT INTO main.tag_constraints (category_id, min_tags, max_tags, required)
+                SELECT c.id, tc.min_tags, tc.max_tags, tc.required
+                FROM legacy.tag_constraints tc
+                JOIN legacy.tag_categories lc ON lc.id = tc.category_id
+                JOIN main.tag_categories c ON c.name = lc.name
+                WHERE NOT EXISTS (SELECT 1 FROM main.tag_constraints x WHERE x.category_id = c.id)
+            ''').rowcount
+
+            conn.execute('''
+                INSERT INTO legacy_imports (path, counts) VALUES (?, ?)
+                ON CONFLICT(path) DO UPDATE SET imported_at = CURRENT_TIMESTAMP, counts = excluded.counts
+            ''', (legacy_path, json.dumps(counts)))
+        conn.execute('DROP TABLE temp.legacy_event_ids')
+        return counts
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply pending database migrations.')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Path to the SQLite database')
+    parser.add_argument('--seed', action='store_true', help='Load sample data into an empty database')
+    parser.add_argument('--import-legacy', nargs='?', const=LEGACY_DB_PATH, metavar='PATH',
+                        help=f'Import the rows of an old database (default {LEGACY_DB_PATH})')
+    args = parser.parse_args()
+
+    print(f"Database {args.db} is at version {migrate(args.db)}")
+    if args.seed:
+        if seed(args.db):
+            print("Sample data loaded")
+        else:
+            print("Database already has events; sample data not loaded")
+    if args.import_legacy:
+        counts = import_legacy(args.db, args.import_legacy)
+        print(f"Imported {args.import_legacy}: " + ", ".join(f"{n} {table}" for table, n in counts.items()))
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import Iterable, Optional, Tuple
+
+
+class MonthCache:
+    """Bounded LRU cache of serialized /api/events/<year>/<month> responses.
+
+    Entries are keyed by (year, month, is_admin) and stamped with the month's
+    database version (month_stamp), so writes made by other processes or
+    connections, which never reach this cache, still retire their months'
+    entries. Each month also carries a local version counter that is bumped
+    on invalidation, so a response built while a write was in flight is
+    never stored under the new version.
+    """
+
+    def __init__(self, max_entries: int = 240, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._generation = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        """Strong validator derived from the response body."""
+        return hashlib.sha1(body).hexdigest()
+
+    def version(self, year: int, month: int) -> Tuple[int, int]:
+        with self._lock:
+            return self._generation, self._versions.get((year, month), 0)
+
+    def get(self, year: int, month: int, is_admin: bool, stamp: int) -> Optional[Tuple[str, bytes]]:
+        """Return (etag, body) for a month cached at `stamp`, or None on a miss."""
+        key = (year, month, is_admin)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, year: int, month: int, is_admin: bool, body: bytes, version: Tuple[int, int],
+            stamp: int) -> str:
+        """Store a response built at `version` and database `stamp` and return its ETag.
+
+        The entry is dropped if the month was invalidated after `version` was read.
+        """
+        etag = self.make_etag(body)
+        if len(body) > self.max_bytes:
+            return etag
+
+        key = (year, month, is_admin)
+        with self._lock:
+            if (self._generation, self._versions.get((year, month), 0)) != version:
+                return etag
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[2])
+            self._entries[key] = (stamp, etag, body)
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[2])
+        return etag
+
+    def invalidate_month(self, year: int, month: int) -> None:
+        with self._lock:
+            self._versions[(year, month)] = self._versions.get((year, month), 0) + 1
+            for is_admin in (False, True):
+                entry = self._entries.pop((year, month, is_admin), None)
+                if entry is not None:
+                    self._size -= len(entry[2])
+
+    def invalidate_dates(self, dates: Iterable[Optional[str]]) -> None:
+        """Invalidate the months containing the given YYYY-MM-DD dates."""
+        months = set()
+        for date in dates:
+            try:
+                months.add((int(date[0:4]), int(date[5:7])))
+            except (TypeError, ValueError):
+                # Unparseable dates can't be attributed to a month
+                self.clear()
+                return
+        for year, month in months:
+            self.invalidate_month(year, month)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._size = 0
+
+
+month_cache = MonthCache()
+
+# Only grows, so it changes whenever the month or every month (tag edits) is written
+MONTH_STAMP_SQL = "SELECT COALESCE(SUM(version), 0) FROM month_versions WHERE month IN (?, '*')"
+
+
+def month_stamp(cursor, year: int, month: int) -> int:
+    """The month's database version, maintained by triggers on events, event_tags and tags."""
+    return cursor.execute(MONTH_STAMP_SQL, (f"{year}-{month:02d}",)).fetchone()[0]
+
+
+def invalidate_event_month(cursor, event_id: int) -> None:
+    """Invalidate the cached month containing the given event."""
+    cursor.execute('SELECT date FROM events WHERE id = ?', (event_id,))
+    row = cursor.fetchone()
+    if row:
+        month_cache.invalidate_dates([row[0]])
@@ -1,19 +1,41 @@
 from flask import Blueprint, request, jsonify
-import sqlite3
 from datetime import datetime
 from functools import wraps
 import jwt
 import os
+from db import get_db
 
 preference_bp = Blueprint('preferences', __name__)
 
 # Use the same secret key as user_routes.py
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key')
 
-def get_db():
-    conn = sqlite3.connect('database/events.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+RECOMMENDED_EVENTS_SQL = '''
+    WITH user_likes AS (
+        SELECT tag_id, preference
+        FROM user_tag_preferences
+        WHERE user_id = ? AND preference >= 0
+    )
+    SELECT DISTINCT e.*, 
+           COUNT(CASE WHEN p.preference = 1 THEN 1 END) as matching_tags
+    FROM events e
+    JOIN event_tags et ON e.id = et.event_id
+    JOIN user_likes p ON et.tag_id = p.tag_id
+    WHERE e.needs_review = 0 AND e.withdrawn_at IS NULL
+    GROUP BY e.id
+    ORDER BY matching_tags DESC, e.date ASC
+    LIMIT 10
+'''
+
+EVENTS_BY_TAG_SQL = '''
+    SELECT e.*
+    FROM events e
+    JOIN event_tags et ON e.id = et.event_id
+    WHERE et.tag_id = ? AND e.needs_review = 0 AND e.withdrawn_at IS NULL
+    AND e.date >= date('now')
+    ORDER BY e.date ASC
+    LIMIT ?
+'''
 
 def token_required(f):
     @wraps(f)
@@ -108,22 +130,7 @@ def get_recommended_events(user_id):
     
     try:
         # Get events that match user's preferred tags
-        cursor.execute('''
-            WITH user_likes AS (
-                SELECT tag_id, preference
-                FROM user_tag_preferences
-                WHERE user_id = ? AND preference >= 0
-            )
-            SELECT DISTINCT e.*, 
-                   COUNT(CASE WHEN p.preference = 1 THEN 1 END) as matching_tags
-            FROM events e
-            JOIN event_tags et ON e.id = et.event_id
-            JOIN user_likes p ON et.tag_id = p.tag_id
-            WHERE e.needs_review = 0
-            GROUP BY e.id
-            ORDER BY matching_tags DESC, e.date ASC
-            LIMIT 10
-        ''', (user_id,))
+        cursor.execute(RECOMMENDED_EVENTS_SQL, (user_id,))
         
         events = []
         for row in cursor.fetchall():
@@ -162,15 +169,7 @@ def get_events_by_tag(user_id):
     
     try:
         # Get events with this tag, ordered by date
-        cursor.execute('''
-            SELECT e.*
-            FROM events e
-            JOIN event_tags et ON e.id = et.event_id
-            WHERE et.tag_id = ? AND e.needs_review = 0
-            AND e.date >= date('now')
-            ORDER BY e.date ASC
-            LIMIT ?
-        ''', (tag_id, limit))
+        cursor.execute(EVENTS_BY_TAG_SQL, (tag_id, limit))
         
         events = [dict(row) for row in cursor.fetchall()]
         conn.close()
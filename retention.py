@@ -0,0 +1,203 @@
+"""Retention for past events: moves them, with their tags, into the archive tables.
+
+Each source keeps its events for its scraper's retention_days after the
+event date; manual events and sources without a scraper use the default.
+Expired events are moved to events_archive and event_tags_archive in small
+batches. Each batch is its own short transaction, and the job sleeps
+between batches so scrapes and admin edits never wait long for the write
+lock. The batch size adapts to keep each transaction under
+max_batch_seconds. Finished scrape_runs records past their retention are
+pruned the same way.
+
+Runs daily from the scrape scheduler as an archive_old_events job, or on demand:
+
+Usage: python retention.py [--db PATH] [--days N]
+"""
+import argparse
+import logging
+import os
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from db import connect
+from scrapers.base_scraper import BaseScraper
+from scrapers.scraper_manager import ScraperManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 30
+
+# Columns copied into events_archive, in both tables' order
+ARCHIVED_COLUMNS = (
+    'id, title, date, time, location, description, url, needs_review, source, source_id, '
+    'content_hash, canonical_event_id, last_changed_run_id, withdrawn_at'
+)
+
+# Finished runs only; a running one may still be recording its change set
+EXPIRED_RUNS_SQL = """
+    SELECT id FROM scrape_runs
+    WHERE id < (SELECT COALESCE(MIN(id), 9223372036854775807) FROM scrape_runs WHERE finished_at IS NULL)
+    AND started_at < datetime('now', ?)
+    ORDER BY id
+    LIMIT ?
+"""
+
+
+def expired_events_sql(where: str) -> str:
+    return f"SELECT id, date, source FROM events WHERE {where} LIMIT ?"
+
+
+def source_policies(scraper_classes: Optional[Sequence[Type[BaseScraper]]] = None) -> Dict[str, int]:
+    """Retention in days per scraped source, from each scraper's retention_days."""
+    return {
+        source: scraper_class.retention_days
+        for source, scraper_class in ScraperManager.scrapers_by_source(scraper_classes).items()
+    }
+
+
+class EventRetention:
+    """Moves events past their source's retention period into the archive, a batch at a time.
+
+    policies maps a source to the days its events are kept after their date
+    (default: source_policies()); every other source keeps them default_days.
+    """
+
+    def __init__(self, db_path: str, policies: Optional[Dict[str, int]] = None,
+                 default_days: int = DEFAULT_RETENTION_DAYS, run_retention_days: int = 30,
+                 batch_size: int = 500, max_batch_size: int = 5000, max_batch_seconds: float = 0.2,
+                 pause: float = 0.05, on_dates_changed: Optional[Callable[[Iterable[str]], None]] = None):
+        self.db_path = db_path
+        self.policies = source_policies() if policies is None else dict(policies)
+        self.default_days = default_days
+        self.run_retention_days = run_retention_days
+        self.batch_size = batch_size
+        self.max_batch_size = max_batch_size
+        self.max_batch_seconds = max_batch_seconds
+        self.pause = pause
+        self.on_dates_changed = on_dates_changed
+
+    def run(self, is_cancelled: Optional[Callable[[], bool]] = None) -> Dict:
+        """Archive every expired event and prune old scrape runs.
+
+        is_cancelled is checked between batches. Returns the rows moved per
+        table and per source, the number of batches, whether the run was
+        cancelled and its duration in seconds.
+        """
+        started = time.monotonic()
+        stats = {
+            'events_moved': 0, 'event_tags_moved': 0, 'scrape_runs_pruned': 0,
+            'batches': 0, 'by_source': {}, 'cancelled': False, 'duration': 0.0
+        }
+        conn = connect(self.db_path)
+        try:
+            for where, params in self._expired_event_filters(conn):
+                sql = expired_events_sql(where)
+                self._run_batches(
+                    conn, lambda limit: conn.execute(sql, (*params, limit)).fetchall(),
+                    lambda rows: self._archive_events(conn, rows, stats), is_cancelled, stats
+                )
+            if self.run_retention_days:
+                age = f'-{self.run_retention_days} days'
+                self._run_batches(
+                    conn, lambda limit: conn.execute(EXPIRED_RUNS_SQL, (age, limit)).fetchall(),
+                    lambda rows: self._prune_runs(conn, rows, stats), is_cancelled, stats
+                )
+        finally:
+            conn.close()
+
+        stats['duration'] = round(time.monotonic() - started, 3)
+        logger.info(
+            "Archived %d events and %d event tags, pruned %d scrape runs in %d batches (%.1fs)",
+            stats['events_moved'], stats['event_tags_moved'], stats['scrape_runs_pruned'],
+            stats['batches'], stats['duration'], extra={'retention_summary': stats}
+        )
+        return stats
+
+    def _expired_event_filters(self, conn) -> Iterator[Tuple[str, tuple]]:
+        """(WHERE clause, params) selecting each source's expired events.
+
+        One source at a time, so every batch is a range on idx_events_source_date
+        that starts at the oldest remaining event.
+        """
+        today = date.today()
+        for (source,) in conn.execute("SELECT DISTINCT source FROM events").fetchall():
+            cutoff = (today - timedelta(days=self.policies.get(source, self.default_days))).isoformat()
+            if source is None:
+                yield 'source IS NULL AND date < ?', (cutoff,)
+            else:
+                yield 'source = ? AND date < ?', (source, cutoff)
+
+    def _run_batches(self, conn, select: Callable[[int], List], apply: Callable[[List], None],
+                     is_cancelled: Optional[Callable[[], bool]], stats: Dict) -> None:
+        """apply() each select(batch_size) result in its own transaction, until one comes back empty.
+
+        The batch size halves when a transaction ran over max_batch_seconds
+        and grows when it finished well within it.
+        """
+        while not stats['cancelled']:
+            if is_cancelled is not None and is_cancelled():
+                stats['cancelled'] = True
+                return
+            batch_started = time.monotonic()
+            with conn:
+                rows = select(self.batch_size)
+                if not rows:
+                    return
+                apply(rows)
+            elapsed = time.monotonic() - batch_started
+            stats['batches'] += 1
+            if elapsed > self.max_batch_seconds:
+                self.batch_size = max(1, self.batch_size // 2)
+            elif elapsed < self.max_batch_seconds / 4:
+                self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+            # Let waiting writers in between batches
+            time.sleep(self.pause)
+
+    def _archive_events(self, conn, rows: List, stats: Dict) -> None:
+        """Copy the events and their tags to the archive and delete them, with their dedup entries."""
+        ids = [(row['id'],) for row in rows]
+        cursor = conn.cursor()
+        cursor.executemany(f"""
+            INSERT OR REPLACE INTO events_archive ({ARCHIVED_COLUMNS})
+            SELECT {ARCHIVED_COLUMNS} FROM events WHERE id = ?
+        """, ids)
+        cursor.executemany("""
+            INSERT OR IGNORE INTO event_tags_archive (event_id, tag_id)
+            SELECT event_id, tag_id FROM event_tags WHERE event_id = ?
+        """, ids)
+        cursor.executemany("DELETE FROM event_tags WHERE event_id = ?", ids)
+        stats['event_tags_moved'] += cursor.rowcount
+        cursor.executemany("DELETE FROM event_dedup_bands WHERE event_id = ?", ids)
+        # Later listings linked to an archived event become canonical themselves
+        cursor.executemany("UPDATE events SET canonical_event_id = NULL WHERE canonical_event_id = ?", ids)
+        cursor.executemany("DELETE FROM events WHERE id = ?", ids)
+
+        stats['events_moved'] += len(rows)
+        for row in rows:
+            source = row['source'] or 'unknown'
+            stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
+        if self.on_dates_changed:
+            self.on_dates_changed({row['date'] for row in rows})
+
+    def _prune_runs(self, conn, rows: List, stats: Dict) -> None:
+        conn.executemany("DELETE FROM scrape_runs WHERE id = ?", [(row['id'],) for row in rows])
+        stats['scrape_runs_pruned'] += len(rows)
+
+
+def main():
+    from migrations import DEFAULT_DB_PATH, migrate
+
+    parser = argparse.ArgumentParser(description='Archive events past their retention period.')
+    parser.add_argument('--db', default=os.environ.get('DATABASE_PATH', DEFAULT_DB_PATH))
+    parser.add_argument('--days', type=int, default=DEFAULT_RETENTION_DAYS,
+                        help='Retention for sources without their own policy')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    migrate(args.db)
+    EventRetention(args.db, default_days=args.days).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""Periodic scrape scheduler.
+
+Every registered scraper is polled on its own interval, with jitter, by
+submitting a scrape_sources job for that one source. A source is not
+scheduled again until its previous job has finished, so its runs never
+overlap. After each run the interval adapts to the source: it shrinks when
+the run found new or changed events and grows when nothing changed, within
+the scraper's min/max bounds. Intervals and run history are kept in the
+scrape_schedule table, so they survive restarts.
+
+Runs inside the app when SCRAPE_SCHEDULER is set, or as its own process:
+
+Usage: python scheduler.py [--db PATH]
+"""
+import argparse
+import logging
+import os
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Sequence, Tuple, Type
+
+import schedule
+
+from db import connect
+from jobs import JobQueue
+from scrapers.base_scraper import BaseScraper
+from scrapers.scraper_manager import ScraperManager
+
+logger = logging.getLogger(__name__)
+
+# Same format and timezone (UTC) as SQLite's CURRENT_TIMESTAMP
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Holds the covered-sources check and the submit that follows it together
+_submit_lock = threading.Lock()
+
+
+def submit_scrape(job_queue: JobQueue, sources: Optional[Sequence[str]] = None) -> Tuple[Dict, bool]:
+    """Queue a scrape_sources job for `sources` (every source when None) that no other scrape covers.
+
+    A source is covered by a queued or running scrape_sources job that lists
+    it or runs every source, and is left out of the new job. Returns (job,
+    created) like JobQueue.submit; if every source is covered, that is the
+    job covering the first one, with created=False.
+    """
+    all_sources = list(ScraperManager.scrapers_by_source())
+    wanted = list(sources) if sources else all_sources
+    with _submit_lock:
+        covering: Dict[str, Dict] = {}
+        for job in job_queue.active('scrape_sources'):
+            for source in job['params'].get('sources') or all_sources:
+                covering.setdefault(source, job)
+        remaining = [source for source in wanted if source not in covering]
+        if not remaining:
+            return covering[wanted[0]], False
+        return job_queue.submit('scrape_sources', {} if remaining == all_sources else {'sources': remaining})
+
+
+class ScrapeScheduler:
+    """Runs each source's scrape through the job queue on an adaptive interval."""
+
+    def __init__(self, job_queue: JobQueue, scraper_classes: Optional[Sequence[Type[BaseScraper]]] = None,
+                 jitter: float = 0.1, speedup: float = 0.5, backoff: float = 1.5,
+                 startup_stagger: float = 60.0, poll_interval: float = 5.0,
+                 retention_interval: Optional[float] = 24 * 60 * 60):
+        self.job_queue = job_queue
+        self.db_path = job_queue.db_path
+        self.sources = ScraperManager.scrapers_by_source(scraper_classes)
+        self.jitter = jitter
+        self.speedup = speedup
+        self.backoff = backoff
+        self.startup_stagger = startup_stagger
+        self.poll_interval = poll_interval
+        # How often old events are archived; None to leave it to `python retention.py`
+        self.retention_interval = retention_interval
+        self.scheduler = schedule.Scheduler()
+        # source -> id of its queued or running job
+        self._in_flight: Dict[str, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Schedule every source from its saved state and start watching for finished runs."""
+        conn = connect(self.db_path)
+        try:
+            saved = {row['source']: row for row in conn.execute('SELECT * FROM scrape_schedule')}
+            with conn:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO scrape_schedule (source, interval_seconds) VALUES (?, ?)',
+                    [(source, scraper_class.scrape_interval) for source, scraper_class in self.sources.items()]
+                )
+        finally:
+            conn.close()
+
+        now = _utcnow()
+        for source in self.sources:
+            # Spread out sources that are due so they don't all start at once
+            delay = random.uniform(0, self.startup_stagger)
+            next_run_at = saved[source]['next_run_at'] if source in saved else None
+            if next_run_at:
+                due_in = (datetime.strptime(next_run_at, TIMESTAMP_FORMAT) - now).total_seconds()
+                delay = max(delay, due_in)
+            self._schedule(source, delay)
+
+        self.scheduler.every(self.poll_interval).seconds.do(self._collect_finished)
+        if self.retention_interval:
+            self.scheduler.every(self.retention_interval).seconds.do(self._run_retention)
+        logger.info(f"Scrape scheduler started for {len(self.sources)} sources")
+
+    def run_forever(self) -> None:
+        self.start()
+        while not self._stop.is_set():
+            self.scheduler.run_pending()
+            self._stop.wait(1)
+
+    def start_in_background(self) -> None:
+        self._thread = threading.Thread(target=self.run_forever, name='scrape-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _schedule(self, source: str, delay: float) -> None:
+        """Run `source` once, `delay` seconds from now."""
+        delay = max(delay, 1.0)
+        self.scheduler.every(delay).seconds.do(self._run_source, source).tag(source)
+        next_run_at = (_utcnow() + timedelta(seconds=delay)).strftime(TIMESTAMP_FORMAT)
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute('UPDATE scrape_schedule SET next_run_at = ? WHERE source = ?', (next_run_at, source))
+        finally:
+            conn.close()
+
+    def _run_source(self, source: str):
+        try:
+            # A queued or running scrape that covers this source, manual or
+            # scheduled, is adopted rather than repeated
+            job, _ = submit_scrape(self.job_queue, [source])
+            self._in_flight[source] = job['id']
+        except Exception as e:
+            logger.error(f"Error queueing scheduled scrape of {source}: {str(e)}")
+            self._schedule(source, self.sources[source].scrape_interval)
+        return schedule.CancelJob
+
+    def _run_retention(self) -> None:
+        try:
+            self.job_queue.submit('archive_old_events')
+        except Exception as e:
+            logger.error(f"Error queueing event retention: {str(e)}")
+
+    def _collect_finished(self) -> None:
+        for source, job_id in list(self._in_flight.items()):
+            job = self.job_queue.get(job_id)
+            if job is not None and job['status'] in ('queued', 'running'):
+                continue
+            del self._in_flight[source]
+            try:
+                delay = self._record_run(source, job)
+            except Exception as e:
+                logger.error(f"Error recording scheduled scrape of {source}: {str(e)}")
+                delay = self.sources[source].scrape_interval
+            self._schedule(source, delay)
+
+    def _record_run(self, source: str, job: Optional[Dict]) -> float:
+        """Save the finished run, adapt the source's interval and return the delay until its next run."""
+        result = None
+        if job is not None and job['result']:
+            result = job['result'].get('sources', {}).get(source)
+        status = result['status'] if result else (job['status'] if job else 'missing')
+        changed = bool(result) and status == 'ok' and (
+            result.get('inserted', 0) + result.get('updated', 0) + result.get('withdrawn', 0)) > 0
+        unchanged = bool(result) and (status == 'unchanged' or (status == 'ok' and not changed))
+
+        scraper_class = self.sources[source]
+        conn = connect(self.db_path)
+        try:
+            interval = conn.execute(
+                'SELECT interval_seconds FROM scrape_schedule WHERE source = ?', (source,)
+            ).fetchone()[0]
+            # Failed runs keep the current interval
+            if changed:
+                interval *= self.speedup
+            elif unchanged:
+                interval *= self.backoff
+            interval = min(max(interval, scraper_class.min_scrape_interval), scraper_class.max_scrape_interval)
+
+            with conn:
+                conn.execute('''
+                    UPDATE scrape_schedule
+                    SET interval_seconds = ?,
+                        last_run_at = ?,
+                        last_duration = ?,
+                        last_status = ?,
+                        last_changed_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE last_changed_at END,
+                        run_count = run_count + 1,
+                        change_count = change_count + ?
+                    WHERE source = ?
+                ''', (
+                    interval,
+                    (job and job['started_at']) or _utcnow().strftime(TIMESTAMP_FORMAT),
+                    result['duration'] if result else None,
+                    status,
+                    changed,
+                    int(changed),
+                    source
+                ))
+        finally:
+            conn.close()
+
+        logger.info(f"Scheduled scrape of {source} finished ({status}); next in about {interval / 60:.0f} min")
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+def init_app(app) -> Optional[ScrapeScheduler]:
+    """Start the scheduler in a background thread if SCRAPE_SCHEDULER is enabled."""
+    if not app.config['SCRAPE_SCHEDULER']:
+        return None
+    scheduler = ScrapeScheduler(app.extensions['job_queue'])
+    scheduler.start_in_background()
+    app.extensions['scrape_scheduler'] = scheduler
+    return scheduler
+
+
+if __name__ == '__main__':
+    from app import create_app
+    from migrations import DEFAULT_DB_PATH
+
+    parser = argparse.ArgumentParser(description='Run the periodic scrape scheduler.')
+    parser.add_argument('--db', default=os.environ.get('DATABASE_PATH', DEFAULT_DB_PATH),
+                        help='Path to the SQLite database')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app({'DATABASE': args.db, 'SCRAPE_SCHEDULER': False})
+    scheduler = ScrapeScheduler(app.extensions['job_queue'])
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
@@ -4,16 +4,59 @@ import logging
 import asyncio
 import re
 import json
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import close_shared_clients
+from scrapers.url_scraper import URLScraper
+from scrapers.event import Event
+from scrapers.fetch_strategy import FetchStrategies
+from scrapers.date_parser import parse_date
+from month_cache import month_cache
+from db import get_db
+from jobs import JobCancelled, get_job_queue
+from job_routes import job_accepted
 import requests
 import sqlite3
-import os
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 scraper_bp = Blueprint('scraper', __name__)
 
+
+def scrape_url_job(params: Dict[str, Any], is_cancelled, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Job handler for /scrape: fetch one URL and extract its event-like text.
+
+    With db_path, the fetch uses and updates the host's learned fetch strategy.
+    """
+    url = params['url']
+
+    async def run_scraper():
+        try:
+            async with URLScraper(url) as scraper:
+                if db_path:
+                    scraper.fetch_strategies = FetchStrategies(db_path)
+                task = asyncio.create_task(scraper.scrape())
+                while not task.done():
+                    if await asyncio.to_thread(is_cancelled):
+                        task.cancel()
+                        raise JobCancelled()
+                    await asyncio.wait({task}, timeout=0.5)
+                return task.result()
+        finally:
+            # The shared session and browser are bound to this job's event loop
+            await close_shared_clients()
+
+    result = asyncio.run(run_scraper())
+    
+    if result["error"]:
+        raise RuntimeError(result["error"])
+    return {
+        "error": None,
+        "text": result["text"],
+        "url": url,
+        "bytes_saved": result["bytes_saved"]
+    }
+
+
 @scraper_bp.route('/scrape', methods=['POST'])
 def scrape() -> Dict[str, Any]:
     """Scrape content from a provided URL, focusing on extracting potentially relevant text."""
@@ -24,97 +67,8 @@ def scrape() -> Dict[str, Any]:
         if not url:
             return jsonify({'error': 'URL is required', 'text': None})
 
-        class URLScraper(BaseScraper):
-            def __init__(self, url):
-                super().__init__("URL Scraper")
-                self.base_url = url
-
-            async def scrape(self):
-                """Extract text content that might contain event information."""
-                # Try with regular HTTP request first
-                soup = await self.get_page_content(self.base_url)
-                if not soup:
-                    logger.warning("Regular HTTP request failed, trying with headless browser")
-                    soup = await self.get_page_content(self.base_url, use_browser=True)
-                
-                if not soup:
-                    logger.error(f"Failed to fetch content from {self.base_url}")
-                    return {"error": "Failed to fetch content", "text": None}
-
-                # Look for common event container patterns
-                relevant_content = []
-                
-                # Common class/id patterns for event-related content
-                patterns = [
-                    r'event',
-                    r'calendar',
-                    r'schedule',
-                    r'program',
-                    r'listing',
-                    r'upcoming',
-                    r'what\'s-on',
-                    r'whats-on',
-                ]
-                
-                # First try to find specific event containers
-                event_elements = []
-                for pattern in patterns:
-                    elements = soup.find_all(class_=lambda x: x and re.search(pattern, x, re.I))
-                    event_elements.extend(elements)
-                    
-                    # Also check IDs
-                    elements = soup.find_all(id=lambda x: x and re.search(pattern, x, re.I))
-                    event_elements.extend(elements)
-
-                if event_elements:
-                    # If we found event-specific elements, extract their text
-                    for element in event_elements:
-                        # Clean up the text
-                        text = self.clean_text(element.get_text(separator=' ', strip=True))
-                        if text and len(text) > 50:  # Ignore very short snippets
-                            relevant_content.append(text)
-                else:
-                    # If no event-specific elements found, fall back to main content areas
-                    main_content = soup.find(['main', 'article']) or soup.find(class_=['content', 'main'])
-                    if main_content:
-                        text = self.clean_text(main_content.get_text(separator=' ', strip=True))
-                        relevant_content.append(text)
-                    else:
-                        # Last resort: get body text but try to exclude navigation, footer, etc.
-                        for element in soup.find_all(['p', 'div', 'section']):
-                            if not element.find_parent(['nav', 'footer', 'header']):
-                                text = self.clean_text(element.get_text(separator=' ', strip=True))
-                                if text and len(text) > 50:
-                                    relevant_content.append(text)
-
-                # Join the content, but keep some separation for readability
-                combined_text = "\n\n".join(relevant_content)
-                
-                return {
-                    "text": combined_text,
-                    "url": self.base_url,
-                    "error": None
-                }
-
-        async def run_scraper():
-            async with URLScraper(url) as scraper:
-                return await scraper.scrape()
-
-        # Run the scraper
-        result = asyncio.run(run_scraper())
-        
-        if result["error"]:
-            return jsonify({
-                "error": result["error"],
-                "text": None,
-                "url": url
-            })
-            
-        return jsonify({
-            "error": None,
-            "text": result["text"],
-            "url": url
-        })
+        job, created = get_job_queue().submit('scrape_url', {'url': url})
+        return job_accepted(job, created)
         
     except Exception as e:
         logger.error(f"Error in scrape endpoint: {str(e)}")
@@ -189,6 +143,15 @@ IMPORTANT:
     except Exception as e:
         return jsonify({'error': str(e), 'text': None})
 
+def _sql_literal(value) -> str:
+    """Quote a value for the generated SQL: NULL for empty strings, 0/1 for booleans."""
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if not value:
+        return 'NULL'
+    return "'" + str(value).replace("'", "''") + "'"
+
+
 @scraper_bp.route('/eventsql', methods=['POST'])
 def eventsql() -> Dict[str, Any]:
     """Convert interpreted event information to SQL commands."""
@@ -229,28 +192,24 @@ def eventsql() -> Dict[str, Any]:
             if not isinstance(event, dict):
                 continue
                 
-            # Skip events without required fields
-            if not event.get('date'):
-                continue
-
             try:
-                # Clean and escape values - ensure all strings are properly quoted
-                title = f"'{event.get('title', 'Untitled Event').replace('\'', '\'\'')}'"
-                date = f"'{event.get('date')}'"  # We know this exists because we checked above
-                time = f"'{event.get('time')}'" if event.get('time') else 'NULL'
-                location = f"'{event.get('location', '').replace('\'', '\'\'')}'" if event.get('location') else 'NULL'
-                description = f"'{event.get('description', '').replace('\'', '\'\'')}'" if event.get('description') else 'NULL'
-                url = f"'{event.get('url', '').replace('\'', '\'\'')}'" if event.get('url') else 'NULL'
-                needs_review = '0'  # Set to not need review
-                source = "'scraper'"
-                source_id = 'NULL'
-                
-                # Build the SQL command with all values properly quoted
-                sql = f"""INSERT INTO events (title, date, time, location, description, url, needs_review, source, source_id) VALUES ({title}, {date}, {time}, {location}, {description}, {url}, {needs_review}, {source}, {source_id});"""
-                sql_commands.append(sql)
-            except:
-                # Skip any events that cause errors
+                # Skips events without a usable date
+                parsed = Event.create(
+                    title=str(event.get('title') or 'Untitled Event'),
+                    date=parse_date(str(event.get('date') or '')),
+                    time=str(event.get('time') or ''),
+                    location=str(event.get('location') or ''),
+                    description=str(event.get('description') or ''),
+                    url=str(event.get('url') or ''),
+                    needs_review=False,  # Set to not need review
+                    source='scraper'
+                )
+            except ValueError:
                 continue
+
+            # Every field quoted as an SQL literal; source_id stays NULL for these one-off inserts
+            values = ', '.join([_sql_literal(value) for value in parsed[:-1]] + ['NULL'])
+            sql_commands.append(f"""INSERT INTO events (title, date, time, location, description, url, needs_review, source, source_id) VALUES ({values});""")
             
         if not sql_commands:
             return jsonify({'error': 'No valid events could be converted to SQL', 'sql': None})
@@ -274,14 +233,7 @@ def executesql() -> Dict[str, Any]:
         data = request.get_json()
         sql = data.get('sql', '')
         
-        # Get database path and ensure it exists
-        db_path = os.path.join(os.path.dirname(__file__), 'database', 'database.db')
-        if not os.path.exists(db_path):
-            init_db()
-        
-        print(f"Using database at: {db_path}")  # Debug log
-        
-        conn = sqlite3.connect(db_path)
+        conn = get_db()
         cursor = conn.cursor()
         
         # Execute each command
@@ -293,6 +245,8 @@ def executesql() -> Dict[str, Any]:
             cursor.executescript(sql)
             conn.commit()
             success_count = 1  # If we got here, it worked
+            # Arbitrary SQL can touch any month
+            month_cache.clear()
         except sqlite3.Error as e:
             errors.append(str(e))
             
@@ -318,34 +272,3 @@ def executesql() -> Dict[str, Any]:
             'message': 'Failed to execute SQL',
             'error': str(e)
         })
-
-def get_db():
-    """Get a connection to the SQLite database."""
-    # Get the absolute path to the database
-    db_path = os.path.join(os.path.dirname(__file__), 'database', 'database.db')
-    
-    # Initialize database if it doesn't exist
-    if not os.path.exists(db_path):
-        init_db()
-        
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def init_db():
-    """Initialize the database with schema."""
-    db_path = os.path.join(os.path.dirname(__file__), 'database', 'database.db')
-    schema_path = os.path.join(os.path.dirname(__file__), 'database', 'schema.sql')
-    
-    # Ensure database directory exists
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    
-    # Read schema from file
-    with open(schema_path, 'r') as f:
-        schema = f.read()
-    
-    # Initialize database with schema
-    conn = sqlite3.connect(db_path)
-    conn.executescript(schema)
-    conn.commit()
-    conn.close()
\ No newline at end of file
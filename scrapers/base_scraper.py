@@ -1,23 +1,74 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Union
-from datetime import datetime
-import requests
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+from urllib.parse import urlsplit
 from bs4 import BeautifulSoup
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+import json
 import logging
-import re
 import asyncio
-from playwright.async_api import async_playwright, Browser, Page
-import aiohttp
+from .browser_pool import browser_pool
+from .http_client import http_client
+from .fetch_cache import FetchCache, PageUnchanged, body_hash
+from .fetch_policy import RETRY_STATUSES, FetchFailed, fetch_policy
+from .fetch_strategy import FetchStrategies
+from .html_parser import has_containers, make_soup
+from .date_parser import parse_date
+from .scrape_logging import EventLog
+from .event import Event
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Polled in the page by extract_in_browser: true once there are event
+# containers and their number has not changed for settleMs
+_CONTAINERS_SETTLED = """
+([selector, settleMs]) => {
+    const count = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const last = window.__eventContainers;
+    if (!last || last.count !== count) {
+        window.__eventContainers = {count, since: now};
+        return false;
+    }
+    return count > 0 && now - last.since >= settleMs;
+}
+"""
+
+async def close_shared_clients():
+    """Close the shared HTTP session and browser bound to the running event loop."""
+    await http_client.close()
+    await browser_pool.shutdown()
+
 class BaseScraper(ABC):
+    # Scheduler polling interval in seconds, and the bounds it may adapt within
+    scrape_interval = 6 * 60 * 60
+    min_scrape_interval = 30 * 60
+    max_scrape_interval = 24 * 60 * 60
+    # Days this source's events are kept after their date before retention archives them
+    retention_days = 30
+    # Simple 'tag.class' selector for the elements parse_events reads; see html_parser
+    event_container: Optional[str] = None
+    # Path fetch_listing tries first for a host it has no record of: 'http' or 'browser'
+    fetch_strategy = 'http'
+    # JavaScript function mapping the page's event_container elements to plain
+    # records; when set, browser fetches extract in the page (see extract_in_browser)
+    browser_extractor: Optional[str] = None
+    # Seconds extract_in_browser waits for the page's event containers, and
+    # how long their number must stay unchanged before the page counts as rendered
+    browser_ready_timeout = 15
+    browser_settle_time = 0.5
+
     def __init__(self, source_name: str):
         self.source_name = source_name
         self.confidence_threshold = 0.7
-        self._browser = None
-        self._context = None
+        # Set by ScraperManager to make fetches conditional on the last run
+        self.fetch_cache: Optional[FetchCache] = None
+        self.fetched_validators: Dict[str, Dict] = {}
+        # Set by ScraperManager to remember which fetch path works for each host
+        self.fetch_strategies: Optional[FetchStrategies] = None
+        # URL -> last error, for fetches that failed and never succeeded this run
+        self.fetch_errors: Dict[str, str] = {}
+        # Per-event debug records, off unless this source is being debugged
+        self.event_log = EventLog(source_name)
         
     async def __aenter__(self):
         """Set up async context for headless browser."""
@@ -28,29 +79,47 @@ class BaseScraper(ABC):
         await self.close_browser()
 
     @abstractmethod
-    async def scrape(self) -> List[Dict]:
+    async def scrape(self) -> List[Event]:
         """Scrape events from the source. Must be implemented by each scraper."""
         pass
 
-    def calculate_confidence(self, event: Dict) -> float:
+    async def iter_events(self) -> AsyncIterator[Event]:
+        """Yield formatted events as they are scraped; this is what ScraperManager stores.
+
+        Defaults to the list from scrape(). Sources with many pages or
+        thousands of listings can override it to yield each page's events as
+        soon as they are parsed, so they are written while scraping continues.
+        """
+        for event in await self.scrape():
+            yield event
+
+    @classmethod
+    def parse_events(cls, html: str) -> List[Event]:
+        """Extract formatted events from a page's HTML.
+
+        Runs as a parse job in a worker process (see parse_pool), so it must
+        depend only on its arguments and return plain records.
+        """
+        raise NotImplementedError
+
+    def calculate_confidence(self, event: Event) -> float:
         """Calculate confidence score for an event based on data completeness."""
         score = 0.0
-        required_fields = ['title', 'date']
-        optional_fields = ['time', 'location', 'description', 'url']
         
         # Check required fields
-        for field in required_fields:
-            if event.get(field):
+        for value in (event.title, event.date):
+            if value:
                 score += 0.4  # 80% of score from required fields
                 
         # Check optional fields
-        for field in optional_fields:
-            if event.get(field):
+        for value in (event.time, event.location, event.description, event.url):
+            if value:
                 score += 0.05  # 20% of score from optional fields
                 
         return min(score, 1.0)
 
-    def clean_text(self, text: str) -> str:
+    @staticmethod
+    def clean_text(text: str) -> str:
         """Clean and normalize text content."""
         if not text:
             return ""
@@ -58,119 +127,225 @@ class BaseScraper(ABC):
 
     def parse_date(self, date_str: str) -> Optional[str]:
         """Parse date string into YYYY-MM-DD format."""
-        if not date_str:
-            return None
-            
-        logger.info(f"Parsing date string: {date_str}")
-        try:
-            # Try various date formats
-            formats = [
-                "%Y-%m-%d",      # 2024-02-10
-                "%B %d, %Y",     # February 10, 2024
-                "%b %d, %Y",     # Feb 10, 2024
-                "%Y/%m/%d",      # 2024/02/10
-                "%m/%d/%Y",      # 02/10/2024
-                "%d/%m/%Y",      # 10/02/2024
-                "%Y.%m.%d",      # 2024.02.10
-                "%A, %B %d, %Y", # Monday, February 10, 2024
-                "%A, %b %d, %Y"  # Monday, Feb 10, 2024
-            ]
-            
-            # Clean the date string
-            date_str = date_str.strip()
-            
-            # Try each format
-            for fmt in formats:
+        return parse_date(date_str)
+
+    def _check_changed(self, url: str, cached: Optional[Dict], body: bytes, headers=None) -> None:
+        """Raise PageUnchanged for a body seen last run, otherwise record its new validators."""
+        if self.fetch_cache is None:
+            return
+        digest = body_hash(body)
+        if cached and cached['body_hash'] == digest:
+            raise PageUnchanged(url)
+        self.fetched_validators[url] = {
+            'etag': headers.get('ETag') if headers else None,
+            'last_modified': headers.get('Last-Modified') if headers else None,
+            'body_hash': digest,
+        }
+
+    async def close_browser(self):
+        """Release browser resources held by this scraper.
+
+        Pages come from the shared browser pool and are returned as soon as
+        they have been read, so there is nothing left to close per scraper.
+        """
+        pass
+
+    async def get_page_content(self, url: str, use_browser: bool = False) -> Optional[BeautifulSoup]:
+        """Fetch a page and parse it on the event loop.
+
+        Prefer fetch_html plus a parse job in parse_pool for anything large.
+        """
+        html = await self.fetch_html(url, use_browser=use_browser)
+        return make_soup(html) if html is not None else None
+
+    async def fetch_html(self, url: str, use_browser: bool = False) -> Optional[str]:
+        """Get a page's HTML using either a plain HTTP request or the headless browser.
+
+        Every attempt waits for the host's rate limit, and connection errors,
+        timeouts and 429/5xx responses are retried with backoff (see
+        fetch_policy). Returns None once the fetch has failed, recording the
+        error in fetch_errors. When a fetch cache is attached, requests are
+        conditional and PageUnchanged is raised if the page matches the last
+        successful run.
+        """
+        cached = self.fetch_cache.get(url) if self.fetch_cache else None
+
+        async def fetch_once() -> str:
+            if use_browser:
+                async with browser_pool.page(block_resources=True) as page:
+                    await page.goto(url, wait_until='networkidle')
+                    content = await page.content()
+                self._check_changed(url, cached, content.encode('utf-8'))
+                return content
+
+            headers = {}
+            if cached and cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached and cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+            session = await http_client.session()
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    raise PageUnchanged(url)
+                if response.status == 200:
+                    body = await response.read()
+                    self._check_changed(url, cached, body, response.headers)
+                    return body.decode(response.get_encoding(), errors='replace')
+                raise FetchFailed(f"status {response.status}", response.status in RETRY_STATUSES,
+                                  fetch_policy.retry_after(response.headers))
+
+        return await self._fetch_with_retries(url, fetch_once)
+
+    async def extract_in_browser(self, url: str) -> Optional[List[Dict]]:
+        """Load a listing in the headless browser and return its events as records built in the page.
+
+        Images, media, fonts and analytics are blocked, and rather than
+        waiting for the network to go idle the page is read once its
+        event_container elements have stopped arriving for
+        browser_settle_time seconds. browser_extractor then runs over those
+        elements inside the page, so only the records come back instead of
+        the whole DOM. A page that hasn't settled within browser_ready_timeout
+        seconds, or yields no records, is a failed fetch: a partial or empty
+        listing must never look complete to reconciliation. Retries,
+        fetch_errors and PageUnchanged work as in fetch_html, the last
+        comparing the records.
+        """
+        cached = self.fetch_cache.get(url) if self.fetch_cache else None
+
+        async def fetch_once() -> List[Dict]:
+            async with browser_pool.page(block_resources=True) as page:
+                await page.goto(url, wait_until='domcontentloaded')
                 try:
-                    date_obj = datetime.strptime(date_str, fmt)
-                    result = date_obj.strftime("%Y-%m-%d")
-                    logger.info(f"Successfully parsed date: {result}")
-                    return result
-                except ValueError:
+                    await page.wait_for_function(
+                        _CONTAINERS_SETTLED, arg=[self.event_container, self.browser_settle_time * 1000],
+                        polling=100, timeout=self.browser_ready_timeout * 1000
+                    )
+                except PlaywrightTimeoutError:
+                    raise FetchFailed(f"{self.event_container} did not settle within {self.browser_ready_timeout}s")
+                records = await page.eval_on_selector_all(self.event_container, self.browser_extractor)
+            if not records:
+                raise FetchFailed("no event records extracted")
+            self._check_changed(url, cached, json.dumps(records, sort_keys=True).encode('utf-8'))
+            return records
+
+        return await self._fetch_with_retries(url, fetch_once)
+
+    async def _fetch_with_retries(self, url: str, fetch_once: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fetch_once under the host's rate limit until it succeeds or runs out of attempts."""
+        attempts = fetch_policy.max_retries + 1
+        for attempt in range(attempts):
+            await fetch_policy.throttle(url)
+            retry_after = None
+            try:
+                result = await fetch_once()
+                self.fetch_errors.pop(url, None)
+                return result
+            except PageUnchanged:
+                raise
+            except FetchFailed as e:
+                error = str(e)
+                if not e.retryable:
+                    break
+                retry_after = e.retry_after
+            except Exception as e:
+                error = str(e) or type(e).__name__
+
+            if attempt + 1 < attempts:
+                delay = fetch_policy.backoff(attempt, retry_after)
+                logger.info(f"Retrying {url} in {delay:.1f}s after {error}")
+                await asyncio.sleep(delay)
+
+        self.fetch_errors[url] = error
+        logger.error(f"Failed to fetch {url}: {error}")
+        return None
+
+    def has_event_nodes(self, html: str) -> bool:
+        """Whether a fetched page already holds this source's event containers."""
+        if not self.event_container:
+            return bool(html)
+        return has_containers(html, self.event_container)
+
+    async def fetch_listing(self, url: str) -> Union[str, List[Dict], None]:
+        """Fetch an event listing over the cheapest path that produces event nodes for its host.
+
+        Tries the host's preferred path (see fetch_strategy), falling back to
+        the other one when it fails or the page has no event containers, and
+        records the outcome in fetch_strategies when attached. Returns the
+        first page with event nodes, else the last page fetched, else None.
+        For a scraper with a browser_extractor the browser path returns the
+        records from extract_in_browser in place of a page.
+        """
+        host = urlsplit(url).hostname or ''
+        if self.fetch_strategies:
+            strategy = await asyncio.to_thread(self.fetch_strategies.get, host, self.fetch_strategy)
+        else:
+            strategy = {'preferred': self.fetch_strategy, 'probe': False}
+        if strategy['preferred'] == 'http' or strategy['probe']:
+            paths = ('http', 'browser')
+        else:
+            paths = ('browser', 'http')
+        
+        outcomes: Dict[str, str] = {}
+        listing = None
+        failure = None
+        try:
+            for path in paths:
+                if path == 'browser' and self.browser_extractor:
+                    page = await self.extract_in_browser(url)
+                else:
+                    page = await self.fetch_html(url, use_browser=path == 'browser')
+                if page is None:
+                    outcomes[path] = 'failed'
+                    failure = self.fetch_errors.get(url)
                     continue
-                    
-            # If none of the formats work, try to extract date components
-            pattern = r'(?:.*,\s*)?(\w+)\s+(\d{1,2})(?:st|nd|rd|th)?,\s*(\d{4})'
-            match = re.search(pattern, date_str)
-            if match:
-                month, day, year = match.groups()
-                try:
-                    month_num = datetime.strptime(month, '%B').month
-                except ValueError:
-                    try:
-                        month_num = datetime.strptime(month[:3], '%b').month
-                    except ValueError:
-                        return None
-                        
-                return f"{year}-{str(month_num).zfill(2)}-{str(int(day)).zfill(2)}"
-                
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to parse date '{date_str}': {str(e)}")
-            return None
+                listing = page
+                # Extracted records always hold events; extract_in_browser fails otherwise
+                if isinstance(page, list) or self.has_event_nodes(page):
+                    outcomes[path] = 'ok'
+                    break
+                outcomes[path] = 'empty'
+                logger.info(f"{url} has no event nodes over {path}")
+        except PageUnchanged:
+            # Unchanged since a run that found events over this path
+            outcomes[path] = 'ok'
+            await self._record_fetch_outcomes(host, strategy, outcomes)
+            raise
+        if failure and 'ok' not in outcomes.values():
+            # The other path's page without events cleared the error, but the
+            # failed path may have had them: the listing is not complete
+            self.fetch_errors[url] = failure
+        await self._record_fetch_outcomes(host, strategy, outcomes)
+        return listing
 
-    async def init_browser(self):
-        """Initialize the headless browser if not already initialized."""
-        if not self._browser:
-            playwright = await async_playwright().start()
-            self._browser = await playwright.chromium.launch(headless=True)
-            self._context = await self._browser.new_context(
-                user_agent='CoherentCalendar/1.0 (Boulder Community Calendar; hello@coherentcalendar.com)'
-            )
+    async def _record_fetch_outcomes(self, host: str, strategy: Dict, outcomes: Dict[str, str]) -> None:
+        if not self.fetch_strategies:
+            return
+        preferred = await asyncio.to_thread(self.fetch_strategies.record, host, self.fetch_strategy, outcomes)
+        if preferred != strategy['preferred']:
+            logger.info(f"Fetching {host} over {preferred} from now on")
 
-    async def close_browser(self):
-        """Close browser and clean up resources."""
-        if self._context:
-            await self._context.close()
-        if self._browser:
-            await self._browser.close()
-        self._context = None
-        self._browser = None
-
-    async def get_page_content(self, url: str, use_browser: bool = False) -> Optional[Union[str, BeautifulSoup]]:
-        """Get page content using either requests or headless browser."""
+    def format_event(self, raw_event: Dict) -> Optional[Event]:
+        """Format raw event data into an Event, or None if it has no title or valid date."""
+        self.event_log.event("Formatting raw event: %s", raw_event, key=raw_event.get('source_id'))
         try:
-            if use_browser:
-                await self.init_browser()
-                page = await self._context.new_page()
-                await page.goto(url, wait_until='networkidle')
-                content = await page.content()
-                await page.close()
-                return BeautifulSoup(content, 'html.parser')
-            else:
-                async with aiohttp.ClientSession() as session:
-                    headers = {
-                        'User-Agent': 'CoherentCalendar/1.0 (Boulder Community Calendar; hello@coherentcalendar.com)'
-                    }
-                    async with session.get(url, headers=headers) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            return BeautifulSoup(content, 'html.parser')
-                        else:
-                            logger.warning(f"Failed to fetch {url} with status {response.status}")
-                            return None
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {str(e)}")
+            event = Event.create(
+                title=self.clean_text(raw_event.get('title', '')),
+                date=self.parse_date(raw_event.get('date', '')),
+                time=raw_event.get('time', ''),
+                location=self.clean_text(raw_event.get('location', '')),
+                description=self.clean_text(raw_event.get('description', '')),
+                url=raw_event.get('url', ''),
+                source=self.source_name,
+                source_id=raw_event.get('source_id')
+            )
+        except ValueError as e:
+            self.event_log.event("Invalid event: %s", e, key=raw_event.get('source_id'))
             return None
-
-    def format_event(self, raw_event: Dict) -> Dict:
-        """Format raw event data into standardized format."""
-        logger.info(f"Formatting raw event: {raw_event}")
-        event = {
-            'title': self.clean_text(raw_event.get('title', '')),
-            'date': self.parse_date(raw_event.get('date', '')),
-            'time': raw_event.get('time', ''),
-            'location': self.clean_text(raw_event.get('location', '')),
-            'description': self.clean_text(raw_event.get('description', '')),
-            'url': raw_event.get('url', ''),
-            'source': self.source_name,
-            'source_id': raw_event.get('source_id', '')
-        }
         
         # Calculate confidence score
-        confidence = self.calculate_confidence(event)
-        event['needs_review'] = confidence < self.confidence_threshold
+        if self.calculate_confidence(event) < self.confidence_threshold:
+            event = event._replace(needs_review=True)
         
-        logger.info(f"Formatted event: {event}")
+        self.event_log.event("Formatted event: %s", event, key=raw_event.get('source_id'))
         return event
\ No newline at end of file
@@ -0,0 +1,175 @@
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import re
+import threading
+
+from playwright.async_api import async_playwright, Browser, Page, Route
+
+try:
+    import psutil
+except ImportError:  # Optional: only used to watch the browser's resident memory
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'CoherentCalendar/1.0 (Boulder Community Calendar; hello@coherentcalendar.com)'
+
+# Requests a scrape never needs to read a listing's DOM
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+BLOCKED_HOSTS = re.compile(
+    r'(^|\.)(google-analytics\.com|googletagmanager\.com|doubleclick\.net|googlesyndication\.com'
+    r'|facebook\.net|hotjar\.com|segment\.(io|com)|mixpanel\.com|clarity\.ms|nr-data\.net)$'
+)
+
+
+async def _block_unneeded(route: Route) -> None:
+    request = route.request
+    if (request.resource_type in BLOCKED_RESOURCE_TYPES
+            or BLOCKED_HOSTS.search(urlsplit(request.url).hostname or '')):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _LoopState:
+    """The pool's Playwright objects for one event loop, which they belong to."""
+
+    def __init__(self, max_pages: int):
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self.pages_served = 0
+        self.active: Dict[Browser, int] = {}
+        self.lock = asyncio.Lock()
+        self.semaphore = asyncio.Semaphore(max_pages)
+
+
+class BrowserPool:
+    """One warm headless Chromium per event loop, shared by every scraper on it.
+
+    Each page gets its own browser context, so cookies and storage never leak
+    between sources. The number of open pages is capped, and the browser is
+    recycled after `max_pages_per_browser` pages or, when psutil is installed,
+    once the pool's browsers grow past `max_memory_mb`. A retired browser is
+    closed when its last page finishes.
+
+    Playwright objects belong to the event loop that created them, and job
+    workers and scheduler jobs each run scrapes on their own loop, so every
+    loop gets its own browser and page cap. shutdown() closes the calling
+    loop's.
+    """
+
+    def __init__(self, max_pages: int = 4, max_pages_per_browser: int = 200,
+                 max_memory_mb: int = 1024, user_agent: str = USER_AGENT):
+        self.max_pages = max_pages
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_memory_mb = max_memory_mb
+        self.user_agent = user_agent
+        self._states: Dict[asyncio.AbstractEventLoop, _LoopState] = {}
+        self._states_lock = threading.Lock()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._states_lock:
+            state = self._states.get(loop)
+            if state is None:
+                # Loops that ended without shutdown(); their browsers died with them
+                for closed in [other for other in self._states if other.is_closed()]:
+                    del self._states[closed]
+                state = self._states[loop] = _LoopState(self.max_pages)
+            return state
+
+    async def _get_browser(self, state: _LoopState) -> Browser:
+        async with state.lock:
+            if state.browser is not None and state.pages_served >= self.max_pages_per_browser:
+                logger.info(f"Recycling shared browser after {state.pages_served} pages")
+                await self._retire(state, state.browser)
+            if state.browser is None or not state.browser.is_connected():
+                if state.playwright is None:
+                    state.playwright = await async_playwright().start()
+                state.browser = await state.playwright.chromium.launch(headless=True)
+                state.pages_served = 0
+                logger.info("Launched shared headless browser")
+            return state.browser
+
+    @asynccontextmanager
+    async def page(self, block_resources: bool = False):
+        """Yield a fresh page in an isolated context, counted against the page cap.
+
+        With block_resources, images, media, fonts and analytics requests are
+        aborted before they leave the browser.
+        """
+        state = self._state()
+        async with state.semaphore:
+            browser = await self._get_browser(state)
+            state.active[browser] = state.active.get(browser, 0) + 1
+            state.pages_served += 1
+            context = await browser.new_context(user_agent=self.user_agent)
+            try:
+                if block_resources:
+                    await context.route('**/*', _block_unneeded)
+                page: Page = await context.new_page()
+                yield page
+            finally:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing browser context: {str(e)}")
+                state.active[browser] -= 1
+                await self._maybe_recycle(state, browser)
+
+    async def _maybe_recycle(self, state: _LoopState, browser: Browser) -> None:
+        if browser is state.browser:
+            memory_mb = self._browser_memory_mb()
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                logger.info(f"Recycling shared browser using {memory_mb:.0f} MB")
+                await self._retire(state, browser)
+        elif state.active.get(browser) == 0:
+            # Last page of an already retired browser
+            await self._close(state, browser)
+
+    async def _retire(self, state: _LoopState, browser: Browser) -> None:
+        """Stop handing out pages from `browser`, closing it now if it is idle."""
+        if browser is state.browser:
+            state.browser = None
+        if not state.active.get(browser):
+            await self._close(state, browser)
+
+    async def _close(self, state: _LoopState, browser: Browser) -> None:
+        state.active.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser: {str(e)}")
+
+    def _browser_memory_mb(self) -> Optional[float]:
+        """Resident memory of this process's child tree (the browsers and their drivers)."""
+        if psutil is None:
+            return None
+        try:
+            children = psutil.Process().children(recursive=True)
+            return sum(child.memory_info().rss for child in children) / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    async def shutdown(self) -> None:
+        """Close the running loop's browsers and stop its Playwright driver."""
+        with self._states_lock:
+            state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        async with state.lock:
+            browsers = set(state.active)
+            if state.browser is not None:
+                browsers.add(state.browser)
+            for browser in browsers:
+                await self._close(state, browser)
+            if state.playwright is not None:
+                await state.playwright.stop()
+            state.browser = None
+            state.playwright = None
+
+
+browser_pool = BrowserPool()
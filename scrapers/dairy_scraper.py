@@ -2,108 +2,144 @@
 from typing import Dict, List, Optional
 import logging
 import re
+import zlib
 from datetime import datetime
 from .base_scraper import BaseScraper
+from .event import Event
+from .html_parser import parse_containers
+from .date_parser import extract_dates
+from .parse_pool import parse_pool
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Runs in the page over every div.eventCard; mirrors the fields parse_events reads
+CARD_EXTRACTOR = """
+cards => cards.map(card => {
+    const text = selector => {
+        const elem = card.querySelector(selector);
+        return elem ? elem.textContent.trim() : null;
+    };
+    const link = card.querySelector('a.event-link');
+    return {
+        title: text('h2.event-title'),
+        date_text: text('span.event-date'),
+        time: text('span.event-time'),
+        description: text('div.event-description'),
+        url: link ? link.getAttribute('href') : null,
+    };
+})
+"""
+
 class DairyScraper(BaseScraper):
+    event_container = 'div.eventCard'
+    fetch_strategy = 'browser'
+    browser_extractor = CARD_EXTRACTOR
+
     def __init__(self):
         super().__init__("Dairy Arts Center")
         self.base_url = "https://thedairy.org/events/"
 
-    async def scrape(self) -> List[Dict]:
-        """Scrape events from The Dairy Arts Center."""
+    async def scrape(self) -> List[Event]:
+        """Scrape events from The Dairy Arts Center.
+
+        Parse errors propagate, so ScraperManager fails the run and does not
+        save the page's validators.
+        """
+        # The listing has needed the browser (dynamic content); fetch_listing re-checks HTTP now and then.
+        # Over the browser the cards come back already extracted.
+        listing = await self.fetch_listing(self.base_url)
+        if listing is None:
+            logger.error("Failed to fetch Dairy Arts Center events page")
+            return []
+
+        if isinstance(listing, list):
+            events = await parse_pool.run(self.events_from_cards, listing)
+        else:
+            events = await parse_pool.run(self.parse_events, listing)
+        logger.debug("Scraped %d events from Dairy Arts Center", len(events))
+        return events
+
+    @classmethod
+    def parse_events(cls, html: str) -> List[Event]:
+        """Extract events from the Dairy events page (runs in a parse worker)."""
+        soup = parse_containers(html, cls.event_container)
+
+        # The events are loaded into cards with class 'eventCard'
+        cards = []
+        for card in soup.find_all('div', {'class': 'eventCard'}):
+            title_elem = card.find('h2', {'class': 'event-title'})
+            date_elem = card.find('span', {'class': 'event-date'})
+            time_elem = card.find('span', {'class': 'event-time'})
+            desc_elem = card.find('div', {'class': 'event-description'})
+            url_elem = card.find('a', {'class': 'event-link'})
+            cards.append({
+                'title': title_elem.text.strip() if title_elem else None,
+                'date_text': date_elem.text.strip() if date_elem else None,
+                'time': time_elem.text.strip() if time_elem else None,
+                'description': desc_elem.text.strip() if desc_elem else None,
+                'url': url_elem.get('href') if url_elem else None,
+            })
+        return cls.events_from_cards(cards)
+
+    @classmethod
+    def events_from_cards(cls, cards: List[Dict]) -> List[Event]:
+        """Build events from card records, whether read by parse_events or CARD_EXTRACTOR."""
+        scraper = cls()
         events = []
-        
-        try:
-            # We need to use the browser for this site due to dynamic content
-            soup = await self.get_page_content(self.base_url, use_browser=True)
-            if not soup:
-                logger.error("Failed to fetch Dairy Arts Center events page")
-                return events
-
-            # The events are loaded into cards with class 'eventCard'
-            event_cards = soup.find_all('div', {'class': 'eventCard'})
-            logger.info(f"Found {len(event_cards)} event cards")
-
-            for card in event_cards:
-                try:
-                    # Extract event details
-                    title_elem = card.find('h2', {'class': 'event-title'})
-                    date_elem = card.find('span', {'class': 'event-date'})
-                    time_elem = card.find('span', {'class': 'event-time'})
-                    desc_elem = card.find('div', {'class': 'event-description'})
-                    url_elem = card.find('a', {'class': 'event-link'})
-
-                    if not title_elem or not date_elem:
-                        logger.warning("Skipping event card - missing required elements")
-                        continue
-
-                    # Some events might have multiple dates
-                    dates = self._extract_dates(date_elem.text.strip())
-                    
-                    for date in dates:
-                        event = {
-                            'title': title_elem.text.strip(),
-                            'date': date,
-                            'time': time_elem.text.strip() if time_elem else '',
-                            'description': desc_elem.text.strip() if desc_elem else '',
-                            'location': 'Dairy Arts Center, 2590 Walnut Street, Boulder, CO 80302',
-                            'url': url_elem['href'] if url_elem else self.base_url,
-                            'source_id': self._generate_source_id(url_elem['href'] if url_elem else '', date)
-                        }
-                        
-                        # Log the raw event data
-                        logger.info(f"Raw event data: {event}")
-                        
-                        # Format and validate the event
-                        formatted_event = self.format_event(event)
-                        if formatted_event['date']:  # Only add events with valid dates
-                            events.append(formatted_event)
-                        else:
-                            logger.warning(f"Skipping event due to invalid date: {event['title']}")
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing event card: {str(e)}")
+        skipped = 0
+        scraper.event_log.debug("Found %d event cards", len(cards))
+
+        for card in cards:
+            try:
+                if card['title'] is None or card['date_text'] is None:
+                    scraper.event_log.event("Skipping event card - missing required elements")
+                    skipped += 1
                     continue
 
-            logger.info(f"Successfully scraped {len(events)} events from Dairy Arts Center")
-            
-        except Exception as e:
-            logger.error(f"Error during Dairy Arts Center scraping: {str(e)}")
-            
+                # Some events might have multiple dates
+                dates = scraper._extract_dates(card['date_text'])
+                if not dates:
+                    skipped += 1
+                
+                for date in dates:
+                    event = {
+                        'title': card['title'],
+                        'date': date,
+                        'time': card['time'] or '',
+                        'description': card['description'] or '',
+                        'location': 'Dairy Arts Center, 2590 Walnut Street, Boulder, CO 80302',
+                        'url': card['url'] or scraper.base_url,
+                        'source_id': scraper._generate_source_id(card['url'] or '', date)
+                    }
+                    
+                    # Log the raw event data (only when debugging this source)
+                    scraper.event_log.event("Raw event data: %s", event, key=event['source_id'])
+                    
+                    # Format and validate the event
+                    formatted_event = scraper.format_event(event)
+                    if formatted_event is not None:  # Only add events with a title and valid date
+                        events.append(formatted_event)
+                    else:
+                        scraper.event_log.event("Skipping event without a title or valid date: %s", event['title'])
+                        skipped += 1
+                    
+            except Exception as e:
+                logger.error(f"Error parsing event card: {str(e)}")
+                continue
+
+        if skipped:
+            logger.warning("Skipped %d of %d Dairy Arts Center event cards without a usable date", skipped, len(cards))
         return events
 
     def _extract_dates(self, date_text: str) -> List[str]:
-        """Extract multiple dates from date text."""
-        dates = []
-        
-        # Common date patterns at The Dairy
-        patterns = [
-            r'(\w+ \d{1,2}(?:st|nd|rd|th)?,? \d{4})',  # March 15th, 2024
-            r'(\d{1,2}/\d{1,2}/\d{4})',                 # 3/15/2024
-            r'(\w+ \d{1,2}(?:st|nd|rd|th)?)',          # March 15th (current year)
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, date_text)
-            if matches:
-                for match in matches:
-                    # If year is not in the date, add current year
-                    if not re.search(r'\d{4}', match):
-                        match = f"{match}, {datetime.now().year}"
-                    
-                    parsed_date = self.parse_date(match)
-                    if parsed_date:
-                        dates.append(parsed_date)
-                break  # Stop after first successful pattern match
-        
+        """Extract multiple dates from date text, expanding ranges like "March 15–17"."""
+        # Dates without a year (e.g. "March 15th") are in the current year
+        dates = list(extract_dates(date_text, datetime.now().year))
+
         # If no dates found, log the problematic text
         if not dates:
-            logger.warning(f"Could not extract dates from: {date_text}")
-        
+            self.event_log.event("Could not extract dates from: %s", date_text)
+
         return dates
 
     def _generate_source_id(self, url: str, date: str) -> str:
@@ -113,8 +149,8 @@ class DairyScraper(BaseScraper):
         if event_id:
             return f"{event_id.group(1)}_{date}"
         
-        # Fallback to URL hash
-        return f"{hash(url)}_{date}"
+        # Fallback to a digest of the URL (hash() is salted per process)
+        return f"{zlib.crc32(url.encode('utf-8')):08x}_{date}"
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -0,0 +1,132 @@
+"""Compiled date parsing for scraped event dates.
+
+Each input is classified once by a precompiled pattern and converted
+directly, instead of trying strptime formats until one stops raising.
+Results are memoized in bounded LRU caches, since venues repeat the same
+date strings on every run.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+import re
+
+MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ('january', 'jan'), ('february', 'feb'), ('march', 'mar'), ('april', 'apr'),
+        ('may',), ('june', 'jun'), ('july', 'jul'), ('august', 'aug'),
+        ('september', 'sep', 'sept'), ('october', 'oct'), ('november', 'nov'), ('december', 'dec'),
+    ], start=1)
+    for name in names
+}
+
+_MONTH = r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+_WEEKDAY = r'(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?'
+_DAY = r'(\d{1,2})(?:st|nd|rd|th)?'
+_RANGE_SEP = r'\s*(?:-|–|—|to|through|thru)\s*'
+# So "March 5 - 8:00 PM" is a date and a time, not the range March 5–8
+_NOT_A_TIME = r'(?!:\d\d|\s*[ap]\.?m\b)'
+
+# Whole-string shapes, tried in order
+_YMD = re.compile(r'(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})')
+_NUMERIC = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+_MONTH_DAY_YEAR = re.compile(rf'(?:{_WEEKDAY},?\s+)?({_MONTH})\.?\s+{_DAY},?\s+(\d{{4}})', re.I)
+# Fallback: a "Month Day, Year" anywhere in the text, e.g. "Sat, March 15th, 2030 at 7pm"
+_MONTH_DAY_YEAR_SEARCH = re.compile(rf'\b({_MONTH})\.?\s+{_DAY},\s*(\d{{4}})\b', re.I)
+
+# Dates and date ranges inside free text, for extract_dates
+_DATES_IN_TEXT = re.compile(
+    rf'''
+    (?P<numeric_start>\d{{1,2}}/\d{{1,2}}/\d{{4}})(?:{_RANGE_SEP}(?P<numeric_end>\d{{1,2}}/\d{{1,2}}/\d{{4}}))?
+    |
+    \b(?P<month1>{_MONTH})\.?\s+(?P<day1>\d{{1,2}})(?:st|nd|rd|th)?\b(?:,?\s*(?P<year1>\d{{4}})\b)?
+    (?:{_RANGE_SEP}(?:(?P<month2>{_MONTH})\.?\s+)?(?P<day2>\d{{1,2}})(?:st|nd|rd|th)?\b{_NOT_A_TIME}(?:,?\s*(?P<year2>\d{{4}})\b)?)?
+    ''',
+    re.I | re.X
+)
+
+# Ranges longer than this are treated as a run (e.g. an exhibition) and only the start is listed
+MAX_RANGE_DAYS = 31
+
+
+def _month_number(name: str) -> Optional[int]:
+    name = name.lower().rstrip('.')
+    return MONTHS.get(name) or MONTHS.get(name[:3])
+
+
+def _to_date(year, month, day) -> Optional[date]:
+    try:
+        return date(int(year), int(month), int(day))
+    except (TypeError, ValueError):
+        return None
+
+
+def _numeric(text: str) -> Optional[date]:
+    """M/D/YYYY, or D/M/YYYY when the first part can't be a month."""
+    match = _NUMERIC.fullmatch(text)
+    if not match:
+        return None
+    first, second, year = match.groups()
+    return _to_date(year, first, second) or _to_date(year, second, first)
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> Optional[str]:
+    """Parse a single date into YYYY-MM-DD, or None if it isn't one."""
+    if not text:
+        return None
+    text = text.strip()
+
+    match = _YMD.fullmatch(text)
+    if match:
+        parsed = _to_date(*match.groups())
+    else:
+        parsed = _numeric(text) if '/' in text else None
+        if parsed is None:
+            match = _MONTH_DAY_YEAR.fullmatch(text) or _MONTH_DAY_YEAR_SEARCH.search(text)
+            parsed = _to_date(match.group(3), _month_number(match.group(1)), match.group(2)) if match else None
+
+    return parsed.isoformat() if parsed else None
+
+
+def _expand(start: date, end: Optional[date]):
+    if end is None or end <= start:
+        return [start]
+    if (end - start).days >= MAX_RANGE_DAYS:
+        return [start]
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+@lru_cache(maxsize=4096)
+def extract_dates(text: str, default_year: int) -> Tuple[str, ...]:
+    """Every date in free text as YYYY-MM-DD, expanding ranges like "March 15–17" into each day.
+
+    Dates without a year use default_year (or the year given at the end of
+    the range, e.g. "Dec 30 - Jan 2, 2031"). A yearless range that crosses
+    New Year starts in default_year and ends in the next.
+    """
+    dates = []
+    for match in _DATES_IN_TEXT.finditer(text or ''):
+        if match.group('numeric_start'):
+            start = _numeric(match.group('numeric_start'))
+            end = _numeric(match.group('numeric_end')) if match.group('numeric_end') else None
+        else:
+            month1 = _month_number(match.group('month1'))
+            month2 = _month_number(match.group('month2')) if match.group('month2') else month1
+            # A range whose end month comes before its start crosses New Year
+            wraps = month1 > month2
+            if match.group('year2'):
+                end_year = int(match.group('year2'))
+                start_year = int(match.group('year1') or end_year - wraps)
+            else:
+                start_year = int(match.group('year1') or default_year)
+                end_year = start_year + wraps
+            start = _to_date(start_year, month1, match.group('day1'))
+            end = _to_date(end_year, month2, match.group('day2')) if match.group('day2') else None
+        if start is None:
+            continue
+        for day in _expand(start, end):
+            iso = day.isoformat()
+            if iso not in dates:
+                dates.append(iso)
+    return tuple(dates)
@@ -0,0 +1,286 @@
+"""Cross-source duplicate detection for scraped events.
+
+The same concert listed by two sources becomes two rows with different
+(source, source_id) keys. DedupIndex links the later one to the earlier
+one through events.canonical_event_id:
+
+- blocking: each event's title is reduced to a MinHash signature whose LSH
+  bands are stored in event_dedup_bands with the event's date, so the
+  candidates for an event are only other sources' events sharing a band
+  within DATE_WINDOW_DAYS. Every lookup is a handful of index probes, which
+  keeps indexing near-linear in the number of events;
+- matching: a candidate is a duplicate when the titles' trigram Jaccard
+  similarity reaches TITLE_THRESHOLD, the listings are the same occurrence
+  (same date with times within an hour or one unknown, or, across midnight,
+  both times known and within an hour) and the venues agree by name or
+  street address (or one is unknown). A cluster holds at most one event per
+  source, so a nightly show's runs are never merged into one.
+
+Usage: python -m scrapers.dedup [--db PATH]   (rebuilds the index for all events)
+"""
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+import argparse
+import hashlib
+import logging
+import re
+import sqlite3
+import struct
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# 10 bands of 3 rows: titles with a similarity of 0.65 share a band 96% of the
+# time, 0.3 in 24% and unrelated titles (0.15) in 3% of cases
+NUM_PERM = 30
+BANDS = 10
+ROWS = NUM_PERM // BANDS
+DATE_WINDOW_DAYS = 1
+TITLE_THRESHOLD = 0.6
+TIME_TOLERANCE_MINUTES = 60
+
+# NUM_PERM 32-bit hashes per shingle, cut from one SHAKE-128 digest. Band keys
+# are stored, so this must never change
+_SIGNATURE = struct.Struct(f'<{NUM_PERM}I')
+
+_WORD = re.compile(r'[a-z0-9]+')
+_TIME = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m?\b|\b(\d{1,2}):(\d{2})\b', re.I)
+_ADDRESS = re.compile(r'\b(\d{1,6})\s+([a-z]+)')
+_TITLE_STOPWORDS = {'the', 'a', 'an', 'and', 'at', 'with', 'live', 'presents', 'feat', 'featuring', 'w'}
+_VENUE_STOPWORDS = {'the', 'and', 'cafe', 'center', 'centre', 'theater', 'theatre', 'hall',
+                    'bar', 'club', 'arts', 'room', 'venue', 'boulder', 'co'}
+
+CANDIDATES_SQL = """
+    SELECT DISTINCT e.id, e.title, e.date, e.time, e.location, e.canonical_event_id
+    FROM event_dedup_bands b
+    JOIN events e ON e.id = b.event_id
+    WHERE b.band IN ({bands})
+    AND b.date BETWEEN ? AND ?
+    AND b.event_id != ?
+    AND e.source IS NOT ?
+    AND e.withdrawn_at IS NULL
+""".format(bands=', '.join('?' * BANDS))
+
+# Whether a cluster (its canonical event and the events linked to it) already
+# has another event from a source. The unary + keeps the planner off the
+# (source, source_id) index, which would walk every event of the source
+CLUSTER_HAS_SOURCE_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM events WHERE id = ? AND +source IS ? AND id != ?
+        UNION ALL
+        SELECT 1 FROM events WHERE canonical_event_id = ? AND +source IS ? AND id != ?
+    )
+"""
+
+
+def _words(text: str) -> List[str]:
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii')
+    return _WORD.findall(text.lower())
+
+
+def normalize_title(title: str) -> str:
+    return ' '.join(word for word in _words(title) if word not in _TITLE_STOPWORDS)
+
+
+def shingles(normalized_title: str) -> Set[str]:
+    """Character trigrams, which tolerate typos and small wording changes."""
+    text = f' {normalized_title} '
+    return {text[i:i + 3] for i in range(len(text) - 2)} if normalized_title else set()
+
+
+def title_similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(shingle_set: Set[str]) -> Tuple[int, ...]:
+    """Per hash function, the minimum over the shingles (all computed in C)."""
+    hashes = (
+        _SIGNATURE.unpack(hashlib.shake_128(shingle.encode('utf-8')).digest(_SIGNATURE.size))
+        for shingle in shingle_set
+    )
+    return tuple(map(min, zip(*hashes)))
+
+
+def band_keys(signature: Tuple[int, ...]) -> List[int]:
+    """One signed 64-bit key per LSH band (SQLite INTEGER range)."""
+    keys = []
+    for band in range(BANDS):
+        rows = struct.pack(f'>I{ROWS}I', band, *signature[band * ROWS:(band + 1) * ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'big', signed=True))
+    return keys
+
+
+def parse_minutes(time_text: str) -> Optional[int]:
+    """Minutes after midnight of the first time in the text, e.g. '7:30 PM' or '19:30'."""
+    match = _TIME.search(time_text or '')
+    if not match:
+        return None
+    if match.group(1):
+        hour, minute = int(match.group(1)) % 12, int(match.group(2) or 0)
+        if match.group(3).lower() == 'p':
+            hour += 12
+    else:
+        hour, minute = int(match.group(4)), int(match.group(5))
+    return hour * 60 + minute if hour < 24 and minute < 60 else None
+
+
+def same_occurrence(date_a: str, time_a: str, date_b: str, time_b: str) -> bool:
+    """Whether two listings' dates and times can be the same showing.
+
+    Different dates only match with both times known, within
+    TIME_TOLERANCE_MINUTES of each other across midnight.
+    """
+    first, second = parse_minutes(time_a), parse_minutes(time_b)
+    days = (date.fromisoformat(date_b) - date.fromisoformat(date_a)).days
+    if first is None or second is None:
+        return days == 0
+    return abs(days * 24 * 60 + second - first) <= TIME_TOLERANCE_MINUTES
+
+
+def _venue(location: str):
+    """(significant venue-name words, street address) of a location string."""
+    words = _words(location)
+    name = _words((location or '').split(',')[0])
+    address = _ADDRESS.search(' '.join(words))
+    return (
+        {word for word in name if len(word) > 2 and word not in _VENUE_STOPWORDS},
+        address.groups() if address else None
+    )
+
+
+def venues_match(a: str, b: str) -> bool:
+    if not a or not b:
+        return True
+    (name_a, address_a), (name_b, address_b) = _venue(a), _venue(b)
+    if address_a and address_b and address_a == address_b:
+        return True
+    if name_a and name_b:
+        return bool(name_a & name_b)
+    return not (address_a and address_b)
+
+
+def _date_window(event_date: str) -> Tuple[str, str]:
+    day = date.fromisoformat(event_date)
+    window = timedelta(days=DATE_WINDOW_DAYS)
+    return (day - window).isoformat(), (day + window).isoformat()
+
+
+class DedupIndex:
+    """Maintains event_dedup_bands and events.canonical_event_id on a connection.
+
+    The caller owns the transaction: index_events() only executes
+    statements, so it can run inside the one that stored the events.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def index_events(self, event_ids: Iterable[int]) -> int:
+        """(Re)index these events and link each to its best cross-source match.
+
+        Returns the number of events linked to a canonical event.
+        """
+        event_ids = list(event_ids)
+        if not event_ids:
+            return 0
+        cursor = self.conn.cursor()
+        cursor.executemany("DELETE FROM event_dedup_bands WHERE event_id = ?", [(event_id,) for event_id in event_ids])
+
+        linked = 0
+        for start in range(0, len(event_ids), 500):
+            chunk = event_ids[start:start + 500]
+            rows = cursor.execute(f"""
+                SELECT id, title, date, time, location, source
+                FROM events WHERE id IN ({', '.join('?' * len(chunk))})
+                ORDER BY id
+            """, chunk).fetchall()
+            for row in rows:
+                if self._index_event(cursor, *row):
+                    linked += 1
+        return linked
+
+    def _index_event(self, cursor, event_id, title, event_date, event_time, location, source) -> bool:
+        try:
+            window = _date_window(event_date)
+        except (TypeError, ValueError):
+            return False
+        normalized = shingles(normalize_title(title))
+        if not normalized:
+            return False
+        bands = band_keys(minhash(normalized))
+
+        matches = []
+        for candidate in cursor.execute(CANDIDATES_SQL, (*bands, *window, event_id, source)).fetchall():
+            (candidate_id, candidate_title, candidate_date, candidate_time,
+             candidate_location, candidate_canonical) = candidate
+            score = title_similarity(normalized, shingles(normalize_title(candidate_title)))
+            if (score >= TITLE_THRESHOLD and same_occurrence(event_date, event_time, candidate_date, candidate_time)
+                    and venues_match(location, candidate_location)):
+                matches.append((score, candidate_canonical or candidate_id))
+
+        # The best match whose cluster has no other event from this source
+        best = None
+        for _, canonical in sorted(matches, reverse=True):
+            if canonical == event_id or not cursor.execute(
+                    CLUSTER_HAS_SOURCE_SQL, (canonical, source, event_id) * 2).fetchone()[0]:
+                best = canonical
+                break
+
+        cursor.executemany(
+            "INSERT OR IGNORE INTO event_dedup_bands (band, date, event_id) VALUES (?, ?, ?)",
+            [(band, event_date, event_id) for band in bands]
+        )
+        if best is None or best == event_id:
+            cursor.execute("UPDATE events SET canonical_event_id = NULL WHERE id = ? AND canonical_event_id IS NOT NULL",
+                           (event_id,))
+            return False
+        cursor.execute("UPDATE events SET canonical_event_id = ? WHERE id = ?", (best, event_id))
+        # Keep clusters one level deep, moving this event's own duplicates
+        # over unless that would give best's cluster a second event from a source
+        cursor.execute("""
+            UPDATE events SET canonical_event_id = ?
+            WHERE canonical_event_id = ?
+            AND source NOT IN (SELECT source FROM events WHERE (id = ? OR canonical_event_id = ?) AND source IS NOT NULL)
+        """, (best, event_id, best, best))
+        cursor.execute("UPDATE events SET canonical_event_id = NULL WHERE canonical_event_id = ?", (event_id,))
+        return True
+
+    def rebuild(self, batch_size: int = 5000) -> int:
+        """Reindex every scraped event in id order, committing per batch."""
+        self.conn.execute("DELETE FROM event_dedup_bands")
+        self.conn.execute("UPDATE events SET canonical_event_id = NULL WHERE canonical_event_id IS NOT NULL")
+        self.conn.commit()
+        linked, last_id = 0, 0
+        while True:
+            ids = [row[0] for row in self.conn.execute(
+                "SELECT id FROM events WHERE id > ? AND source_id IS NOT NULL ORDER BY id LIMIT ?",
+                (last_id, batch_size)
+            )]
+            if not ids:
+                return linked
+            linked += self.index_events(ids)
+            self.conn.commit()
+            last_id = ids[-1]
+
+
+def main():
+    from migrations import DEFAULT_DB_PATH, migrate
+
+    parser = argparse.ArgumentParser(description='Rebuild the cross-source duplicate index.')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    migrate(args.db)
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        linked = DedupIndex(conn).rebuild()
+    finally:
+        conn.close()
+    logger.info(f"Linked {linked} duplicate events")
+
+
+if __name__ == '__main__':
+    main()
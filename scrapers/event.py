@@ -0,0 +1,54 @@
+"""The Event record passed from the scrapers to the database."""
+from typing import NamedTuple, Optional
+import hashlib
+import re
+
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+class Event(NamedTuple):
+    """One scraped event, immutable and in `events` column order.
+
+    A NamedTuple has no per-instance __dict__, pickles compactly out of the
+    parse workers and is already the INSERT parameter tuple. Build one with
+    Event.create(), which validates it.
+    """
+    title: str
+    date: str
+    time: str
+    location: str
+    description: str
+    url: str
+    needs_review: bool
+    source: str
+    source_id: str
+
+    @classmethod
+    def create(cls, title: str, date: str, source: str, time: str = '', location: str = '',
+               description: str = '', url: str = '', needs_review: bool = False,
+               source_id: Optional[str] = None) -> 'Event':
+        """Validate and build an Event; raises ValueError without a title or a YYYY-MM-DD date.
+
+        Events without a source_id get a stable one derived from title and date.
+        """
+        if not title:
+            raise ValueError('Event needs a title')
+        if not date or not _ISO_DATE.fullmatch(date):
+            raise ValueError(f'Event date must be YYYY-MM-DD, got {date!r}')
+        if not source_id:
+            key = f"{title}|{date}".encode('utf-8')
+            source_id = f"auto:{hashlib.sha1(key).hexdigest()[:16]}"
+        return cls(title, date, time or '', location or '', description or '',
+                   url or '', bool(needs_review), source, str(source_id))
+
+    def content_hash(self) -> str:
+        """Digest of everything a source can change, for cheap change detection."""
+        content = '\x1f'.join((
+            self.title, self.date, self.time, self.location,
+            self.description, self.url, '1' if self.needs_review else '0'
+        ))
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    def to_params(self) -> tuple:
+        """Parameters for INSERT ... (title, ..., source_id, content_hash)."""
+        return (*self, self.content_hash())
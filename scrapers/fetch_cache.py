@@ -0,0 +1,60 @@
+from typing import Dict, Optional
+import hashlib
+import sqlite3
+
+
+class PageUnchanged(Exception):
+    """Raised by a fetch when the page is the same as on the last successful run."""
+
+    def __init__(self, url: str):
+        super().__init__(f"{url} is unchanged since the last run")
+        self.url = url
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class FetchCache:
+    """Persistent per-URL validators (ETag, Last-Modified, body hash).
+
+    Scrapers read validators to make conditional requests. New validators are
+    only saved once the manager has stored the page's events, so a run that
+    fails after fetching never causes the next run to skip the page.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def get(self, url: str) -> Optional[Dict]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute(
+                'SELECT etag, last_modified, body_hash FROM fetch_cache WHERE url = ?', (url,)
+            ).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def save(self, validators: Dict[str, Dict]) -> None:
+        """Store validators keyed by URL, as collected by BaseScraper.fetched_validators."""
+        if not validators:
+            return
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.executemany('''
+                INSERT INTO fetch_cache (url, etag, last_modified, body_hash, fetched_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body_hash = excluded.body_hash,
+                    fetched_at = excluded.fetched_at
+            ''', [
+                (url, entry.get('etag'), entry.get('last_modified'), entry['body_hash'])
+                for url, entry in validators.items()
+            ])
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,197 @@
+"""Politeness and failure handling for scraper fetches.
+
+- FetchPolicy keeps a token bucket per host, so concurrent sources and pages
+  never hit one site faster than `rate` requests a second after a short
+  burst. It also gives the delays for bounded retries: full-jitter
+  exponential backoff for connection errors, timeouts and 429/5xx
+  responses, honouring Retry-After;
+- CircuitBreaker keeps per-source state in the source_circuits table. After
+  failure_threshold consecutive failed runs a source is skipped until its
+  cool-down ends. The next run is a trial that closes the circuit on
+  success or reopens it for twice as long.
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+
+# Responses worth another attempt; anything else fails the fetch at once
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Same format and timezone (UTC) as SQLite's CURRENT_TIMESTAMP
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class SourceUnavailable(Exception):
+    """Raised for a run in which none of a source's pages could be fetched."""
+
+
+class CircuitOpen(Exception):
+    """Raised instead of running a source whose circuit is open."""
+
+    def __init__(self, source: str, circuit: Dict):
+        super().__init__(f"{source} is skipped until {circuit['open_until']} after "
+                         f"{circuit['failures']} failed runs: {circuit['last_error']}")
+        self.circuit = circuit
+
+
+class FetchFailed(Exception):
+    """Raised by one fetch attempt for a response, saying whether another attempt is worthwhile."""
+
+    def __init__(self, error: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(error)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions a second on average, and bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # Job worker threads each run their own event loop against the shared buckets
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it.
+
+        Tokens can go negative, so concurrent callers queue up behind each other.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+
+class FetchPolicy:
+    """Process-wide per-host rate limits and retry timing for BaseScraper's fetches."""
+
+    def __init__(self, rate: float = 1.0, burst: int = 3, max_retries: int = 2,
+                 backoff_base: float = 1.0, backoff_cap: float = 30.0):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    async def throttle(self, url: str) -> None:
+        """Wait for the URL's host to have a request to spare."""
+        if self.rate <= 0:
+            return
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        delay = bucket.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number attempt + 1."""
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def retry_after(headers) -> Optional[float]:
+        """A Retry-After header in seconds, given as either seconds or an HTTP date."""
+        value = headers.get('Retry-After') if headers else None
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """Per-source circuit state, persisted so it holds across runs and processes."""
+
+    def __init__(self, db_path: str, failure_threshold: int = 3, cool_down: float = 30 * 60,
+                 max_cool_down: float = 12 * 60 * 60):
+        self.db_path = db_path
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.max_cool_down = max_cool_down
+
+    def _load(self, conn, source: str) -> Dict:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute('SELECT * FROM source_circuits WHERE source = ?', (source,)).fetchone()
+        if row is None:
+            return {'state': 'closed', 'failures': 0, 'cool_down': None, 'open_until': None, 'last_error': None}
+        return {key: row[key] for key in ('state', 'failures', 'cool_down', 'open_until', 'last_error')}
+
+    def check(self, source: str) -> Dict:
+        """The source's circuit; 'open' means skip it, 'half_open' that this run is the trial."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            circuit = self._load(conn, source)
+        finally:
+            conn.close()
+        if circuit['state'] == 'open' and circuit['open_until'] <= _utcnow().strftime(TIMESTAMP_FORMAT):
+            circuit['state'] = 'half_open'
+        return circuit
+
+    def record(self, source: str, success: bool, error: Optional[str] = None) -> Dict:
+        """Update the circuit with a run's outcome and return its new state."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            circuit = self._load(conn, source)
+            if success:
+                circuit.update(state='closed', failures=0, cool_down=None, open_until=None, last_error=None)
+            else:
+                circuit['failures'] += 1
+                circuit['last_error'] = error
+                if circuit['state'] == 'open' or circuit['failures'] >= self.failure_threshold:
+                    # A failed trial (the stored state is still 'open') doubles the cool-down
+                    cool_down = (min(circuit['cool_down'] * 2, self.max_cool_down)
+                                 if circuit['state'] == 'open' and circuit['cool_down'] else self.cool_down)
+                    circuit.update(
+                        state='open', cool_down=cool_down,
+                        open_until=(_utcnow() + timedelta(seconds=cool_down)).strftime(TIMESTAMP_FORMAT)
+                    )
+            with conn:
+                conn.execute('''
+                    INSERT INTO source_circuits (source, state, failures, cool_down, open_until, last_error, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(source) DO UPDATE SET
+                        state = excluded.state,
+                        failures = excluded.failures,
+                        cool_down = excluded.cool_down,
+                        open_until = excluded.open_until,
+                        last_error = excluded.last_error,
+                        updated_at = excluded.updated_at
+                ''', (source, circuit['state'], circuit['failures'], circuit['cool_down'],
+                      circuit['open_until'], circuit['last_error']))
+        finally:
+            conn.close()
+        return circuit
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+fetch_policy = FetchPolicy(
+    rate=float(os.environ.get('SCRAPER_HOST_RATE', 1.0)),
+    burst=int(os.environ.get('SCRAPER_HOST_BURST', 3)),
+    max_retries=int(os.environ.get('SCRAPER_FETCH_RETRIES', 2)),
+)
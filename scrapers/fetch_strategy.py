@@ -0,0 +1,72 @@
+from typing import Dict
+import sqlite3
+
+PATHS = ('http', 'browser')
+
+
+class FetchStrategies:
+    """Persistent per-host choice between a plain HTTP fetch and the headless browser.
+
+    BaseScraper.fetch_listing tries the host's preferred path first and
+    reports what each path it tried produced: 'ok' (the page had event
+    nodes), 'empty' (it loaded without them, e.g. rendered by JavaScript) or
+    'failed'. A host moves to the browser once HTTP stops producing event
+    nodes where the browser does, and back as soon as HTTP works again.
+    Browser hosts are re-probed over HTTP every probe_every fetches, since
+    HTTP is much cheaper.
+    """
+
+    def __init__(self, db_path: str, probe_every: int = 20):
+        self.db_path = db_path
+        self.probe_every = probe_every
+
+    def get(self, host: str, default: str = 'http') -> Dict:
+        """The host's preferred path, and whether this fetch should re-probe HTTP first."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            row = conn.execute(
+                'SELECT preferred, fetches_since_probe FROM fetch_strategies WHERE host = ?', (host,)
+            ).fetchone()
+        finally:
+            conn.close()
+        preferred, since_probe = row if row else (default, 0)
+        return {'preferred': preferred, 'probe': preferred == 'browser' and since_probe >= self.probe_every}
+
+    def record(self, host: str, default: str, outcomes: Dict[str, str]) -> str:
+        """Save the outcome of each path tried for one fetch and return the host's preferred path."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            row = conn.execute('SELECT preferred FROM fetch_strategies WHERE host = ?', (host,)).fetchone()
+            preferred = row[0] if row else default
+            if outcomes.get('http') == 'ok':
+                preferred = 'http'
+            elif outcomes.get('browser') == 'ok' and 'http' in outcomes:
+                preferred = 'browser'
+            # HTTP tried on a browser host is the re-probe
+            probed = 'http' in outcomes and (row[0] if row else default) == 'browser'
+
+            counts = {
+                f'{path}_{"ok" if outcomes.get(path) == "ok" else "failed"}': 1
+                for path in PATHS if path in outcomes
+            }
+            with conn:
+                conn.execute('''
+                    INSERT INTO fetch_strategies (host, preferred) VALUES (?, ?)
+                    ON CONFLICT(host) DO UPDATE SET preferred = excluded.preferred
+                ''', (host, preferred))
+                conn.execute('''
+                    UPDATE fetch_strategies SET
+                        http_ok = http_ok + ?, http_failed = http_failed + ?,
+                        browser_ok = browser_ok + ?, browser_failed = browser_failed + ?,
+                        fetches_since_probe = CASE WHEN ? THEN 0 ELSE fetches_since_probe + 1 END,
+                        last_probe_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE last_probe_at END,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE host = ?
+                ''', (
+                    counts.get('http_ok', 0), counts.get('http_failed', 0),
+                    counts.get('browser_ok', 0), counts.get('browser_failed', 0),
+                    probed, probed, host
+                ))
+        finally:
+            conn.close()
+        return preferred
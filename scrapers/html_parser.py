@@ -0,0 +1,109 @@
+"""HTML parser backends for the scrapers.
+
+Scrapers only read a handful of event containers out of each page, so
+parse_containers() builds a BeautifulSoup tree of just those containers:
+
+- 'lxml' / 'html.parser': a SoupStrainer limits the tree to the matching
+  tags while the document is parsed;
+- 'selectolax': its C parser finds the containers and only their HTML is
+  handed to BeautifulSoup.
+
+The default is lxml when installed, then selectolax, then html.parser.
+SCRAPER_HTML_PARSER ('lxml', 'selectolax' or 'html.parser') forces one.
+"""
+from functools import lru_cache
+from typing import Optional
+import logging
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+
+def _choose_backend(requested: Optional[str]) -> str:
+    # lxml + SoupStrainer is the best all-round default; selectolax finds
+    # containers faster but holds the whole parsed document in memory
+    available = ['html.parser']
+    if LexborHTMLParser is not None:
+        available.insert(0, 'selectolax')
+    if lxml is not None:
+        available.insert(0, 'lxml')
+    if requested:
+        if requested in available:
+            return requested
+        logger.warning(f"HTML parser {requested!r} is not installed; using {available[0]}")
+    return available[0]
+
+
+BACKEND = _choose_backend(os.environ.get('SCRAPER_HTML_PARSER'))
+# selectolax only pre-filters; BeautifulSoup still builds the tree
+TREE_BUILDER = 'lxml' if lxml is not None and BACKEND != 'html.parser' else 'html.parser'
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse a whole document with the fastest available tree builder."""
+    return BeautifulSoup(html, TREE_BUILDER)
+
+
+def strainer_for(selector: str) -> SoupStrainer:
+    """SoupStrainer for a simple 'tag.class' (or 'tag' / '.class') selector."""
+    tag, _, css_class = selector.partition('.')
+    if not css_class:
+        return SoupStrainer(tag)
+
+    # While straining, class is still the raw attribute string, so class_=
+    # would only match elements with exactly that one class
+    def has_class(value):
+        return bool(value) and css_class in (value.split() if isinstance(value, str) else value)
+
+    return SoupStrainer(tag or None, attrs={'class': has_class})
+
+
+@lru_cache(maxsize=64)
+def _container_pattern(selector: str):
+    tag, _, css_class = selector.partition('.')
+    tag_pattern = re.escape(tag) if tag else r'[a-zA-Z][\w-]*'
+    if not css_class:
+        return re.compile(rf'<{tag_pattern}[\s/>]', re.I)
+    return re.compile(
+        rf'<{tag_pattern}\s[^>]*?\bclass\s*=\s*["\']?[^"\'>]*(?<![\w-]){re.escape(css_class)}(?![\w-])', re.I
+    )
+
+
+def has_containers(html: str, selector: str) -> bool:
+    """Whether the page has an element matching a simple 'tag.class' selector, without parsing it."""
+    return bool(html) and _container_pattern(selector).search(html) is not None
+
+
+def parse_containers(html: str, selector: str, backend: Optional[str] = None) -> BeautifulSoup:
+    """Parse only the elements matching `selector` (a simple 'tag.class') and their contents.
+
+    Nested matches are kept once, inside their outermost container, so
+    find_all() on the result sees the same elements as on the full page.
+    """
+    backend = backend or BACKEND
+    if backend == 'selectolax':
+        nodes = LexborHTMLParser(html).css(selector)
+        matched = {node.mem_id for node in nodes}
+        outermost = []
+        for node in nodes:
+            parent = node.parent
+            while parent is not None and parent.mem_id not in matched:
+                parent = parent.parent
+            if parent is None:
+                outermost.append(node.html)
+        return BeautifulSoup(''.join(outermost), TREE_BUILDER)
+    tree_builder = backend if backend in ('lxml', 'html.parser') else TREE_BUILDER
+    return BeautifulSoup(html, tree_builder, parse_only=strainer_for(selector))
@@ -0,0 +1,70 @@
+from typing import Dict
+import asyncio
+import os
+import threading
+
+import aiohttp
+
+from .browser_pool import USER_AGENT
+
+try:
+    import brotli  # noqa: F401  aiohttp decodes br responses when this is installed
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class HttpClient:
+    """Process-wide aiohttp session shared by every scraper fetch.
+
+    Keeps keep-alive connections, TLS sessions and a TTL DNS cache across
+    fetches, with a per-host connection cap so one source can't hog the pool.
+    Like the browser pool, a session belongs to the event loop that created
+    it, so each loop that fetches (job workers and scheduler jobs run their
+    own) gets its own session; close() closes the calling loop's.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 4, dns_ttl: int = 300,
+                 total_timeout: float = 30.0, connect_timeout: float = 10.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.total_timeout = total_timeout
+        self.connect_timeout = connect_timeout
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+
+    async def session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is not None and not session.closed:
+                return session
+            # Loops that ended without close(); their connections went with them
+            for closed in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[closed]
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+            )
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.total_timeout, sock_connect=self.connect_timeout),
+                headers={'User-Agent': USER_AGENT, 'Accept-Encoding': ACCEPT_ENCODING},
+            )
+            return session
+
+    async def close(self) -> None:
+        """Close the running loop's session."""
+        with self._lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+http_client = HttpClient(
+    limit_per_host=int(os.environ.get('SCRAPER_HTTP_LIMIT_PER_HOST', 4)),
+    total_timeout=float(os.environ.get('SCRAPER_HTTP_TIMEOUT', 30)),
+)
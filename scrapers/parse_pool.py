@@ -0,0 +1,77 @@
+"""Worker processes for CPU-bound HTML parsing.
+
+Scrapers fetch pages on the event loop and hand the raw HTML to a parse job
+here. BeautifulSoup parsing and extraction run in another process and come
+back as plain records, so one source's parsing never stalls the fetches of
+the sources running alongside it.
+
+A parse job is any picklable callable (a module-level function or a
+scraper classmethod) taking the HTML and returning lists/dicts/strings.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker(log_level: int) -> None:
+    # Workers log to stderr at the same level as the process that started them
+    logging.basicConfig(level=log_level)
+
+
+class ParsePool:
+    """Process-wide pool of parse workers, started on first use.
+
+    Unlike the HTTP session and browser pool it isn't tied to an event loop,
+    so it stays warm across scraper runs. With max_workers=0, jobs run on a
+    thread instead, which keeps the loop free but shares the GIL.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # forkserver/spawn rather than fork: the app process has threads running
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(logging.getLogger().getEffectiveLevel(),),
+                )
+            return self._executor
+
+    async def run(self, parse_job: Callable[..., Any], *args) -> Any:
+        """Run parse_job(*args) in a worker and return its result."""
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(parse_job, *args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), parse_job, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool and retry once
+            logger.warning("Parse worker pool broke; restarting it")
+            self.shutdown()
+            return await loop.run_in_executor(self._get_executor(), parse_job, *args)
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+parse_pool = ParsePool(
+    max_workers=int(os.environ['SCRAPER_PARSE_WORKERS']) if 'SCRAPER_PARSE_WORKERS' in os.environ else None
+)
@@ -0,0 +1,75 @@
+"""Logging for the scrapers' hot paths.
+
+Per-event records (raw and formatted events) go to a per-source DEBUG
+logger, 'scrapers.events.<source>', and are off by default. Turn them on
+for some sources with SCRAPER_DEBUG_SOURCES (comma-separated source
+names, or '*'), or by setting that logger to DEBUG. SCRAPER_LOG_SAMPLE_RATE
+(0-1, default 1) then keeps only a fraction of events; an event is either
+sampled for all its records or for none.
+
+Each source run ends with one INFO record on 'scrapers.summary' whose
+fields are also attached to the record as `scrape_summary`.
+"""
+from typing import Optional
+import logging
+import os
+import random
+import re
+import zlib
+
+EVENT_LOGGER = 'scrapers.events'
+SUMMARY_LOGGER = 'scrapers.summary'
+
+DEBUG_SOURCES = {
+    name.strip().lower()
+    for name in os.environ.get('SCRAPER_DEBUG_SOURCES', '').split(',')
+    if name.strip()
+}
+SAMPLE_RATE = min(1.0, max(0.0, float(os.environ.get('SCRAPER_LOG_SAMPLE_RATE', '1'))))
+
+summary_logger = logging.getLogger(SUMMARY_LOGGER)
+
+
+def _logger_name(source_name: str) -> str:
+    return f"{EVENT_LOGGER}.{re.sub(r'[^a-z0-9]+', '_', source_name.lower()).strip('_')}"
+
+
+class EventLog:
+    """Per-event debug records for one source, gated and sampled before any formatting."""
+
+    def __init__(self, source_name: str, sample_rate: float = SAMPLE_RATE):
+        self.logger = logging.getLogger(_logger_name(source_name))
+        if '*' in DEBUG_SOURCES or source_name.lower() in DEBUG_SOURCES:
+            self.logger.setLevel(logging.DEBUG)
+        self.enabled = self.logger.isEnabledFor(logging.DEBUG)
+        self.sample_rate = sample_rate
+
+    def _sampled(self, key: Optional[str]) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        if key is None:
+            return random.random() < self.sample_rate
+        # Stable per event, so its raw and formatted records are kept together
+        return zlib.crc32(key.encode('utf-8')) % 10000 < self.sample_rate * 10000
+
+    def debug(self, msg: str, *args) -> None:
+        """An unsampled per-parse record, e.g. how many containers were found."""
+        if self.enabled:
+            self.logger.debug(msg, *args)
+
+    def event(self, msg: str, *args, key: Optional[str] = None) -> None:
+        """A per-event record; `key` (e.g. the source_id) makes sampling stable for that event."""
+        if self.enabled and self._sampled(key):
+            self.logger.debug(msg, *args)
+
+
+def log_run_summary(source_name: str, result: dict) -> None:
+    """One structured INFO record for a finished source run."""
+    if not summary_logger.isEnabledFor(logging.INFO):
+        return
+    fields = {'source': source_name, **result}
+    summary_logger.info(
+        'scrape summary %s',
+        ' '.join(f'{key}={value}' for key, value in fields.items() if value is not None),
+        extra={'scrape_summary': fields}
+    )
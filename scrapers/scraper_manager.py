@@ -1,112 +1,399 @@
 import sqlite3
 import logging
 import asyncio
-from typing import List, Dict
+import json
+import time
+from datetime import date
+from typing import Callable, Iterable, List, Dict, Optional, Sequence, Type
+from .base_scraper import BaseScraper, close_shared_clients
+from .fetch_cache import FetchCache, PageUnchanged
+from .fetch_policy import CircuitBreaker, CircuitOpen, SourceUnavailable
+from .fetch_strategy import FetchStrategies
+from .event import Event
+from .dedup import DedupIndex
+from .scrape_logging import log_run_summary
 from .trident_scraper import TridentScraper
 from .dairy_scraper import DairyScraper
+
+# Put on a source's event queue after its last event
+_END_OF_EVENTS = object()
+
+# Staged events that are new, differ from the stored row with the same
+# (source, source_id) or are listed again after being withdrawn
+_STAGED_CHANGED_ROWS = """
+        FROM temp.staged_events s
+        LEFT JOIN events e ON e.source = s.source AND e.source_id = s.source_id
+        WHERE e.id IS NULL OR e.content_hash IS NOT s.content_hash OR e.withdrawn_at IS NOT NULL
+"""
+
+
 class ScraperManager:
-    def __init__(self, db_path: str):
+    # Scrapers run by default, in registration order
+    SCRAPER_CLASSES = (TridentScraper, DairyScraper)
+
+    STAGING_TABLE_SQL = """
+        CREATE TEMP TABLE IF NOT EXISTS staged_events (
+            title TEXT NOT NULL,
+            date TEXT NOT NULL,
+            time TEXT,
+            location TEXT,
+            description TEXT,
+            url TEXT,
+            needs_review BOOLEAN,
+            source TEXT NOT NULL,
+            source_id TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            PRIMARY KEY (source, source_id)
+        )
+    """
+
+    STAGED_CHANGES_SQL = """
+        SELECT s.date, e.date, e.id, s.source, s.source_id
+    """ + _STAGED_CHANGED_ROWS
+
+    UPSERT_STAGED_SQL = """
+        INSERT INTO events (
+            title, date, time, location, description,
+            url, needs_review, source, source_id, content_hash, last_changed_run_id
+        )
+        SELECT s.title, s.date, s.time, s.location, s.description,
+               s.url, s.needs_review, s.source, s.source_id, s.content_hash, ?
+    """ + _STAGED_CHANGED_ROWS + """
+        ON CONFLICT(source, source_id) DO UPDATE SET
+            title = excluded.title,
+            date = excluded.date,
+            time = excluded.time,
+            location = excluded.location,
+            description = excluded.description,
+            url = excluded.url,
+            needs_review = excluded.needs_review,
+            content_hash = excluded.content_hash,
+            last_changed_run_id = excluded.last_changed_run_id,
+            withdrawn_at = NULL
+        RETURNING id, source, source_id
+    """
+
+    SEEN_TABLE_SQL = """
+        CREATE TEMP TABLE IF NOT EXISTS seen_source_ids (
+            source_id TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+    """
+
+    # A source's live upcoming events that its latest complete scrape did not list
+    MISSING_EVENTS_SQL = """
+        SELECT id, date FROM events
+        WHERE source = ? AND date > ? AND withdrawn_at IS NULL AND source_id IS NOT NULL
+        AND source_id NOT IN (SELECT source_id FROM temp.seen_source_ids)
+    """
+
+    LIVE_EVENT_COUNT_SQL = """
+        SELECT COUNT(*) FROM events
+        WHERE source = ? AND date > ? AND withdrawn_at IS NULL AND source_id IS NOT NULL
+    """
+
+    @classmethod
+    def scrapers_by_source(cls, scraper_classes: Optional[Sequence[Type[BaseScraper]]] = None
+                           ) -> Dict[str, Type[BaseScraper]]:
+        """Map each scraper's source name to its class."""
+        return {
+            scraper_class().source_name: scraper_class
+            for scraper_class in scraper_classes or cls.SCRAPER_CLASSES
+        }
+
+    def __init__(self, db_path: str, on_dates_changed: Optional[Callable[[Iterable[str]], None]] = None,
+                 scraper_classes: Optional[Sequence[Type[BaseScraper]]] = None,
+                 max_concurrency: int = 4, source_timeout: float = 120.0, use_fetch_cache: bool = True,
+                 batch_size: int = 1000, batch_interval: float = 2.0, queue_size: int = 1000,
+                 dedup: bool = True, max_withdraw_fraction: float = 0.5, use_circuit_breaker: bool = True,
+                 use_fetch_strategies: bool = True):
         self.db_path = db_path
+        self.on_dates_changed = on_dates_changed
+        self.scraper_classes = tuple(scraper_classes or self.SCRAPER_CLASSES)
+        self.max_concurrency = max_concurrency
+        self.source_timeout = source_timeout
+        self.fetch_cache = FetchCache(db_path) if use_fetch_cache else None
+        # Which of HTTP and the browser produces each host's event listing
+        self.fetch_strategies = FetchStrategies(db_path) if use_fetch_strategies else None
+        # Skips sources that keep failing until their cool-down ends
+        self.circuit_breaker = CircuitBreaker(db_path) if use_circuit_breaker else None
+        # Streaming writes: events are stored in batches of batch_size, or every
+        # batch_interval seconds, and at most queue_size wait per source
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.queue_size = queue_size
+        # Link new and changed events to other sources' listings of the same event
+        self.dedup = dedup
+        # A complete scrape that would withdraw more than this share of a
+        # source's upcoming events is taken for a broken listing, not cancellations
+        self.max_withdraw_fraction = max_withdraw_fraction
         self.logger = logging.getLogger(__name__)
 
-    def run_scrapers(self) -> int:
-        """Run scrapers and store events in the database."""
-        return asyncio.run(self._run_scrapers_async())
+    def run_scrapers(self, should_cancel: Optional[Callable[[], bool]] = None) -> Dict[str, Dict]:
+        """Run scrapers and store events in the database.
+
+        If should_cancel is given it is polled while the scrapers run, and
+        sources that have not finished when it returns True are stopped.
+
+        Returns a summary per source: status ('ok', 'unchanged', 'timeout',
+        'cancelled', 'error' or 'circuit_open'), number of events stored (with
+        inserted/updated/unchanged counts), how many events were withdrawn,
+        the scrape_runs id holding the run's change set, the source's circuit
+        state, duration in seconds and any error message. 'unchanged' sources
+        were skipped without parsing or writes because their page matched the
+        last successful run; 'circuit_open' ones were skipped because their
+        recent runs failed.
+        """
+        return asyncio.run(self._run_scrapers_once(should_cancel))
+
+    async def _run_scrapers_once(self, should_cancel: Optional[Callable[[], bool]] = None) -> Dict[str, Dict]:
+        """Run scrapers on a short-lived event loop, closing the shared clients afterwards."""
+        try:
+            return await self._run_scrapers_async(should_cancel)
+        finally:
+            # The session and browser are bound to this loop, which asyncio.run is about to close
+            await close_shared_clients()
+
+    async def _run_scrapers_async(self, should_cancel: Optional[Callable[[], bool]] = None) -> Dict[str, Dict]:
+        """Run all scrapers concurrently, storing each source's events while it is scraped."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._run_source(scraper_class, semaphore))
+            for scraper_class in self.scraper_classes
+        ]
+        watcher = asyncio.create_task(self._watch_cancel(should_cancel, tasks)) if should_cancel else None
+        
+        summary = {}
+        try:
+            for finished in asyncio.as_completed(tasks):
+                source_name, result = await finished
+                summary[source_name] = result
+        finally:
+            if watcher:
+                watcher.cancel()
+        return summary
+
+    async def _watch_cancel(self, should_cancel: Callable[[], bool], tasks: List[asyncio.Task],
+                            interval: float = 0.5) -> None:
+        """Cancel the unfinished source tasks once should_cancel() returns True."""
+        while not all(task.done() for task in tasks):
+            if await asyncio.to_thread(should_cancel):
+                self.logger.info("Scrape cancelled; stopping unfinished sources")
+                for task in tasks:
+                    task.cancel()
+                return
+            await asyncio.sleep(interval)
 
-    async def _run_scrapers_async(self) -> int:
-        """Asynchronously run scrapers and store events."""
-        total_events = 0
+    async def _run_source(self, scraper_class: Type[BaseScraper], semaphore: asyncio.Semaphore):
+        """Scrape and store one source, bounded by the semaphore and the per-source timeout."""
+        started = time.monotonic()
+        scraper = scraper_class()
+        scraper.fetch_cache = self.fetch_cache
+        scraper.fetch_strategies = self.fetch_strategies
+        result = {'status': 'ok', 'events': 0, 'withdrawn': 0, 'duration': 0.0, 'error': None}
+        stored = {'events': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': 0}
+        run = {'id': None, 'seen': set(), 'complete': False,
+               'changes': {'inserted': [], 'updated': [], 'withdrawn': [], 'dates': set()}}
+        circuit = None
         
-        # Run Trident scraper
-        async with TridentScraper() as trident_scraper:
+        try:
+            if self.circuit_breaker:
+                circuit = await asyncio.to_thread(self.circuit_breaker.check, scraper.source_name)
+                if circuit['state'] == 'open':
+                    raise CircuitOpen(scraper.source_name, circuit)
+            async with semaphore:
+                started = time.monotonic()
+                run['id'] = await asyncio.to_thread(self._start_run, scraper.source_name)
+                async with scraper:
+                    await self._stream_events(scraper, stored, run)
+                if scraper.fetch_errors and not stored['events']:
+                    raise SourceUnavailable('; '.join(
+                        f"{url}: {error}" for url, error in scraper.fetch_errors.items()
+                    ))
+                # The whole listing was read, so anything it no longer has was withdrawn
+                if not scraper.fetch_errors:
+                    run['complete'] = await asyncio.to_thread(self._reconcile, scraper.source_name, run)
+                if self.fetch_cache:
+                    await asyncio.to_thread(self.fetch_cache.save, scraper.fetched_validators)
+        except PageUnchanged as e:
+            result['status'] = 'unchanged'
+            self.logger.info(f"Skipping {scraper.source_name}: {str(e)}")
+        except CircuitOpen as e:
+            result['status'] = 'circuit_open'
+            result['error'] = str(e)
+            self.logger.info(f"Skipping {scraper.source_name}: {str(e)}")
+        except asyncio.CancelledError:
+            # Cancelled by _watch_cancel; report it rather than failing the whole run
+            result['status'] = 'cancelled'
+            self.logger.info(f"{scraper.source_name} scraper cancelled")
+        except asyncio.TimeoutError:
+            result['status'] = 'timeout'
+            result['error'] = f"Timed out after {self.source_timeout}s"
+            self.logger.error(f"{scraper.source_name} scraper timed out after {self.source_timeout}s")
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = str(e)
+            self.logger.error(f"Error running {scraper.source_name} scraper: {str(e)}")
+            
+        # Includes events stored before a failure
+        if stored['events']:
+            result.update(stored)
+        result['withdrawn'] = len(run['changes']['withdrawn'])
+        if scraper.fetch_errors:
+            result['fetch_errors'] = len(scraper.fetch_errors)
+        result['duration'] = round(time.monotonic() - started, 3)
+        if self.circuit_breaker and result['status'] in ('ok', 'unchanged', 'error', 'timeout'):
             try:
-                events = await trident_scraper.scrape()
-                if events:
-                    self._store_events(events)
-                    total_events += len(events)
-                    self.logger.info(f"Successfully stored {len(events)} events from Trident")
+                circuit = await asyncio.to_thread(
+                    self.circuit_breaker.record, scraper.source_name,
+                    result['status'] in ('ok', 'unchanged'), result['error']
+                )
             except Exception as e:
-                self.logger.error(f"Error running Trident scraper: {str(e)}")
-        
-        # Run Dairy Arts Center scraper
-        async with DairyScraper() as dairy_scraper:
+                self.logger.error(f"Error recording {scraper.source_name} circuit state: {str(e)}")
+        if circuit:
+            result['circuit'] = circuit['state']
+            if circuit['state'] == 'open':
+                result['circuit_open_until'] = circuit['open_until']
+        if run['id'] is not None:
+            result['run_id'] = run['id']
             try:
-                events = await dairy_scraper.scrape()
-                if events:
-                    self._store_events(events)
-                    total_events += len(events)
-                    self.logger.info(f"Successfully stored {len(events)} events from Dairy Arts Center")
+                await asyncio.to_thread(self._finish_run, run, result)
             except Exception as e:
-                self.logger.error(f"Error running Dairy Arts Center scraper: {str(e)}")
-        
-        return total_events
+                self.logger.error(f"Error recording {scraper.source_name} scrape run: {str(e)}")
+        log_run_summary(scraper.source_name, result)
+        return scraper.source_name, result
         
     
-    def _store_events(self, events: List[Dict]) -> None:
-        """Store events in the database with duplicate detection."""
-        conn = sqlite3.connect(self.db_path)
+    async def _stream_events(self, scraper: BaseScraper, totals: Dict[str, int], run: Optional[Dict] = None) -> None:
+        """Store a source's events while it is still yielding them.
+
+        Events pass through a bounded queue to _write_batches, so a scraper
+        that gets ahead of the writes waits instead of piling events up in
+        memory. Events yielded before a failure or timeout are still stored.
+        Adds the number of events stored and inserted/updated/unchanged
+        counts to totals as each batch is written, and the stored events and
+        changes to run when given.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        writer = asyncio.create_task(self._write_batches(queue, totals, run))
+
+        async def produce():
+            async for event in scraper.iter_events():
+                await queue.put(event)
+
+        try:
+            await asyncio.wait_for(produce(), timeout=self.source_timeout)
+        except asyncio.CancelledError:
+            writer.cancel()
+            raise
+        except BaseException:
+            await queue.put(_END_OF_EVENTS)
+            await writer
+            raise
+        await queue.put(_END_OF_EVENTS)
+        await writer
+
+    async def _write_batches(self, queue: asyncio.Queue, totals: Dict[str, int], run: Optional[Dict] = None) -> None:
+        """Drain the queue into _store_events in batches of batch_size, or whatever arrived within batch_interval."""
+        loop = asyncio.get_running_loop()
+        batch: List[Event] = []
+        deadline = 0.0
+        error = None
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=max(0.0, deadline - loop.time()) if batch else None)
+            except asyncio.TimeoutError:
+                event = None
+            if event is _END_OF_EVENTS:
+                break
+            if event is not None:
+                if not batch:
+                    deadline = loop.time() + self.batch_interval
+                batch.append(event)
+            if batch and (event is None or len(batch) >= self.batch_size):
+                # After a failed write keep draining, so the scraper is never left blocked on a full queue
+                if error is None:
+                    try:
+                        await self._store_batch(batch, totals, run)
+                    except Exception as e:
+                        error = e
+                batch = []
+
+        if error is not None:
+            raise error
+        if batch:
+            await self._store_batch(batch, totals, run)
+
+    async def _store_batch(self, batch: List[Event], totals: Dict[str, int], run: Optional[Dict] = None) -> None:
+        # Store off the event loop so other sources keep fetching
+        if run is None:
+            stats = await asyncio.to_thread(self._store_events, batch)
+        else:
+            stats = await asyncio.to_thread(self._store_events, batch, run['id'], run['changes'])
+            run['seen'].update(event.source_id for event in batch)
+        totals['events'] += len(batch)
+        for key, count in stats.items():
+            totals[key] += count
+
+    def _store_events(self, events: List[Event], run_id: Optional[int] = None,
+                      change_set: Optional[Dict] = None) -> Dict[str, int]:
+        """Bulk upsert events keyed on (source, source_id) in a single transaction.
+
+        The batch is staged in a temp table with executemany, and only rows
+        that are new, withdrawn or whose content hash differs from the stored
+        one are written, in one INSERT ... ON CONFLICT statement, stamped with
+        run_id. Written rows are then run through the duplicate index in the
+        same transaction. Their ids and dates are added to change_set
+        when given. Returns the number of inserted, updated and unchanged
+        events, and how many written events were linked as duplicates.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
         cursor = conn.cursor()
         
         try:
-            for event in events:
-                # Check if event already exists using multiple criteria
-                cursor.execute("""
-                    SELECT id FROM events 
-                    WHERE (title = ? AND date = ? AND source = ?)
-                    OR (source = ? AND source_id = ? AND source_id IS NOT NULL)
-                """, (
-                    event['title'], 
-                    event['date'], 
-                    event['source'],
-                    event['source'],
-                    event['source_id']
-                ))
-                
-                existing_event = cursor.fetchone()
-                
-                if existing_event:
-                    # Update existing event if needed
-                    cursor.execute("""
-                        UPDATE events 
-                        SET time = ?,
-                            location = ?,
-                            description = ?,
-                            url = ?,
-                            needs_review = ?,
-                            source_id = ?
-                        WHERE id = ?
-                    """, (
-                        event['time'],
-                        event['location'],
-                        event['description'],
-                        event['url'],
-                        event['needs_review'],
-                        event['source_id'],
-                        existing_event[0]
-                    ))
-                    self.logger.debug(f"Updated existing event: {event['title']}")
-                else:
-                    # Insert new event
-                    cursor.execute("""
-                        INSERT INTO events (
-                            title, date, time, location, description,
-                            url, needs_review, source, source_id
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        event['title'],
-                        event['date'],
-                        event['time'],
-                        event['location'],
-                        event['description'],
-                        event['url'],
-                        event['needs_review'],
-                        event['source'],
-                        event['source_id']
-                    ))
-                    self.logger.debug(f"Inserted new event: {event['title']}")
+            cursor.execute(self.STAGING_TABLE_SQL)
+            cursor.execute("DELETE FROM temp.staged_events")
+            cursor.executemany("""
+                INSERT OR REPLACE INTO temp.staged_events (
+                    title, date, time, location, description,
+                    url, needs_review, source, source_id, content_hash
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [event.to_params() for event in events])
+            
+            staged_count = cursor.execute("SELECT COUNT(*) FROM temp.staged_events").fetchone()[0]
             
+            # New and changed rows, with the date they move from for changed ones
+            cursor.execute(self.STAGED_CHANGES_SQL)
+            changes = cursor.fetchall()
+            inserted = sum(1 for _, _, existing_id, _, _ in changes if existing_id is None)
+            updated = len(changes) - inserted
+            
+            duplicates = 0
+            written_ids = []
+            if changes:
+                written = {(source, source_id): event_id for event_id, source, source_id
+                           in cursor.execute(self.UPSERT_STAGED_SQL, (run_id,)).fetchall()}
+                written_ids = [written[source, source_id] for _, _, _, source, source_id in changes]
+                if self.dedup:
+                    duplicates = DedupIndex(conn).index_events(written_ids)
             conn.commit()
             
+            changed_dates = set()
+            for new_date, old_date, _, _, _ in changes:
+                changed_dates.add(new_date)
+                if old_date:
+                    changed_dates.add(old_date)
+            if change_set is not None:
+                for (_, _, existing_id, _, _), event_id in zip(changes, written_ids):
+                    change_set['updated' if existing_id is not None else 'inserted'].append(event_id)
+                change_set['dates'].update(changed_dates)
+            if changed_dates and self.on_dates_changed:
+                self.on_dates_changed(changed_dates)
+            
+            stats = {'inserted': inserted, 'updated': updated, 'unchanged': staged_count - len(changes),
+                     'duplicates': duplicates}
+            self.logger.debug("Stored events: %s", stats)
+            return stats
+            
         except Exception as e:
             self.logger.error(f"Error storing events: {str(e)}")
             conn.rollback()
@@ -114,24 +401,99 @@ class ScraperManager:
         finally:
             conn.close()
 
-    async def cleanup(self):
-        """Clean up old events from the database."""
-        conn = sqlite3.connect(self.db_path)
+    def _start_run(self, source: str) -> int:
+        """Record a new scrape run of source and return its id."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            cursor = conn.execute("INSERT INTO scrape_runs (source) VALUES (?)", (source,))
+            conn.commit()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def _reconcile(self, source: str, run: Dict) -> bool:
+        """Withdraw source's upcoming events that a complete scrape no longer lists.
+
+        The run's seen source_ids are compared in a temp table, so rows that
+        are still listed are not written at all. Events dated today or
+        earlier are left alone, since listings drop events once they start.
+        Withdrawn events' duplicates are re-linked to the remaining listings.
+        Returns False, withdrawing nothing, when more than
+        max_withdraw_fraction of the live events would go.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
         cursor = conn.cursor()
+        today = date.today().isoformat()
         
         try:
-            # Remove events older than 30 days
-            cursor.execute("""
-                DELETE FROM events 
-                WHERE date < date('now', '-30 days')
-            """)
+            cursor.execute(self.SEEN_TABLE_SQL)
+            cursor.execute("DELETE FROM temp.seen_source_ids")
+            cursor.executemany("INSERT OR IGNORE INTO temp.seen_source_ids (source_id) VALUES (?)",
+                               [(source_id,) for source_id in run['seen']])
+            missing = cursor.execute(self.MISSING_EVENTS_SQL, (source, today)).fetchall()
+            if not missing:
+                return True
+            live = cursor.execute(self.LIVE_EVENT_COUNT_SQL, (source, today)).fetchone()[0]
+            if len(missing) > self.max_withdraw_fraction * live:
+                self.logger.warning(
+                    f"{source} no longer lists {len(missing)} of its {live} upcoming events; "
+                    f"not withdrawing them"
+                )
+                return False
             
-            removed_count = cursor.rowcount
+            withdrawn_ids = [event_id for event_id, _ in missing]
+            cursor.executemany(
+                "UPDATE events SET withdrawn_at = CURRENT_TIMESTAMP, last_changed_run_id = ? WHERE id = ?",
+                [(run['id'], event_id) for event_id in withdrawn_ids]
+            )
+            # Other sources' listings of a withdrawn event find a new canonical event
+            dependents = []
+            for event_id in withdrawn_ids:
+                dependents.extend(row[0] for row in cursor.execute(
+                    "SELECT id FROM events WHERE canonical_event_id = ?", (event_id,)
+                ))
+            if dependents:
+                cursor.executemany("UPDATE events SET canonical_event_id = NULL WHERE id = ?",
+                                   [(event_id,) for event_id in dependents])
+                if self.dedup:
+                    DedupIndex(conn).index_events(dependents)
             conn.commit()
-            self.logger.info(f"Removed {removed_count} old events from database")
-            
         except Exception as e:
-            self.logger.error(f"Error cleaning up old events: {str(e)}")
+            self.logger.error(f"Error reconciling {source} events: {str(e)}")
             conn.rollback()
+            raise
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+        
+        withdrawn_dates = {event_date for _, event_date in missing}
+        run['changes']['withdrawn'].extend(withdrawn_ids)
+        run['changes']['dates'].update(withdrawn_dates)
+        if self.on_dates_changed:
+            self.on_dates_changed(withdrawn_dates)
+        self.logger.info(f"Withdrew {len(withdrawn_ids)} {source} events no longer listed")
+        return True
+
+    def _finish_run(self, run: Dict, result: Dict) -> None:
+        """Save the run's outcome, counts and change set to scrape_runs."""
+        changes = run['changes']
+        change_set = {
+            'inserted': changes['inserted'],
+            'updated': changes['updated'],
+            'withdrawn': changes['withdrawn'],
+            'dates': sorted(changes['dates']),
+        }
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("""
+                UPDATE scrape_runs SET
+                    finished_at = CURRENT_TIMESTAMP, status = ?, complete = ?,
+                    inserted = ?, updated = ?, unchanged = ?, withdrawn = ?, changes = ?
+                WHERE id = ?
+            """, (
+                result['status'], run['complete'],
+                result.get('inserted', 0), result.get('updated', 0), result.get('unchanged', 0),
+                len(changes['withdrawn']), json.dumps(change_set, separators=(',', ':')), run['id']
+            ))
+            conn.commit()
+        finally:
+            conn.close()
@@ -2,32 +2,43 @@ from typing import Dict, List, Optional
 import logging
 import re
 from .base_scraper import BaseScraper
+from .event import Event
+from .html_parser import parse_containers
+from .parse_pool import parse_pool
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TridentScraper(BaseScraper):
+    # Small venue whose listings change often
+    scrape_interval = 3 * 60 * 60
+    event_container = 'article.eventlist-event'
+
     def __init__(self):
         super().__init__("Trident")
         self.base_url = "https://tridentcafe.com/events/"
 
-    async def scrape(self) -> List[Dict]:
-        """Scrape events from Trident Café using headless browser."""
-        events = []
-        
-        # Try with regular HTTP request first
-        soup = await self.get_page_content(self.base_url)
-        if not soup:
-            logger.warning("Regular HTTP request failed, trying with headless browser")
-            soup = await self.get_page_content(self.base_url, use_browser=True)
-            
-        if not soup:
+    async def scrape(self) -> List[Event]:
+        """Scrape events from Trident Café over HTTP, or the headless browser when needed."""
+        html = await self.fetch_listing(self.base_url)
+        if html is None:
             logger.error("Failed to fetch Trident events page")
-            return events
+            return []
+
+        events = await parse_pool.run(self.parse_events, html)
+        logger.debug("Scraped %d events from Trident", len(events))
+        return events
+
+    @classmethod
+    def parse_events(cls, html: str) -> List[Event]:
+        """Extract events from the Trident events page (runs in a parse worker)."""
+        scraper = cls()
+        events = []
+        skipped = 0
+        soup = parse_containers(html, cls.event_container)
 
         # Find all event articles
         articles = soup.find_all('article', {'class': 'eventlist-event'})
-        logger.info(f"Found {len(articles)} event articles")
+        scraper.event_log.debug("Found %d event articles", len(articles))
 
         for article in articles:
             try:
@@ -58,21 +69,23 @@ class TridentScraper(BaseScraper):
                     'source_id': url_elem['href'].split('/')[-1] if url_elem else None
                 }
                 
-                # Log the raw event data
-                logger.info(f"Raw event data: {event}")
+                # Log the raw event data (only when debugging this source)
+                scraper.event_log.event("Raw event data: %s", event, key=event['source_id'])
                 
                 # Format and validate the event
-                formatted_event = self.format_event(event)
-                if formatted_event['date']:  # Only add events with valid dates
+                formatted_event = scraper.format_event(event)
+                if formatted_event is not None:  # Only add events with a title and valid date
                     events.append(formatted_event)
                 else:
-                    logger.warning(f"Skipping event due to invalid date: {event['title']}")
+                    scraper.event_log.event("Skipping event without a title or valid date: %s", event['title'], key=event['source_id'])
+                    skipped += 1
                     
             except Exception as e:
                 logger.error(f"Error parsing event: {str(e)}")
                 continue
 
-        logger.info(f"Successfully scraped {len(events)} events from Trident")
+        if skipped:
+            logger.warning("Skipped %d of %d Trident events without a title or valid date", skipped, len(articles))
         return events
 
     async def __aenter__(self):
@@ -0,0 +1,128 @@
+from typing import Dict, List
+import hashlib
+import logging
+import re
+from bs4 import Tag
+from .base_scraper import BaseScraper
+from .html_parser import make_soup
+from .parse_pool import parse_pool
+
+logger = logging.getLogger(__name__)
+
+# Class or id fragments that suggest an element holds event listings
+EVENT_CONTAINER_PATTERN = re.compile(
+    r"event|calendar|schedule|program|listing|upcoming|what's-on|whats-on", re.I
+)
+# The same fragments in the raw HTML, for checking a page without parsing it
+EVENT_ATTRIBUTE_PATTERN = re.compile(
+    r"""<(?!(?:html|body)\b)[a-z][\w-]*\s[^>]*?\b(?:class|id)\s*=\s*["']?[^"'>]*"""
+    r"(?:" + EVENT_CONTAINER_PATTERN.pattern + ")", re.I
+)
+
+class URLScraper(BaseScraper):
+    """Ad-hoc scraper for the /scrape endpoint: pulls event-like text from any URL."""
+
+    def __init__(self, url):
+        super().__init__("URL Scraper")
+        self.base_url = url
+
+    async def scrape(self):
+        """Extract text content that might contain event information."""
+        html = await self.fetch_listing(self.base_url)
+
+        if html is None:
+            logger.error(f"Failed to fetch content from {self.base_url}")
+            return {"error": "Failed to fetch content", "text": None}
+
+        extracted = await parse_pool.run(self.extract_text, html)
+        if extracted['bytes_saved']:
+            logger.info(f"Dropped {extracted['bytes_saved']} bytes of repeated text from {self.base_url}")
+
+        return {
+            "text": extracted['text'],
+            "url": self.base_url,
+            "error": None,
+            "bytes_saved": extracted['bytes_saved']
+        }
+
+    def has_event_nodes(self, html: str) -> bool:
+        """Whether any element besides html/body has an event-like class or id."""
+        return bool(html) and EVENT_ATTRIBUTE_PATTERN.search(html) is not None
+
+    @staticmethod
+    def _is_event_container(tag: Tag) -> bool:
+        # Page-level classes like body.collection-type-events describe the page, not a container
+        if tag.name in ('html', 'body'):
+            return False
+        classes = tag.get('class')
+        if isinstance(classes, list):
+            classes = ' '.join(classes)
+        return bool(
+            (classes and EVENT_CONTAINER_PATTERN.search(classes))
+            or (tag.get('id') and EVENT_CONTAINER_PATTERN.search(tag['id']))
+        )
+
+    @classmethod
+    def _event_containers(cls, root: Tag) -> List[Tag]:
+        """Outermost elements whose class or id looks event-related, in document order.
+
+        A single walk of the tree that doesn't descend into a container once
+        it has matched, so nested matches are never collected twice.
+        """
+        containers = []
+        stack = [root]
+        while stack:
+            tag = stack.pop()
+            if tag is not root and cls._is_event_container(tag):
+                containers.append(tag)
+                continue
+            stack.extend(reversed([child for child in tag.children if isinstance(child, Tag)]))
+        return containers
+
+    @classmethod
+    def extract_text(cls, html: str) -> Dict:
+        """Pull the text most likely to describe events out of a page (runs in a parse worker).
+
+        Returns the combined text and how many bytes of repeated blocks were
+        left out of it.
+        """
+        soup = make_soup(html)
+        blocks = []
+
+        event_elements = cls._event_containers(soup)
+        if event_elements:
+            # If we found event-specific elements, extract their text
+            for element in event_elements:
+                # Clean up the text
+                text = cls.clean_text(element.get_text(separator=' ', strip=True))
+                if text and len(text) > 50:  # Ignore very short snippets
+                    blocks.append(text)
+        else:
+            # If no event-specific elements found, fall back to main content areas
+            main_content = soup.find(['main', 'article']) or soup.find(class_=['content', 'main'])
+            if main_content:
+                text = cls.clean_text(main_content.get_text(separator=' ', strip=True))
+                blocks.append(text)
+            else:
+                # Last resort: get body text but try to exclude navigation, footer, etc.
+                for element in soup.find_all(['p', 'div', 'section']):
+                    if not element.find_parent(['nav', 'footer', 'header']):
+                        text = cls.clean_text(element.get_text(separator=' ', strip=True))
+                        if text and len(text) > 50:
+                            blocks.append(text)
+
+        # Drop repeated blocks (e.g. the same listing in a sidebar and the main column)
+        relevant_content = []
+        seen = set()
+        bytes_saved = 0
+        for text in blocks:
+            encoded = text.encode('utf-8')
+            digest = hashlib.sha1(encoded).digest()
+            if digest in seen:
+                bytes_saved += len(encoded)
+                continue
+            seen.add(digest)
+            relevant_content.append(text)
+
+        # Join the content, but keep some separation for readability
+        return {'text': "\n\n".join(relevant_content), 'bytes_saved': bytes_saved}
@@ -717,10 +717,10 @@ class Calendar {
             this.scrapeTridentBtn.textContent = 'Scraping...';
             
             const response = await fetch('/api/scrape', { method: 'POST' });
-            const data = await response.json();
+            const job = response.ok ? await this.waitForJob(await response.json()) : null;
             
-            if (response.ok) {
-                this.scrapeTridentBtn.textContent = `✓ Scraped ${data.event_count} events`;
+            if (job && job.status === 'succeeded') {
+                this.scrapeTridentBtn.textContent = `✓ Scraped ${job.result.event_count} events`;
                 setTimeout(() => {
                     this.scrapeTridentBtn.textContent = 'Scrape Trident';
                 }, 3000);
@@ -742,6 +742,21 @@ class Calendar {
         }
     }
 
+    async waitForJob(submitted, interval = 1000) {
+        // Poll a background job until it finishes and return its final record
+        while (true) {
+            const response = await fetch(submitted.status_url);
+            if (!response.ok) {
+                return null;
+            }
+            const job = await response.json();
+            if (!['queued', 'running'].includes(job.status)) {
+                return job;
+            }
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
+    }
+
     changeMonth(delta) {
         this.currentDate.setMonth(this.currentDate.getMonth() + delta);
         this.renderCalendar();
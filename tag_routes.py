@@ -1,14 +1,11 @@
 from flask import Blueprint, request, jsonify
 import sqlite3
 from datetime import datetime
+from month_cache import invalidate_event_month
+from db import get_db
 
 tag_bp = Blueprint('tags', __name__)
 
-def get_db():
-    conn = sqlite3.connect('database/events.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
 @tag_bp.route('/api/tags', methods=['GET'])
 def get_tags():
     """Get all tags."""
@@ -181,6 +178,8 @@ def add_event_tags(event_id):
                 added_tags.append(cursor.fetchone()['name'])
         
         conn.commit()
+        if added_tags:
+            invalidate_event_month(cursor, event_id)
         conn.close()
         return jsonify({'message': f'Added tags: {", ".join(added_tags)}'}), 201
         
@@ -201,6 +200,8 @@ def remove_event_tag(event_id, tag_id):
             (event_id, tag_id)
         )
         conn.commit()
+        if cursor.rowcount:
+            invalidate_event_month(cursor, event_id)
         conn.close()
         return '', 204
         
@@ -1,22 +1,17 @@
 from flask import Blueprint, request, jsonify, session
-import sqlite3
 from datetime import datetime
 import bcrypt
 import re
 import jwt
 import os
 from functools import wraps
+from db import get_db
 
 user_bp = Blueprint('users', __name__)
 
 # JWT secret key - in production, this should be an environment variable
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key')
 
-def get_db():
-    conn = sqlite3.connect('database/events.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):